@@ -1,7 +1,7 @@
 """Interactive dashboard for delivery analytics."""
 import streamlit as st
 from src.dashboard.data_loader import load_dashboard_data
-from src.dashboard.filters import create_sidebar_filters, apply_filters
+from src.dashboard.filters import create_sidebar_filters, create_sample_option, apply_filters
 from src.dashboard.visualizations import (
     plot_delivery_time_distribution,
     plot_weather_impact,
@@ -26,6 +26,7 @@ try:
     
     # Create filters
     date_range, selected_weather, selected_traffic = create_sidebar_filters(data)
+    sample = create_sample_option()
     
     # Apply filters
     filtered_data = apply_filters(data, date_range, selected_weather, selected_traffic)
@@ -49,7 +50,7 @@ try:
     
     # Display model metrics and peak demand forecast
     st.markdown("---")
-    display_model_metrics(filtered_data)
+    display_model_metrics(filtered_data, sample)
     
     st.markdown("---")
     display_peak_demand_forecast(filtered_data)
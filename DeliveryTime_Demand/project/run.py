@@ -1,19 +1,49 @@
 """Main entry point for the delivery prediction service."""
+import asyncio
 import os
-from typing import Dict, Any
-from fastapi import FastAPI, HTTPException
+import signal
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 
-from src.main import main
-from src.data_processor import DataProcessor
-from src.models.delivery_time_model import DeliveryTimeModel
+from src.config.serving_config import SERVING_CONFIG
+from src.models.model_reloader import ModelReloader, ModelSlot
 from src.models.peak_demand_model import PeakDemandModel
-from src.utils.validation import validate_order_data
+from src.prediction.delivery_pipeline import DeliveryPipeline
+from src.prediction.batch_scoring import FORMATS, READ_BLOCK_BYTES, score_chunk, score_stream
+from src.prediction.eta_matrix import eta_matrix
+from src.models.truncation import iterations_for_budget, iterations_for_accuracy
+from src.utils.validation import validate_order_data, validate_coordinate_arrays
+from src.utils.instrumentation import registry, stage_timer, record_request, record_truncation
+from src.utils.thread_budget import set_thread_context
+from src.utils.shared_arrays import (
+    freeze_arrays, share_arrays, release_shared_arrays, process_memory, touch_arrays
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load and warm up models in the background; stop the reloader on shutdown.
+
+    uvicorn only opens the listening socket once startup returns, so warming
+    up inside it would leave /live unanswered. It runs in a worker thread
+    instead, and /ready reports 503 until it finishes.
+    """
+    warmup = asyncio.create_task(asyncio.to_thread(warm_up))
+    yield
+    await warmup
+    models.stop()
 
 # Create FastAPI app
-app = FastAPI(title="Delivery Prediction Service")
+app = FastAPI(title="Delivery Prediction Service", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -24,6 +54,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prediction requests being handled by this worker; drives load-based truncation
+in_flight = 0
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Record latency and status of every request."""
+    global in_flight
+    start = time.perf_counter()
+    status = 500
+    prediction = request.url.path.startswith("/api/predict/")
+    in_flight += prediction
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        in_flight -= prediction
+        # Label by route template so arbitrary URLs cannot create new series
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        record_request(request.method, path, status, time.perf_counter() - start)
+
 # Request/Response models
 class OrderRequest(BaseModel):
     restaurant_lat: float
@@ -34,37 +86,171 @@ class OrderRequest(BaseModel):
     traffic: str
     vehicle_type: str
     order_time: str
+    driver_id: Optional[str] = None
 
 class DeliveryTimeResponse(BaseModel):
     estimated_time: float
     unit: str
 
+class Location(BaseModel):
+    lat: float
+    lng: float
+
+class EtaMatrixRequest(BaseModel):
+    origins: List[Location]
+    destinations: List[Location]
+    weather: str
+    traffic: str
+    vehicle_type: str
+    order_time: str
+    driver_id: Optional[str] = None
+
+class EtaMatrixResponse(BaseModel):
+    eta_matrix: List[List[float]]
+    unit: str
+
 class PeakDemandResponse(BaseModel):
     total_orders: float
     peak_hours: list
     hourly_predictions: list
 
-# Initialize models
-delivery_model = DeliveryTimeModel()
-peak_model = PeakDemandModel()
-processor = DataProcessor()
+def serving_iterations(model: Any, budget_header: Optional[str]) -> Optional[int]:
+    """Trees to predict with: fit to the latency budget, fewer under load, else all (None)."""
+    curve = getattr(model, 'iteration_curve', None)
+    if not curve:
+        return None
+    budget_ms = float(budget_header) if budget_header else SERVING_CONFIG['latency_budget_ms']
+    if budget_ms is not None:
+        num_iteration = iterations_for_budget(curve, budget_ms * 1000)
+        reason = 'budget'
+    elif 0 < SERVING_CONFIG['truncate_in_flight'] <= in_flight:
+        num_iteration = iterations_for_accuracy(curve, SERVING_CONFIG['truncate_max_mae_increase'])
+        reason = 'load'
+    else:
+        return None
+    if num_iteration >= curve[-1]['num_iteration']:
+        return None
+    record_truncation(reason)
+    return num_iteration
+
+def warmup_delivery(pipeline: DeliveryPipeline) -> None:
+    """Run sample orders through every delivery endpoint's code path.
+
+    Lazy imports, first-call library setup and pandas code paths then run
+    here instead of on the first real requests.
+    """
+    order = dict(SERVING_CONFIG['warmup_order'])
+    points = np.array([[order['restaurant_lat'], order['restaurant_lng']],
+                       [order['delivery_lat'], order['delivery_lng']]])
+    with stage_timer('warmup.delivery'):
+        for _ in range(SERVING_CONFIG['warmup_requests']):
+            validate_order_data(order)
+            context = pipeline.processor.process_single_order(order)
+            pipeline.model.predict(context)
+            eta_matrix(pipeline.model, context, points, points)
+            score_chunk(pipeline, pd.DataFrame([order] * 2))
+
+def warmup_peak_demand(model: PeakDemandModel) -> None:
+    model.predict_next_day()
+
+# Initialize models; trained artifacts in the model directory replace them
+# on startup and whenever a new version is written
+DELIVERY_ARTIFACT = SERVING_CONFIG['artifacts']['delivery']
+PEAK_DEMAND_ARTIFACT = SERVING_CONFIG['artifacts']['peak_demand']
+models = ModelReloader([
+    ModelSlot(DELIVERY_ARTIFACT, DeliveryPipeline(), warmup_delivery),
+    ModelSlot(PEAK_DEMAND_ARTIFACT, PeakDemandModel(), warmup_peak_demand)
+])
+
+# Set in the parent before forking; preforked workers leave reloading to it
+preforked = False
+
+# Set once this worker has finished its startup warm-up
+warmed_up = threading.Event()
+# Why the startup warm-up failed, if it did; the worker then stays unready
+warmup_error: Optional[str] = None
+
+def warm_up() -> None:
+    """Run ``start_serving`` off the event loop, recording a failure for /ready."""
+    global warmup_error
+    try:
+        start_serving()
+    except Exception as e:
+        warmup_error = str(e)
+        print(f"Error warming up: {warmup_error}")
+
+def start_serving() -> None:
+    """Load artifacts, warm them up in this process and pre-touch their pages."""
+    # Every worker process serves with its own small share of the cores
+    set_thread_context('serving')
+    if preforked:
+        # Loaded and warmed in the parent; thread pools and page mappings are per process
+        for slot in models.slots.values():
+            if slot.version is not None and slot.warmup is not None:
+                slot.warmup(slot.current)
+    elif SERVING_CONFIG['reload_enabled']:
+        models.start()
+    else:
+        models.check()
+    with stage_timer('warmup.touch_pages'):
+        for artifact in models.slots:
+            touch_arrays(models[artifact])
+    warmed_up.set()
+
+def share_models(artifacts) -> None:
+    """Freeze (and optionally move to shared memory) the arrays of freshly loaded models."""
+    for artifact in artifacts:
+        model = models[artifact]
+        if SERVING_CONFIG['shared_memory']:
+            share_arrays(model, SERVING_CONFIG['shared_memory_min_bytes'])
+        freeze_arrays(model)
+
+def preload_models() -> None:
+    """Load artifacts in the parent so forked workers share them."""
+    global preforked
+    preforked = True
+    set_thread_context('serving')
+    models.check()
+    share_models(models.slots)
+
+def reload_models() -> bool:
+    """Reload changed artifacts in the parent; True if workers must be re-forked."""
+    previous = {artifact: models[artifact] for artifact in models.slots}
+    reloaded = models.check()
+    share_models(reloaded)
+    for artifact in reloaded:
+        # Old workers keep their mappings until they exit
+        release_shared_arrays(previous[artifact])
+    return bool(reloaded)
 
 @app.get("/")
 async def root():
     return {"message": "Delivery Prediction Service API"}
 
 @app.post("/api/predict/delivery-time", response_model=DeliveryTimeResponse)
-async def predict_delivery_time(order: OrderRequest):
+async def predict_delivery_time(order: OrderRequest, request: Request):
     try:
         # Validate order data
         order_dict = order.dict()
-        validate_order_data(order_dict)
+        with stage_timer('api.validation'):
+            validate_order_data(order_dict)
+        
+        # Use one model version for the whole request, even if a reload swaps it
+        pipeline = models[DELIVERY_ARTIFACT]
         
         # Process order data
-        processed_order = processor.process_single_order(order_dict)
+        with stage_timer('api.process_single_order'):
+            processed_order = pipeline.processor.process_single_order(order_dict)
         
-        # Make prediction
-        estimated_time = delivery_model.predict(processed_order)
+        # Make prediction, with fewer trees when the latency budget or load asks for it
+        num_iteration = serving_iterations(
+            pipeline.model, request.headers.get(SERVING_CONFIG['latency_budget_header'])
+        )
+        with stage_timer('api.model_predict'):
+            if num_iteration is None:
+                estimated_time = pipeline.model.predict(processed_order)
+            else:
+                estimated_time = pipeline.model.predict(processed_order, num_iteration=num_iteration)
         
         return {
             "estimated_time": float(estimated_time),
@@ -73,10 +259,81 @@ async def predict_delivery_time(order: OrderRequest):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.post("/api/predict/eta-matrix", response_model=EtaMatrixResponse)
+async def predict_eta_matrix(request: EtaMatrixRequest):
+    """Estimate delivery time for every origin/destination pair under shared conditions."""
+    try:
+        with stage_timer('api.validation'):
+            if not request.origins or not request.destinations:
+                raise ValueError("At least one origin and one destination are required")
+            origins = np.array([(p.lat, p.lng) for p in request.origins])
+            destinations = np.array([(p.lat, p.lng) for p in request.destinations])
+            validate_coordinate_arrays(origins[:, 0], origins[:, 1])
+            validate_coordinate_arrays(destinations[:, 0], destinations[:, 1])
+        
+        pipeline = models[DELIVERY_ARTIFACT]
+        
+        # Shared context is processed once, from the first pair
+        with stage_timer('api.process_single_order'):
+            context = pipeline.processor.process_single_order({
+                'restaurant_lat': float(origins[0, 0]),
+                'restaurant_lng': float(origins[0, 1]),
+                'delivery_lat': float(destinations[0, 0]),
+                'delivery_lng': float(destinations[0, 1]),
+                'weather': request.weather,
+                'traffic': request.traffic,
+                'vehicle_type': request.vehicle_type,
+                'order_time': request.order_time,
+                'driver_id': request.driver_id
+            })
+        
+        with stage_timer('api.eta_matrix'):
+            # Restaurant features belong to each origin, not the first one
+            restaurant_features = pipeline.processor.restaurant_index.features(
+                origins[:, 0], origins[:, 1], np.full(len(origins), context['hour'])
+            )
+            matrix = eta_matrix(pipeline.model, context, origins, destinations,
+                                origin_features=restaurant_features)
+        
+        return {
+            "eta_matrix": matrix.tolist(),
+            "unit": "minutes"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/api/predict/batch")
+async def predict_batch(request: Request, format: str = "csv"):
+    """Score an uploaded CSV or NDJSON order file, streaming one NDJSON result per row.
+
+    The body is spooled to a temporary file (the response stream cannot read
+    it while sending) and then scored chunk by chunk in the threadpool, so
+    memory stays flat however large the file is. Because of the spooling, the
+    first result is sent only once the whole upload has been received; for
+    results within milliseconds of the first rows, pipe the file through the
+    ``python -m src.prediction.batch_scoring`` CLI instead. Lines that cannot
+    be parsed get an ``unparseable_row`` error instead of ending the stream.
+    """
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format {format}. Available formats: {list(FORMATS)}")
+    pipeline = models[DELIVERY_ARTIFACT]
+
+    upload = tempfile.SpooledTemporaryFile(max_size=SERVING_CONFIG['scoring_spool_bytes'])
+    async for block in request.stream():
+        upload.write(block)
+    upload.seek(0)
+
+    def results():
+        with upload:
+            yield from score_stream(pipeline, iter(lambda: upload.read(READ_BLOCK_BYTES), b''), format)
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
 @app.post("/api/predict/peak-demand", response_model=PeakDemandResponse)
 async def predict_peak_demand():
     try:
-        prediction = peak_model.predict_next_day()
+        with stage_timer('api.peak_demand_predict'):
+            prediction = models[PEAK_DEMAND_ARTIFACT].predict_next_day()
         return {
             "total_orders": float(prediction['total_orders']),
             "peak_hours": prediction['peak_hours'],
@@ -85,10 +342,74 @@ async def predict_peak_demand():
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/live")
+async def live():
+    """Liveness probe: the worker is up and its event loop responds."""
+    return {"status": "alive"}
+
+@app.get("/ready")
+async def ready():
+    """Readiness probe: every artifact is loaded and this worker has warmed up."""
+    missing = [artifact for artifact, slot in models.slots.items() if slot.version is None]
+    if warmed_up.is_set() and not missing:
+        return {"status": "ready"}
+    if warmup_error is not None:
+        content = {"status": "warm-up failed", "error": warmup_error, "missing": missing}
+    else:
+        content = {"status": "warming up" if not warmed_up.is_set() else "missing models", "missing": missing}
+    return JSONResponse(status_code=503, content=content)
+
+@app.get("/admin/models")
+async def model_status():
+    """Served version of every model artifact."""
+    return models.status()
+
+@app.post("/admin/models/{artifact}/reload")
+def reload_model(artifact: str):
+    """Load, warm up and swap in the artifact on disk; runs in the threadpool."""
+    if artifact not in models.slots:
+        raise HTTPException(status_code=404, detail=f"Unknown artifact {artifact}")
+    if preforked:
+        # Reloading here would give this worker a private copy; the parent
+        # reloads once and re-forks every worker instead
+        os.kill(os.getppid(), signal.SIGHUP)
+        return {"status": "reload requested"}
+    if not models.reload(artifact):
+        raise HTTPException(status_code=409, detail=models.slots[artifact].last_error)
+    return models.status()[artifact]
+
+@app.get("/admin/memory")
+async def worker_memory():
+    """Memory of the worker serving this request; ``unique`` is not shared with other workers."""
+    return {"pid": os.getpid(), **process_memory()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Expose request, stage, batch-size and cache metrics in Prometheus text format."""
+    return PlainTextResponse(
+        registry.render_prometheus(),
+        media_type="text/plain; version=0.0.4"
+    )
+
 if __name__ == "__main__":
     if os.environ.get("API_MODE"):
         # Run as API server
-        uvicorn.run(app, host="0.0.0.0", port=8000)
+        workers = SERVING_CONFIG['workers']
+        if workers > 1 and SERVING_CONFIG['preload']:
+            from src.utils.prefork import serve_preforked
+            serve_preforked(
+                app, "0.0.0.0", 8000, workers,
+                preload=preload_models,
+                reload=reload_models if SERVING_CONFIG['reload_enabled'] else None,
+                poll_seconds=SERVING_CONFIG['reload_poll_seconds'],
+                on_exit=release_shared_arrays
+            )
+        elif workers > 1:
+            uvicorn.run("run:app", host="0.0.0.0", port=8000, workers=workers)
+        else:
+            uvicorn.run(app, host="0.0.0.0", port=8000)
     else:
-        # Run model training and evaluation
+        # Run model training and evaluation; imported here so API mode
+        # never pays for the training-only dependencies
+        from src.main import main
         main()
\ No newline at end of file
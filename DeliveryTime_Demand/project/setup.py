@@ -9,6 +9,7 @@ setup(
         'pandas==2.1.0',
         'numpy==1.24.3',
         'scikit-learn==1.3.0',
+        'threadpoolctl==3.2.0',
         'python-dateutil==2.8.2',
         'lightgbm==4.1.0',
         'xgboost==2.0.3',
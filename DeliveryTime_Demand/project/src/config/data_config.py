@@ -9,6 +9,12 @@ DATA_DIR = PROJECT_ROOT / "data"
 RAW_DATA_DIR = DATA_DIR / "raw"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
 MODEL_DIR = DATA_DIR / "models"
+# Memory-mapped training matrices, one directory per data fingerprint
+TRAINING_CACHE_DIR = PROCESSED_DATA_DIR / "training_cache"
+# Binned LightGBM Datasets, one file per feature-matrix fingerprint
+LGB_DATASET_DIR = PROCESSED_DATA_DIR / "lgb_datasets"
+# Profiling and benchmark reports
+REPORT_DIR = DATA_DIR / "reports"
 
 # Create directories
 for directory in [RAW_DATA_DIR, PROCESSED_DATA_DIR, MODEL_DIR]:
@@ -0,0 +1,26 @@
+"""Instrumentation and metrics configuration."""
+import os
+
+METRICS_CONFIG = {
+    # Set METRICS_ENABLED=0 to turn every timer into a no-op
+    'enabled': os.environ.get('METRICS_ENABLED', '1') == '1',
+    'namespace': 'delivery',
+    # Seconds
+    'latency_buckets': [
+        0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+        0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+    ],
+    # Rows
+    'batch_size_buckets': [1, 10, 100, 1000, 10000, 100000, 1000000]
+}
+
+MEMORY_PROFILE_CONFIG = {
+    # MEMORY_PROFILE=1 profiles every instrumented stage of a training run
+    'enabled': os.environ.get('MEMORY_PROFILE', '0') == '1',
+    # JSON report; defaults to data/reports/memory_profile.json
+    'report_path': os.environ.get('MEMORY_PROFILE_REPORT'),
+    # Earlier report to compare against, e.g. from the benchmark baseline run
+    'baseline_path': os.environ.get('MEMORY_PROFILE_BASELINE'),
+    # Stages whose peak grows by more than this share over the baseline are flagged
+    'regression_tolerance': 0.1
+}
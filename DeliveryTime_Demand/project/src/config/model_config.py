@@ -1,4 +1,5 @@
 """Model configuration parameters."""
+import os
 
 DELIVERY_MODEL_CONFIG = {
     'n_estimators': 1000,
@@ -16,4 +17,130 @@ PEAK_DEMAND_CONFIG = {
     'batch_size': 32,
     'epochs': 50,
     'validation_split': 0.2
-}
\ No newline at end of file
+}
+SARIMA_CONFIG = {
+    'order': (1, 1, 1),
+    'seasonal_order': (1, 1, 1, 24),  # 24 for hourly data
+    'maxiter': 50,
+    'n_jobs': None,  # None uses one process per thread of the active budget
+    # PeakDemandModel forecasts the next 24 hours of every series (overall and
+    # per city) with SARIMA instead of repeating average hourly patterns
+    'peak_demand_forecasts': os.environ.get('PEAK_DEMAND_SARIMA', '1') == '1'
+}
+
+ZONE_CONFIG = {
+    # Tile edge in degrees per level, coarse to fine; each divides the previous
+    # (~11 km, ~2.2 km, ~550 m at the equator)
+    'resolutions': [0.1, 0.02, 0.005],
+    'level': 1,
+    'location': 'delivery',  # 'delivery' or 'restaurant' coordinates
+    # The service area lies in the northern/eastern hemispheres, so negative
+    # coordinates in the data are sign flips rather than real locations
+    'absolute_coordinates': True
+}
+
+ETA_MATRIX_CONFIG = {
+    # Origins x destinations scored per model call; bounds the feature buffer
+    # to tile_rows * tile_cols * n_features floats (~9 MB at 256 x 256)
+    'tile_rows': 256,
+    'tile_cols': 256,
+    'max_pairs': 1_000_000
+}
+
+LOOKUP_TABLE_CONFIG = {
+    # Band edges; values are bucketed with np.digitize
+    'distance_bands_km': [1, 3, 6, 10, 15, 25],
+    'hour_bands': [6, 11, 15, 18, 22],  # night, morning, lunch, afternoon, evening, late
+    # Encoded categorical key columns, most important first; sparse cells back
+    # off by dropping keys from the end (city, hour band, vehicle, ...)
+    'categorical_columns': {
+        'traffic': 'Road_traffic_density_encoded',
+        'weather': 'Weatherconditions_encoded',
+        'vehicle': 'Type_of_vehicle_encoded',
+        'city': 'City_encoded'
+    },
+    'keys': ['distance', 'traffic', 'weather', 'vehicle', 'hour', 'city'],
+    'min_count': 5,  # Fewer training orders than this and a cell uses its parent
+    'quantiles': [0.1, 0.5, 0.9]
+}
+
+LGB_DATASET_CONFIG = {
+    # Persist binned LightGBM training Datasets in LGB_DATASET_DIR and reuse
+    # them for retrains on the same data; set LGB_DATASET_CACHE=1 to enable
+    'enabled': os.environ.get('LGB_DATASET_CACHE', '0') == '1',
+    # Fixed binning, so a cached Dataset stays valid when training parameters change
+    'params': {
+        'max_bin': 255,
+        'min_data_in_bin': 3,
+        'bin_construct_sample_cnt': 200000
+    }
+}
+
+SAMPLING_CONFIG = {
+    # Fast-iteration runs train on a subsample stratified by these columns
+    # and by quantile bins of the delivery time
+    'columns': ['City', 'Weatherconditions', 'Road_traffic_density'],
+    'target_column': 'time_taken(min)',
+    'target_quantiles': 4,
+    'seed': 42
+}
+
+PREPROCESSING_CONFIG = {
+    # PREPROCESS_WORKERS > 1 computes features over row partitions on a process pool
+    'workers': int(os.environ.get('PREPROCESS_WORKERS', '1')),
+    'partition_rows': 250_000,
+    # Smaller frames are not worth the process start-up and result transfer
+    'min_parallel_rows': 500_000
+}
+
+CASCADE_CONFIG = {
+    # DELIVERY_CASCADE=1 makes DeliveryPipeline train and serve a CascadeModel
+    'enabled': os.environ.get('DELIVERY_CASCADE', '0') == '1',
+    # First stage; must provide predict_with_uncertainty ('lookuptable' or 'decisiontree')
+    'cheap_model': 'lookuptable',
+    # Held out from training to tune the escalation threshold
+    'validation_share': 0.2,
+    # Escalate as few orders as possible while keeping the validation MAE
+    # within this share of the full model's
+    'max_mae_increase': 0.02,
+    'threshold_candidates': 100,
+    'random_state': 42
+}
+
+TRUNCATION_CONFIG = {
+    # Orders held out from the delivery time model to record accuracy against
+    # the number of trees used, before it is refit on all orders; 0 records it
+    # on the training orders instead (and skips the refit)
+    'holdout_share': 0.1,
+    'checkpoints': 10,  # Evenly spaced tree counts, ending at all trees
+    'latency_rows': 50,  # Single-order predictions timed per checkpoint
+    'random_state': 42
+}
+
+THREAD_BUDGET_CONFIG = {
+    # Cores shared by every model library in a process; 0 uses all CPUs available to it
+    'total': int(os.environ.get('CPU_THREADS', '0')),
+    # Threads per process in each context; None uses the whole budget
+    'contexts': {
+        'training': int(os.environ['TRAINING_THREADS']) if os.environ.get('TRAINING_THREADS') else None,
+        # Each API worker is one process; more threads per worker only contend
+        'serving': int(os.environ.get('SERVING_THREADS', '1')),
+        # Processes of a pool (SARIMA fits, feature partitions) already use a core each
+        'worker': 1
+    },
+    # Budget used before a process selects a context
+    'default_context': 'training'
+}
+
+RESTAURANT_INDEX_CONFIG = {
+    # Restaurant coordinates are snapped to grid cells of this edge in degrees
+    # (~110 m); each occupied cell is one restaurant cluster, its id the cell id
+    'resolution': 0.001,
+    # Lookups fall back to a neighbouring cell's cluster, then to the defaults
+    'search_cells': 1,
+    # Clusters with fewer orders use the global median prep time
+    'min_orders': 3,
+    # Prep times outside this range (minutes) are treated as bad timestamps
+    'max_prep_minutes': 120,
+    'absolute_coordinates': ZONE_CONFIG['absolute_coordinates']
+}
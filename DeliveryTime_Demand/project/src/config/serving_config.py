@@ -0,0 +1,47 @@
+"""API server configuration."""
+import os
+
+SERVING_CONFIG = {
+    # Poll the model directory for new artifacts; set MODEL_RELOAD=0 to disable
+    'reload_enabled': os.environ.get('MODEL_RELOAD', '1') == '1',
+    'reload_poll_seconds': float(os.environ.get('MODEL_RELOAD_POLL_SECONDS', '5')),
+    # Artifact names in MODEL_DIR (without .pkl)
+    'artifacts': {
+        'delivery': 'delivery_pipeline',
+        'peak_demand': 'peak_demand_model'
+    },
+    # API_WORKERS > 1 forks workers after loading models once in the parent
+    # (PRELOAD_MODELS=0 falls back to uvicorn's workers, one model copy each)
+    'workers': int(os.environ.get('API_WORKERS', '1')),
+    'preload': os.environ.get('PRELOAD_MODELS', '1') == '1',
+    # Move model arrays of at least this size into shared memory before forking
+    'shared_memory': os.environ.get('SHARED_MEMORY_MODELS', '0') == '1',
+    'shared_memory_min_bytes': 1 << 20,
+    # Predictions run on a freshly loaded model before it takes traffic
+    'warmup_requests': 3,
+    'warmup_order': {
+        'restaurant_lat': 12.9716,
+        'restaurant_lng': 77.5946,
+        'delivery_lat': 12.9352,
+        'delivery_lng': 77.6245,
+        'weather': 'Sunny',
+        'traffic': 'Medium',
+        'vehicle_type': 'motorcycle',
+        'order_time': '12:30'
+    },
+    # File scoring: the first chunk is small so results start streaming at once.
+    # Only the batch_scoring CLI streams while reading; the HTTP endpoint spools
+    # the whole upload first, so its first result follows the end of the upload
+    'scoring_chunk_rows': 10000,
+    'scoring_first_chunk_rows': 256,
+    # Uploaded files larger than this are spooled to disk (rather than memory) before scoring
+    'scoring_spool_bytes': 8 << 20,
+    # Truncated boosting: a request header (or LATENCY_BUDGET_MS) caps the model
+    # latency per order, and the model uses as many trees as fit the budget
+    'latency_budget_header': 'X-Latency-Budget-Ms',
+    'latency_budget_ms': float(os.environ['LATENCY_BUDGET_MS']) if os.environ.get('LATENCY_BUDGET_MS') else None,
+    # With at least this many prediction requests in flight (0 disables), use
+    # the fewest trees whose validation MAE is within the allowed increase
+    'truncate_in_flight': int(os.environ.get('TRUNCATE_IN_FLIGHT', '0')),
+    'truncate_max_mae_increase': 0.02
+}
@@ -22,6 +22,17 @@ def create_sidebar_filters(data: pd.DataFrame):
     
     return date_range, selected_weather, selected_traffic
 
+def create_sample_option():
+    """Sidebar option to train models on a stratified sample for quick answers."""
+    st.sidebar.header("Model Training")
+    share = st.sidebar.select_slider(
+        "Training sample",
+        options=[5, 10, 25, 50, 100],
+        value=100,
+        format_func=lambda value: f"{value}%"
+    )
+    return None if share == 100 else share / 100
+
 def apply_filters(data: pd.DataFrame, date_range, weather, traffic):
     """Apply selected filters to the data."""
     filtered_data = data.copy()
@@ -4,24 +4,27 @@ import pandas as pd
 import plotly.express as px
 from src.models.model_evaluator import ModelEvaluator
 from src.models.peak_demand_model import PeakDemandModel
+from src.utils.matrix_cache import load_training_matrices
+from src.utils.sampling import sample_training_rows
 
-def display_model_metrics(data):
-    """Display model training metrics and evaluation results."""
+def display_model_metrics(data, sample=None):
+    """Display model training metrics and evaluation results.
+
+    With ``sample``, models train on that stratified share of the training
+    rows and are evaluated on the full test set.
+    """
     st.header("🎯 Model Performance Comparison")
     
-    # Prepare features
-    feature_columns = [col for col in data.columns 
-                      if (col.endswith('_encoded') or 
-                          pd.api.types.is_numeric_dtype(data[col])) and 
-                          col not in ['time_taken(min)', 'Order_Date', 'Time_Orderd']]
-    
-    X = data[feature_columns]
-    y = data['time_taken(min)']
+    # Prepare features; each filter selection is cached under its own fingerprint
+    matrices = load_training_matrices(data)
+    train_rows = sample_training_rows(matrices, data, sample) if sample else None
+    if train_rows is not None:
+        st.caption(f"Trained on a stratified sample of {len(train_rows):,} of {matrices.n_train:,} rows")
     
     # Compare models
     with st.spinner("Training and evaluating models..."):
         evaluator = ModelEvaluator()
-        results = evaluator.evaluate_models(X, y)
+        results = evaluator.evaluate_split(*matrices.split(train_rows))
         best_model_name, best_score = evaluator.get_best_model(metric='r2')
         
         # Create metrics table
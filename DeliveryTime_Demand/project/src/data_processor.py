@@ -1,62 +1,162 @@
 """Main data processing pipeline."""
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import pandas as pd
-from .models.features import (
-    extract_time_features,
-    extract_distance_features,
-    CategoricalFeatureProcessor,
-    NumericFeatureProcessor
-)
+from .config.column_mappings import COLUMNS
+from .config.model_config import PREPROCESSING_CONFIG
+from .models.driver_profiles import PROFILE_COLUMNS, DriverProfileStore
+from .models.features import build_delivery_feature_graph
+from .models.features.parallel import parallel_transform
+from .models.restaurant_index import RestaurantIndex
+from .utils.instrumentation import stage_timer, timed, record_batch_size
+
+# API order field -> dataset column
+ORDER_FIELD_COLUMNS = {
+    'restaurant_lat': 'Restaurant_latitude',
+    'restaurant_lng': 'Restaurant_longitude',
+    'delivery_lat': 'Delivery_location_latitude',
+    'delivery_lng': 'Delivery_location_longitude',
+    'weather': 'Weatherconditions',
+    'traffic': 'Road_traffic_density',
+    'vehicle_type': 'Type_of_vehicle',
+    'order_time': 'Time_Orderd'
+}
+
+# Dataset columns the API does not carry
+ORDER_DEFAULTS = {
+    'Type_of_order': 'Snack',  # Default order type
+    'Festival': 'No',  # Default no festival
+    'City': 'Urban',  # Default urban area
+    'Delivery_person_Age': 30,  # Default age
+    'Vehicle_condition': 2,  # Default condition (1-3)
+    'multiple_deliveries': 0,  # Default single delivery
+    'Delivery_person_Ratings': 4.5  # Default rating
+}
+
+# Optional API field; a known driver's profile replaces the driver defaults
+DRIVER_ID_FIELD = 'driver_id'
 
 class DataProcessor:
     def __init__(self):
-        self.categorical_processor = CategoricalFeatureProcessor()
-        self.numeric_processor = NumericFeatureProcessor()
+        # One feature definition shared by batch preprocessing and single orders
+        self.feature_graph = build_delivery_feature_graph()
+        self.driver_profiles = DriverProfileStore()
+        self.restaurant_index = RestaurantIndex()
         
-    def preprocess(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Main preprocessing pipeline."""
+    def preprocess(self, df: pd.DataFrame, workers: Optional[int] = None) -> pd.DataFrame:
+        """Main preprocessing pipeline.
+        
+        With ``workers`` > 1 (default ``PREPROCESSING_CONFIG['workers']``), large
+        frames are fitted once and transformed in row partitions on a process pool.
+        """
         try:
-            df = df.copy()
+            record_batch_size('preprocess', len(df))
             
-            # Extract features
-            df = extract_time_features(df)
-            df = extract_distance_features(df)
-            df = self.categorical_processor.process_features(df)
-            df = self.numeric_processor.process_features(df)
+            # Driver profiles come from the same history the model learns from
+            if COLUMNS['DELIVERY_PERSON'] in df:
+                self.driver_profiles = DriverProfileStore()
+                self.driver_profiles.refresh(df)
+            # So are restaurant clusters and their prep times
+            self.restaurant_index = RestaurantIndex()
+            self.restaurant_index.build(df)
             
-            return df
+            # Extract features into a single copy of the frame
+            with stage_timer('preprocess.feature_graph'):
+                if self._parallel_workers(df, workers) > 1:
+                    self.feature_graph.fit(df)
+                    processed = self._parallel_transform(df, workers)
+                else:
+                    processed = self.feature_graph.fit_transform(df)
+            # Training rows must not see their own prep time or order
+            with stage_timer('restaurant_index.lookup'):
+                features = self.restaurant_index.leave_one_out_features(df, processed['hour'].to_numpy())
+                for column, values in features.items():
+                    processed[column] = values
+            return processed
             
         except Exception as e:
             raise Exception(f"Error in preprocessing pipeline: {str(e)}")
     
+    def transform(self, df: pd.DataFrame, workers: Optional[int] = None) -> pd.DataFrame:
+        """Apply the fitted pipeline to new data without refitting encoders."""
+        try:
+            record_batch_size('transform', len(df))
+            with stage_timer('transform.feature_graph'):
+                if self._parallel_workers(df, workers) > 1:
+                    processed = self._parallel_transform(df, workers)
+                else:
+                    processed = self.feature_graph.transform(df)
+            return self._add_restaurant_features(processed)
+        except Exception as e:
+            raise Exception(f"Error in preprocessing pipeline: {str(e)}")
+    
+    def _parallel_workers(self, df: pd.DataFrame, workers: Optional[int]) -> int:
+        """Worker processes to use for a frame; 1 for small frames."""
+        workers = PREPROCESSING_CONFIG['workers'] if workers is None else workers
+        return workers if len(df) >= PREPROCESSING_CONFIG['min_parallel_rows'] else 1
+    
+    def _parallel_transform(self, df: pd.DataFrame, workers: Optional[int]) -> pd.DataFrame:
+        return parallel_transform(self.feature_graph, df, self._parallel_workers(df, workers),
+                                  PREPROCESSING_CONFIG['partition_rows'])
+    
+    def process_orders(self, orders: pd.DataFrame) -> pd.DataFrame:
+        """Vectorized process_single_order for a frame of API orders."""
+        try:
+            record_batch_size('process_orders', len(orders))
+            frame = orders[list(ORDER_FIELD_COLUMNS)].rename(columns=ORDER_FIELD_COLUMNS)
+            frame['Order_Date'] = pd.Timestamp.now().strftime('%d-%m-%Y')
+            for column, default in ORDER_DEFAULTS.items():
+                frame[column] = default
+            if DRIVER_ID_FIELD in orders and len(self.driver_profiles):
+                for column, values in self.driver_profiles.profile_columns(orders[DRIVER_ID_FIELD]).items():
+                    frame[column] = pd.Series(values, index=frame.index).fillna(ORDER_DEFAULTS[column])
+            with stage_timer('process_orders.feature_graph'):
+                processed = self.feature_graph.transform(frame, inplace=True)
+            return self._add_restaurant_features(processed)
+        except Exception as e:
+            raise Exception(f"Error processing orders: {str(e)}")
+    
+    def _add_restaurant_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add the nearest restaurant cluster's features to processed orders."""
+        with stage_timer('restaurant_index.lookup'):
+            features = self.restaurant_index.features(
+                df[COLUMNS['RESTAURANT_LAT']], df[COLUMNS['RESTAURANT_LNG']], df['hour']
+            )
+            for column, values in features.items():
+                df[column] = values
+        return df
+    
+    def known_categories(self) -> Dict[str, List[str]]:
+        """Category values seen in training for each categorical API field."""
+        return {
+            field: list(self.feature_graph.state[f'encode_{column}'])
+            for field, column in ORDER_FIELD_COLUMNS.items()
+            if f'encode_{column}' in self.feature_graph.state
+        }
+    
+    def _driver_profile(self, driver_id: Any) -> Dict[str, Any]:
+        """Known profile values of a driver, empty for missing or unknown ids."""
+        profile = self.driver_profiles.lookup(driver_id) if driver_id is not None else None
+        if profile is None:
+            return {}
+        return {column: profile[column] for column in PROFILE_COLUMNS if not pd.isna(profile[column])}
+    
+    @timed('process_single_order')
     def process_single_order(self, order_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process a single order for prediction."""
         try:
-            # Create single-row DataFrame with all required fields
-            df = pd.DataFrame([{
-                'Restaurant_latitude': order_data['restaurant_lat'],
-                'Restaurant_longitude': order_data['restaurant_lng'],
-                'Delivery_location_latitude': order_data['delivery_lat'],
-                'Delivery_location_longitude': order_data['delivery_lng'],
-                'Weatherconditions': order_data['weather'],
-                'Road_traffic_density': order_data['traffic'],
-                'Type_of_vehicle': order_data['vehicle_type'],
-                'Order_Date': pd.Timestamp.now().strftime('%d-%m-%Y'),
-                'Time_Orderd': order_data['order_time'],
-                # Add default values for required fields
-                'Type_of_order': 'Snack',  # Default order type
-                'Festival': 'No',  # Default no festival
-                'City': 'Urban',  # Default urban area
-                'Delivery_person_Age': 30,  # Default age
-                'Vehicle_condition': 2,  # Default condition (1-3)
-                'multiple_deliveries': 0,  # Default single delivery
-                'Delivery_person_Ratings': 4.5  # Default rating
-            }])
-            
-            # Apply preprocessing
-            processed_df = self.preprocess(df)
+            # Single record with all required fields
+            order = {column: order_data[field] for field, column in ORDER_FIELD_COLUMNS.items()}
+            order['Order_Date'] = pd.Timestamp.now().strftime('%d-%m-%Y')
+            # Add default values for required fields
+            order.update(ORDER_DEFAULTS)
+            order.update(self._driver_profile(order_data.get(DRIVER_ID_FIELD)))
             
-            return processed_df.iloc[0].to_dict()
+            # Apply the same feature graph in single-row mode
+            processed = self.feature_graph.transform_row(order)
+            processed.update(self.restaurant_index.feature_row(
+                order[COLUMNS['RESTAURANT_LAT']], order[COLUMNS['RESTAURANT_LNG']], processed['hour']
+            ))
+            return processed
             
         except Exception as e:
-            raise Exception(f"Error processing order: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error processing order: {str(e)}")
@@ -1,33 +1,65 @@
 """Main script for delivery time prediction with model comparison."""
+import argparse
+from typing import Optional
 import pandas as pd
 from .data_processor import DataProcessor
 from .models.model_evaluator import ModelEvaluator
 from .models.peak_demand_model import PeakDemandModel
 from .utils.console_logger import print_separator
+from .utils.instrumentation import stage_timer
+from .utils.matrix_cache import load_training_matrices
+from .utils.memory_profiler import profile_memory
+from .utils.sampling import compare_metrics, sample_training_rows
+from .utils.thread_budget import set_thread_context
 
-def main():
+def main(sample: Optional[float] = None, seed: Optional[int] = None, compare: bool = False,
+         memory_report: Optional[str] = None):
+    """Train and compare the delivery time models, then forecast peak demand.
+
+    Args:
+        sample: Train the delivery time models on this stratified share of the
+            training rows; evaluation always uses the full test set
+        seed: Seed of the subsample
+        compare: With ``sample``, also train on all rows and report the differences
+        memory_report: Profile the memory of every stage and write the report here
+            (also enabled by ``MEMORY_PROFILE=1``)
+    """
+    with profile_memory(memory_report):
+        _train_and_forecast(sample, seed, compare)
+
+def _train_and_forecast(sample: Optional[float], seed: Optional[int], compare: bool):
+    """Training and forecasting steps of ``main``."""
+    # Model fitting may use every core of the budget
+    set_thread_context('training')
+    
     # Load and preprocess data
     print("Loading and preprocessing data...")
-    data = pd.read_csv('data/delivery_data.csv')
+    with stage_timer('load_csv'):
+        data = pd.read_csv('data/delivery_data.csv')
     processor = DataProcessor()
     processed_data = processor.preprocess(data)
     
     # Prepare features for model training
     print("\n=== Delivery Time Prediction ===")
     
-    # Select only numeric columns and encoded categorical columns
-    feature_columns = [col for col in processed_data.columns 
-                      if (col.endswith('_encoded') or  # Encoded categorical features
-                          pd.api.types.is_numeric_dtype(processed_data[col])) and  # Numeric features
-                          col not in ['time_taken(min)', 'Order_Date', 'Time_Orderd']]
-    
-    X = processed_data[feature_columns]
-    y = processed_data['time_taken(min)']
+    # Float32 feature matrix and split, memory-mapped from the cache after the first run
+    matrices = load_training_matrices(processed_data)
     
     # Compare models
     print("\nComparing different models...")
-    evaluator = ModelEvaluator()
-    evaluator.evaluate_models(X, y)
+    if sample is None:
+        ModelEvaluator().evaluate_split(*matrices.split())
+    else:
+        train_rows = sample_training_rows(matrices, processed_data, sample, seed)
+        print(f"Training on a stratified sample of {len(train_rows)} of {matrices.n_train} rows")
+        sample_results = ModelEvaluator().evaluate_split(*matrices.split(train_rows))
+        if compare:
+            print("\nTraining on all rows for comparison...")
+            full_results = ModelEvaluator().evaluate_split(*matrices.split())
+            print_separator()
+            print("SAMPLE VS FULL DATA")
+            print_separator()
+            print(compare_metrics(full_results, sample_results).to_string(index=False, float_format='%.4f'))
     
     print_separator()
     print("\n=== Peak Demand Prediction ===")
@@ -40,4 +72,10 @@ def main():
     prediction = peak_model.predict()  # This will automatically print the forecast
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train and compare delivery prediction models.")
+    parser.add_argument('--sample', type=float, help="Train on a stratified share of the rows, e.g. 0.1")
+    parser.add_argument('--seed', type=int, help="Seed of the subsample")
+    parser.add_argument('--compare', action='store_true', help="Also train on all rows and report the differences")
+    parser.add_argument('--memory-report', help="Profile memory per stage and write the JSON report here")
+    args = parser.parse_args()
+    main(args.sample, args.seed, args.compare, args.memory_report)
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""Two-stage delivery time model: a cheap first stage escalating uncertain orders."""
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from .base_model import BaseModel
+from .delivery_time_model import DeliveryTimeModel, TARGET_COLUMN
+from .model_factory import ModelFactory
+from ..config.model_config import CASCADE_CONFIG
+from ..utils.console_logger import print_delivery_prediction
+from ..utils.instrumentation import stage_timer, record_cascade
+
+# Cheap models that read features by column name rather than position
+NAMED_INPUT_MODELS = {'lookuptable'}
+
+
+class CascadeModel(BaseModel):
+    """Answers from a cheap model unless its uncertainty is above a tuned threshold.
+
+    The cheap stage (lookup table or decision tree) reports a spread with each
+    prediction; orders whose spread exceeds ``threshold`` are escalated to the
+    full LightGBM model. The threshold is tuned on held-out orders as the
+    largest one whose cascade MAE stays within ``max_mae_increase`` of the full
+    model's, so as few orders as possible pay for the full model.
+    """
+
+    def __init__(self, full: Optional[DeliveryTimeModel] = None,
+                 cheap_model: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
+        self.config = config or CASCADE_CONFIG
+        self.cheap_name = (cheap_model or self.config['cheap_model']).lower()
+        self.cheap = ModelFactory.get_model(self.cheap_name)
+        self.full = full or DeliveryTimeModel()
+        self.threshold = np.inf
+        self.tuning: List[Dict[str, float]] = []  # Validation MAE and latency per candidate threshold
+        self.is_trained = False
+
+    def train(self, data: pd.DataFrame) -> Dict[str, float]:
+        """Train both stages and tune the escalation threshold on held-out orders."""
+        try:
+            y = pd.to_numeric(data[TARGET_COLUMN], errors='coerce').to_numpy(dtype=float)
+            rows = np.flatnonzero(~np.isnan(y))
+            train_rows, val_rows = train_test_split(
+                rows,
+                test_size=self.config['validation_share'],
+                random_state=self.config['random_state']
+            )
+            X = self._prepare_features(data)
+
+            with stage_timer('model.train.cascade_cheap'):
+                self.cheap.train(self._cheap_input(X[train_rows]), y[train_rows])
+            self.full.train(data.iloc[train_rows])
+            self.tune_threshold(X[val_rows], y[val_rows])
+            self.is_trained = True
+
+            return self.calculate_metrics(y[val_rows], self.predict_batch(X[val_rows]))
+        except Exception as e:
+            raise RuntimeError(f"Error training cascade model: {str(e)}")
+
+    def tune_threshold(self, X: np.ndarray, y: np.ndarray) -> float:
+        """Pick the escalation threshold from validation orders.
+
+        Args:
+            X: Validation feature matrix laid out as ``_get_feature_columns``
+            y: Validation delivery times
+
+        Returns:
+            The chosen threshold; orders with a larger spread are escalated
+        """
+        start = time.perf_counter()
+        cheap, spread = self.cheap.predict_with_uncertainty(self._cheap_input(X))
+        cheap_us = (time.perf_counter() - start) * 1e6 / max(len(X), 1)
+        start = time.perf_counter()
+        full = self.full.predict_batch(X)
+        full_us = (time.perf_counter() - start) * 1e6 / max(len(X), 1)
+
+        cheap_error = np.abs(cheap - y)
+        full_error = np.abs(full - y)
+        # Orders the cheap stage has no answer for always escalate
+        cheap_error[np.isnan(cheap)] = np.inf
+        spread = np.where(np.isnan(spread) | np.isnan(cheap), np.inf, spread)
+
+        # Keeping the k least uncertain orders on the cheap stage changes the
+        # total error by the cumulative (cheap - full) error over them
+        order = np.argsort(spread, kind='stable')
+        total_error = full_error.sum() + np.concatenate(
+            ([0.0], np.cumsum(cheap_error[order] - full_error[order])))
+        budget = full_error.mean() * (1 + self.config['max_mae_increase'])
+
+        # Candidates are spread quantiles; ties must stay on the same side
+        kept_counts = np.searchsorted(
+            spread[order],
+            np.unique(np.quantile(spread[np.isfinite(spread)], np.linspace(0, 1, self.config['threshold_candidates'])))
+            if np.isfinite(spread).any() else np.empty(0),
+            side='right'
+        )
+        self.threshold, self.tuning = -np.inf, []
+        for kept in np.concatenate(([0], kept_counts)):
+            threshold = spread[order][kept - 1] if kept else -np.inf
+            mae = total_error[kept] / len(y)
+            escalated = 1 - kept / len(y)
+            self.tuning.append({
+                'threshold': float(threshold),
+                'escalation_share': float(escalated),
+                'mae': float(mae),
+                'latency_us': float(cheap_us + escalated * full_us)
+            })
+            if mae <= budget:
+                self.threshold = float(threshold)
+        return self.threshold
+
+    @property
+    def iteration_curve(self) -> Optional[List[Dict[str, float]]]:
+        """The full model's accuracy and latency per number of trees, for truncated serving."""
+        return self.full.iteration_curve
+    
+    def predict(self, features: Dict[str, Any], num_iteration: Optional[int] = None) -> float:
+        """Make a prediction for a single order."""
+        X = self._prepare_features_row(features).reshape(1, -1)
+        estimated_time = float(self.predict_batch(X, num_iteration=num_iteration)[0])
+        print_delivery_prediction(estimated_time, features)
+        return estimated_time
+
+    def predict_batch(self, X: np.ndarray, num_iteration: Optional[int] = None) -> np.ndarray:
+        """Predict many orders, escalating uncertain ones to the full model (its first ``num_iteration`` trees if given)."""
+        if not self.is_trained:
+            raise RuntimeError("Model must be trained before making predictions")
+
+        with stage_timer('model.predict_batch.cascade_cheap'):
+            predictions, spread = self.cheap.predict_with_uncertainty(self._cheap_input(X))
+            predictions = np.array(predictions, dtype=float)
+        # NaN spreads compare False, so they escalate too
+        escalate = ~(spread <= self.threshold) | np.isnan(predictions)
+        n_escalated = int(escalate.sum())
+        if n_escalated:
+            predictions[escalate] = self.full.predict_batch(X[escalate], num_iteration=num_iteration)
+
+        record_cascade('cheap', len(X) - n_escalated)
+        record_cascade('full', n_escalated)
+        return predictions
+
+    def _cheap_input(self, X: np.ndarray) -> Any:
+        """Feature matrix in the form the cheap stage reads."""
+        if self.cheap_name in NAMED_INPUT_MODELS:
+            return {column: X[:, i] for i, column in enumerate(self._get_feature_columns())}
+        return X
+
+    def _get_feature_columns(self) -> List[str]:
+        """Model input columns in order."""
+        return self.full._get_feature_columns()
+
+    def _prepare_features(self, df: pd.DataFrame) -> np.ndarray:
+        """Select model inputs from processed features as a float matrix."""
+        return self.full._prepare_features(df)
+
+    def _prepare_features_row(self, features: Dict[str, Any]) -> np.ndarray:
+        """Select model inputs from one processed order as a float vector."""
+        return self.full._prepare_features_row(features)
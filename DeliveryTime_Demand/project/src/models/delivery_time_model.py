@@ -2,7 +2,7 @@
 import pandas as pd
 import numpy as np
 import lightgbm as lgb
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from .base_model import BaseModel
 from .features import (
     extract_time_features,
@@ -10,9 +10,32 @@ from .features import (
     CategoricalFeatureProcessor,
     NumericFeatureProcessor
 )
+from .features.delivery_features import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS
+from .restaurant_index import RESTAURANT_FEATURE_COLUMNS
+from sklearn.model_selection import train_test_split
+from .lgb_datasets import train_cached
+from .truncation import iteration_curve
+from ..config.model_config import LGB_DATASET_CONFIG, TRUNCATION_CONFIG
 from ..utils.console_logger import print_delivery_prediction
+from ..utils.instrumentation import stage_timer, record_batch_size
+from ..utils.thread_budget import threads, apply_threads
+
+TARGET_COLUMN = 'time_taken(min)'
+
+# Columns produced by the delivery feature graph, in model input order
+FEATURE_COLUMNS = (
+    ['distance', 'hour', 'day_of_week', 'is_weekend'] +
+    [f'{col}_encoded' for col in CATEGORICAL_COLUMNS] +
+    list(NUMERIC_COLUMNS) +
+    RESTAURANT_FEATURE_COLUMNS
+)
 
 class DeliveryTimeModel(BaseModel):
+    # Set when trained on a cached Dataset; predicts in place of ``model``
+    booster: Optional[lgb.Booster] = None
+    # MAE and latency per number of trees, recorded at training time
+    iteration_curve: Optional[List[Dict[str, float]]] = None
+    
     def __init__(self):
         self.model = lgb.LGBMRegressor(
             n_estimators=1000,
@@ -22,29 +45,107 @@ class DeliveryTimeModel(BaseModel):
             subsample_freq=5,
             random_state=42,
             verbose=-1,
-            force_row_wise=True
+            force_row_wise=True,
+            n_jobs=threads()
         )
         self.categorical_processor = CategoricalFeatureProcessor()
         self.numeric_processor = NumericFeatureProcessor()
         self.is_trained = False
     
-    def predict(self, features: Dict[str, Any]) -> float:
-        """Make a prediction for a single order."""
+    def train(self, data: pd.DataFrame) -> Dict[str, float]:
+        """Train on orders processed by ``DataProcessor.preprocess``."""
+        try:
+            X = self._prepare_features(data)
+            y = pd.to_numeric(data[TARGET_COLUMN], errors='coerce').to_numpy(dtype=float)
+            labelled = fit_rows = curve_rows = np.flatnonzero(~np.isnan(y))
+            if TRUNCATION_CONFIG['holdout_share'] > 0 and len(fit_rows) > 1:
+                fit_rows, curve_rows = (np.sort(rows) for rows in train_test_split(
+                    fit_rows,
+                    test_size=TRUNCATION_CONFIG['holdout_share'],
+                    random_state=TRUNCATION_CONFIG['random_state']
+                ))
+            
+            with stage_timer('model.train.delivery_time'):
+                self._fit(X[fit_rows], y[fit_rows])
+            self.is_trained = True
+            
+            with stage_timer('model.iteration_curve.delivery_time'):
+                self.iteration_curve = iteration_curve(
+                    self._estimator(), X[curve_rows], y[curve_rows], self.n_iterations
+                )
+            
+            # The curve needs orders the model has not seen; the served model
+            # is then refit on every order so none are lost to it
+            if len(fit_rows) < len(labelled):
+                with stage_timer('model.refit.delivery_time'):
+                    self._fit(X[labelled], y[labelled])
+            
+            return self.calculate_metrics(y[labelled], self._estimator().predict(X[labelled]))
+        except Exception as e:
+            raise RuntimeError(f"Error training delivery time model: {str(e)}")
+    
+    def _fit(self, X: np.ndarray, y: np.ndarray) -> None:
+        """Fit the regressor, or a booster on a cached Dataset when enabled."""
+        apply_threads(self.model)
+        if LGB_DATASET_CONFIG['enabled']:
+            self.booster = train_cached(self.model, X, y)
+        else:
+            self.model.fit(X, y)
+            self.booster = None
+    
+    def predict(self, features: Dict[str, Any], num_iteration: Optional[int] = None) -> float:
+        """Make a prediction for a single order, with the first ``num_iteration`` trees if given."""
         if not self.is_trained:
             raise RuntimeError("Model must be trained before making predictions")
         
-        # Convert to DataFrame for processing
-        df = pd.DataFrame([features])
-        processed_features = self._prepare_features(df)
-        
-        # Get feature values in correct order
-        feature_columns = self._get_feature_columns()
-        feature_values = processed_features[feature_columns].iloc[0].values
+        feature_values = self._prepare_features_row(features)
         
         # Make prediction
-        estimated_time = float(self.model.predict(feature_values.reshape(1, -1))[0])
+        with stage_timer('model.predict.delivery_time'):
+            estimated_time = float(self._estimator().predict(
+                feature_values.reshape(1, -1), num_iteration=num_iteration, num_threads=threads()
+            )[0])
         
         # Print prediction to console
         print_delivery_prediction(estimated_time, features)
         
-        return estimated_time
\ No newline at end of file
+        return estimated_time
+    
+    def predict_batch(self, X: np.ndarray, num_iteration: Optional[int] = None) -> np.ndarray:
+        """Predict many orders from a feature matrix laid out as ``_get_feature_columns``."""
+        if not self.is_trained:
+            raise RuntimeError("Model must be trained before making predictions")
+        
+        record_batch_size('model.predict_batch.delivery_time', len(X))
+        with stage_timer('model.predict_batch.delivery_time'):
+            return self._estimator().predict(X, num_iteration=num_iteration, num_threads=threads())
+    
+    @property
+    def n_iterations(self) -> int:
+        """Number of trees in the trained model."""
+        booster = self.booster if self.booster is not None else self.model.booster_
+        return booster.current_iteration()
+    
+    def _estimator(self) -> Any:
+        """Fitted booster or regressor; both predict from a feature matrix."""
+        return self.booster if self.booster is not None else self.model
+    
+    def _get_feature_columns(self) -> List[str]:
+        """Model input columns in order."""
+        return list(FEATURE_COLUMNS)
+    
+    def _prepare_features(self, df: pd.DataFrame) -> np.ndarray:
+        """Select model inputs from processed features as a float matrix."""
+        feature_columns = self._get_feature_columns()
+        missing = [col for col in feature_columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        return df[feature_columns].to_numpy(dtype=float)
+    
+    def _prepare_features_row(self, features: Dict[str, Any]) -> np.ndarray:
+        """Select model inputs from one processed order as a float vector."""
+        feature_columns = self._get_feature_columns()
+        missing = [col for col in feature_columns if col not in features]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        return np.array([features[col] for col in feature_columns], dtype=float)
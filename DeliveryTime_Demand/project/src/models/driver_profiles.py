@@ -0,0 +1,115 @@
+"""Per-driver features built from order history, looked up by driver id at serving time."""
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Iterable, Optional
+from ..config.column_mappings import COLUMNS
+from ..utils.date_parsers import parse_dates
+from ..utils.instrumentation import stage_timer, record_batch_size
+
+TARGET_COLUMN = 'time_taken(min)'
+
+# Latest known value per driver; these replace the API order defaults
+PROFILE_COLUMNS = [
+    COLUMNS['AGE'],
+    COLUMNS['RATINGS'],
+    COLUMNS['VEHICLE_CONDITION']
+]
+
+class DriverProfileStore:
+    """Array-backed driver aggregates with a hash index from driver id to row.
+
+    Holds the latest age, rating and vehicle condition of every driver plus
+    their delivery count and average delivery time. ``refresh`` folds in new
+    orders without rescanning the history already added.
+    """
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.latest_date = np.empty(0, dtype='datetime64[ns]')
+        self.latest = np.empty((0, len(PROFILE_COLUMNS)))
+        self.deliveries = np.empty(0, dtype=np.int64)
+        self.avg_time = np.empty(0)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def refresh(self, data: pd.DataFrame) -> int:
+        """Add raw orders to the profiles; returns the number of new drivers."""
+        record_batch_size('driver_profiles.refresh', len(data))
+        with stage_timer('driver_profiles.refresh'):
+            ids = data[COLUMNS['DELIVERY_PERSON']].astype(str).str.strip()
+            frame = pd.DataFrame({
+                column: pd.to_numeric(data[column], errors='coerce') for column in PROFILE_COLUMNS
+            })
+            frame['id'] = ids.to_numpy()
+            frame['date'] = parse_dates(data[COLUMNS['ORDER_DATE']]).to_numpy()
+            frame['time'] = (pd.to_numeric(data[TARGET_COLUMN], errors='coerce')
+                             if TARGET_COLUMN in data else np.nan)
+
+            # Latest non-missing value of each column per driver, by order date
+            frame = frame.sort_values('date', kind='stable', na_position='first')
+            groups = frame.groupby('id', sort=False)
+            batch = groups[PROFILE_COLUMNS].last()
+            batch_date = groups['date'].max().to_numpy()
+            batch_count = groups['time'].count().to_numpy()
+            batch_sum = groups['time'].sum().to_numpy()
+
+            rows = np.fromiter((self.index.get(i, -1) for i in batch.index), dtype=np.int64, count=len(batch))
+            known, new = rows >= 0, rows < 0
+
+            # Build new arrays and swap them in, so readers never see partial
+            # updates and arrays frozen for serving are never written
+            latest = self.latest.copy()
+            latest_date = self.latest_date.copy()
+            deliveries = self.deliveries.copy()
+            avg_time = self.avg_time.copy()
+
+            old, values = rows[known], batch.to_numpy()[known]
+            newer = ~(batch_date[known] < latest_date[old])
+            # Missing values in the batch keep the stored ones
+            latest[old] = np.where(newer[:, None] & ~np.isnan(values), values, latest[old])
+            latest_date[old] = np.maximum(latest_date[old], batch_date[known])
+            total = deliveries[old] + batch_count[known]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                avg_time[old] = np.where(
+                    total > 0,
+                    (np.nan_to_num(avg_time[old]) * deliveries[old] + batch_sum[known]) / total,
+                    np.nan
+                )
+            deliveries[old] = total
+
+            with np.errstate(invalid='ignore', divide='ignore'):
+                new_avg = np.where(batch_count[new] > 0, batch_sum[new] / batch_count[new], np.nan)
+            self.latest = np.concatenate([latest, batch.to_numpy()[new]])
+            self.latest_date = np.concatenate([latest_date, batch_date[new]])
+            self.deliveries = np.concatenate([deliveries, batch_count[new]])
+            self.avg_time = np.concatenate([avg_time, new_avg])
+            # Index new drivers last; existing rows keep their positions
+            start = len(self.index)
+            self.index.update({driver: start + i for i, driver in enumerate(batch.index[new])})
+            return int(new.sum())
+
+    def lookup(self, driver_id: Any) -> Optional[Dict[str, Any]]:
+        """Profile of one driver, or None for unknown drivers."""
+        row = self.index.get(str(driver_id).strip())
+        if row is None:
+            return None
+        profile = dict(zip(PROFILE_COLUMNS, self.latest[row].tolist()))
+        profile['deliveries'] = int(self.deliveries[row])
+        profile['avg_time'] = float(self.avg_time[row])
+        return profile
+
+    def rows(self, driver_ids: Iterable[Any]) -> np.ndarray:
+        """Row of every driver id, -1 where unknown or missing."""
+        return np.array([
+            -1 if driver is None or driver != driver else self.index.get(str(driver).strip(), -1)
+            for driver in driver_ids
+        ], dtype=np.int64)
+
+    def profile_columns(self, driver_ids: Iterable[Any]) -> Dict[str, np.ndarray]:
+        """``PROFILE_COLUMNS`` for many drivers at once; NaN for unknown drivers."""
+        rows = self.rows(driver_ids)
+        values = np.full((len(rows), len(PROFILE_COLUMNS)), np.nan)
+        found = rows >= 0
+        values[found] = self.latest[rows[found]]
+        return {column: values[:, i] for i, column in enumerate(PROFILE_COLUMNS)}
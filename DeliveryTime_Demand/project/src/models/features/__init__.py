@@ -3,10 +3,15 @@ from .time_features import extract_time_features
 from .distance_features import extract_distance_features
 from .categorical_features import CategoricalFeatureProcessor
 from .numeric_features import NumericFeatureProcessor
+from .feature_graph import FeatureGraph, FeatureSpec
+from .delivery_features import build_delivery_feature_graph
 
 __all__ = [
     'extract_time_features',
     'extract_distance_features',
     'CategoricalFeatureProcessor',
-    'NumericFeatureProcessor'
-]
\ No newline at end of file
+    'NumericFeatureProcessor',
+    'FeatureGraph',
+    'FeatureSpec',
+    'build_delivery_feature_graph'
+]
@@ -1,32 +1,32 @@
 """Categorical feature processing."""
 import pandas as pd
 from typing import Dict, List
-from sklearn.preprocessing import LabelEncoder
+from .delivery_features import CATEGORICAL_COLUMNS, categorical_features
+from .feature_graph import FeatureGraph
+from ...utils.instrumentation import timed
 
 class CategoricalFeatureProcessor:
     def __init__(self):
-        self.encoders: Dict[str, LabelEncoder] = {}
-        self.categorical_columns = [
-            'Weatherconditions',
-            'Road_traffic_density',
-            'Type_of_vehicle',
-            'Type_of_order',
-            'Festival',
-            'City'
-        ]
+        self.categorical_columns = list(CATEGORICAL_COLUMNS)
+        self.feature_graph = FeatureGraph(
+            categorical_features(self.categorical_columns),
+            (categorical_features, (self.categorical_columns,))
+        )
     
+    @property
+    def encoders(self) -> Dict[str, Dict[str, int]]:
+        """Fitted label mappings keyed by column."""
+        return {
+            col: self.feature_graph.state[f'encode_{col}']
+            for col in self.categorical_columns
+            if f'encode_{col}' in self.feature_graph.state
+        }
+    
+    @timed('features.categorical')
     def process_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """Process and encode categorical features."""
-        df = data.copy()
-        
-        for col in self.categorical_columns:
-            if col in df.columns:
-                if col not in self.encoders:
-                    self.encoders[col] = LabelEncoder()
-                df[f'{col}_encoded'] = self.encoders[col].fit_transform(df[col].fillna('Unknown'))
-        
-        return df
+        return self.feature_graph.fit_transform(data)
     
     def get_feature_names(self) -> List[str]:
         """Get list of encoded feature names."""
-        return [f'{col}_encoded' for col in self.categorical_columns]
\ No newline at end of file
+        return [f'{col}_encoded' for col in self.categorical_columns]
@@ -0,0 +1,192 @@
+"""Feature definitions for the delivery time pipeline.
+
+Every derived column used for training and serving is declared here once;
+``build_delivery_feature_graph`` assembles them into a ``FeatureGraph``.
+"""
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from .feature_graph import FeatureGraph, FeatureSpec
+from ...config.column_mappings import COLUMNS
+from ...utils.date_parsers import parse_dates, parse_date_or_none
+from ...utils.distance import calculate_haversine_distance
+from ...utils.time_parsers import parse_hour, parse_hours
+
+DEFAULT_HOUR = 12
+DEFAULT_DAY_OF_WEEK = 3  # Wednesday
+UNKNOWN_CATEGORY = 'Unknown'
+
+CATEGORICAL_COLUMNS = [
+    COLUMNS['WEATHER'],
+    COLUMNS['TRAFFIC'],
+    COLUMNS['VEHICLE_TYPE'],
+    COLUMNS['ORDER_TYPE'],
+    COLUMNS['FESTIVAL'],
+    COLUMNS['CITY']
+]
+
+NUMERIC_COLUMNS = [
+    COLUMNS['AGE'],
+    COLUMNS['VEHICLE_CONDITION'],
+    COLUMNS['MULTIPLE_DELIVERIES'],
+    COLUMNS['RATINGS']
+]
+
+COORDINATE_COLUMNS = [
+    COLUMNS['RESTAURANT_LAT'],
+    COLUMNS['RESTAURANT_LNG'],
+    COLUMNS['DELIVERY_LAT'],
+    COLUMNS['DELIVERY_LNG']
+]
+
+
+def fit_label_mapping(values: pd.Series) -> Dict[str, int]:
+    """Learn sorted label codes, matching sklearn's LabelEncoder ordering."""
+    # Hash the column once and sort only its distinct values
+    codes, uniques = pd.factorize(values)
+    labels = {str(value) for value in uniques}
+    if (codes < 0).any():
+        labels.add(UNKNOWN_CATEGORY)
+    return {label: code for code, label in enumerate(sorted(labels))}
+
+
+def encode_labels(values: pd.Series, mapping: Dict[str, int]) -> np.ndarray:
+    """Encode labels with a fitted mapping; unseen labels become -1."""
+    categories = pd.Categorical(
+        values.fillna(UNKNOWN_CATEGORY).astype(str),
+        categories=list(mapping)
+    )
+    return categories.codes.astype(np.int64)
+
+
+def encode_label(value: Any, mapping: Dict[str, int]) -> int:
+    """Encode a single label with a fitted mapping; unseen labels become -1."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        value = UNKNOWN_CATEGORY
+    return mapping.get(str(value), -1)
+
+
+def hour_feature(time_column: str = COLUMNS['ORDER_TIME']) -> FeatureSpec:
+    """Hour of day (0-23) from decimal or HH:MM order times, missing values filled with the median."""
+    def fit(inputs):
+        hours = parse_hours(inputs[time_column]).dropna()
+        return int(hours.median()) if len(hours) else DEFAULT_HOUR
+
+    def compute(inputs, state):
+        return {'hour': parse_hours(inputs[time_column]).fillna(state).astype(np.int64)}
+
+    def compute_row(inputs, state):
+        hour = parse_hour(inputs[time_column])
+        return {'hour': hour if hour is not None else state}
+
+    return FeatureSpec('hour', [time_column], ['hour'], compute, compute_row, fit)
+
+
+def day_of_week_feature(date_column: str = COLUMNS['ORDER_DATE']) -> FeatureSpec:
+    """Day of week (Monday=0) from the order date, missing values filled with the median."""
+    def fit(inputs):
+        days = parse_dates(inputs[date_column]).dt.dayofweek.dropna()
+        return int(days.median()) if len(days) else DEFAULT_DAY_OF_WEEK
+
+    def compute(inputs, state):
+        days = parse_dates(inputs[date_column]).dt.dayofweek
+        return {'day_of_week': days.fillna(state).astype(np.int64)}
+
+    def compute_row(inputs, state):
+        date = parse_date_or_none(inputs[date_column])
+        return {'day_of_week': date.weekday() if date is not None else state}
+
+    return FeatureSpec('day_of_week', [date_column], ['day_of_week'], compute, compute_row, fit)
+
+
+def weekend_feature() -> FeatureSpec:
+    """Weekend flag derived from the day of week."""
+    def compute(inputs, state):
+        return {'is_weekend': inputs['day_of_week'].isin([5, 6]).astype(np.int64)}
+
+    def compute_row(inputs, state):
+        return {'is_weekend': int(inputs['day_of_week'] in (5, 6))}
+
+    return FeatureSpec('is_weekend', ['day_of_week'], ['is_weekend'], compute, compute_row)
+
+
+def time_features(time_column: str = COLUMNS['ORDER_TIME'],
+                  date_column: str = COLUMNS['ORDER_DATE']) -> List[FeatureSpec]:
+    """Hour, day of week and weekend flag."""
+    return [hour_feature(time_column), day_of_week_feature(date_column), weekend_feature()]
+
+
+def distance_feature() -> FeatureSpec:
+    """Haversine distance in km between restaurant and delivery location."""
+    def compute(inputs, state):
+        coords = [inputs[column].to_numpy(dtype=float) for column in COORDINATE_COLUMNS]
+        return {'distance': calculate_haversine_distance(*coords)}
+
+    def compute_row(inputs, state):
+        coords = [float(inputs[column]) for column in COORDINATE_COLUMNS]
+        return {'distance': float(calculate_haversine_distance(*coords))}
+
+    return FeatureSpec('distance', COORDINATE_COLUMNS, ['distance'], compute, compute_row)
+
+
+def categorical_feature(column: str, output: Optional[str] = None,
+                        optional: bool = True) -> FeatureSpec:
+    """Label-encoded copy of a categorical column."""
+    output = output or f'{column}_encoded'
+
+    def fit(inputs):
+        return fit_label_mapping(inputs[column])
+
+    def compute(inputs, state):
+        return {output: encode_labels(inputs[column], state)}
+
+    def compute_row(inputs, state):
+        return {output: encode_label(inputs[column], state)}
+
+    return FeatureSpec(f'encode_{column}', [column], [output], compute, compute_row, fit, optional)
+
+
+def numeric_feature(column: str, optional: bool = True) -> FeatureSpec:
+    """Numeric column coerced to float with missing values filled by the training median."""
+    def fit(inputs):
+        return pd.to_numeric(inputs[column], errors='coerce').median()
+
+    def compute(inputs, state):
+        return {column: pd.to_numeric(inputs[column], errors='coerce').fillna(state)}
+
+    def compute_row(inputs, state):
+        value = pd.to_numeric(inputs[column], errors='coerce')
+        return {column: state if pd.isna(value) else float(value)}
+
+    return FeatureSpec(f'numeric_{column}', [column], [column], compute, compute_row, fit, optional)
+
+
+def categorical_features(columns: List[str],
+                         encoded_columns: Optional[Dict[str, str]] = None) -> List[FeatureSpec]:
+    """Label encoders for several categorical columns."""
+    encoded_columns = encoded_columns or {}
+    return [categorical_feature(column, encoded_columns.get(column)) for column in columns]
+
+
+def numeric_features(columns: List[str]) -> List[FeatureSpec]:
+    """Median-filled numeric coercion for several columns."""
+    return [numeric_feature(column) for column in columns]
+
+
+def delivery_features(encoded_columns: Optional[Dict[str, str]] = None) -> List[FeatureSpec]:
+    """Every feature of the delivery time pipeline."""
+    return (
+        time_features() + [distance_feature()] +
+        categorical_features(CATEGORICAL_COLUMNS, encoded_columns) +
+        numeric_features(NUMERIC_COLUMNS)
+    )
+
+
+def build_delivery_feature_graph(encoded_columns: Optional[Dict[str, str]] = None) -> FeatureGraph:
+    """Build the delivery time feature graph.
+
+    Args:
+        encoded_columns: Optional mapping of categorical column to encoded column
+            name; defaults to ``<column>_encoded``
+    """
+    return FeatureGraph(delivery_features(encoded_columns), (delivery_features, (encoded_columns,)))
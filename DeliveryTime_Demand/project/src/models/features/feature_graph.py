@@ -0,0 +1,206 @@
+"""Declarative feature graph shared by batch training and single-row serving."""
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+import pandas as pd
+from ...utils.instrumentation import stage_timer
+
+
+class FeatureSpec:
+    """A derived feature declared by its input and output columns.
+
+    Args:
+        name: Unique feature name, also used as the timing stage name
+        inputs: Columns the feature reads
+        outputs: Columns the feature writes
+        compute: Batch function ``(inputs, state) -> {output: values}`` over pandas Series
+        compute_row: Optional scalar function ``(inputs, state) -> {output: value}``
+            used in single-row mode; defaults to running ``compute`` on one-row Series
+        fit: Optional function ``(inputs) -> state`` learning parameters from training data
+        optional: Skip the feature instead of raising when its inputs are missing
+    """
+
+    def __init__(self, name: str, inputs: List[str], outputs: List[str],
+                 compute: Callable[[Dict[str, pd.Series], Any], Dict[str, Any]],
+                 compute_row: Optional[Callable[[Dict[str, Any], Any], Dict[str, Any]]] = None,
+                 fit: Optional[Callable[[Dict[str, pd.Series]], Any]] = None,
+                 optional: bool = False):
+        self.name = name
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.compute = compute
+        self.compute_row = compute_row
+        self.fit = fit
+        self.optional = optional
+
+    def __repr__(self) -> str:
+        return f"FeatureSpec({self.name!r}, inputs={self.inputs}, outputs={self.outputs})"
+
+
+class FeatureGraph:
+    """Orders features by dependency and computes each output column exactly once.
+
+    Args:
+        features: Feature specs to run
+        recipe: Optional ``(builder, args)`` with a module-level ``builder(*args)``
+            returning the same specs; needed to pickle the graph, since specs
+            hold closures. Only the recipe and fitted state are serialized.
+    """
+
+    def __init__(self, features: Iterable[FeatureSpec],
+                 recipe: Optional[Tuple[Callable[..., List[FeatureSpec]], tuple]] = None):
+        self.features = list(features)
+        self.recipe = recipe
+        self.state: Dict[str, Any] = {}
+        self._plans: Dict[FrozenSet[str], List[FeatureSpec]] = {}
+
+        self._producers: Dict[str, FeatureSpec] = {}
+        names = set()
+        for spec in self.features:
+            if spec.name in names:
+                raise ValueError(f"Duplicate feature name: {spec.name}")
+            names.add(spec.name)
+            for column in spec.outputs:
+                if column in self._producers:
+                    raise ValueError(
+                        f"Column {column} is produced by both "
+                        f"{self._producers[column].name} and {spec.name}"
+                    )
+                self._producers[column] = spec
+
+    def __getstate__(self) -> Dict[str, Any]:
+        if self.recipe is None:
+            raise TypeError("FeatureGraph can only be pickled when built with a recipe")
+        return {'recipe': self.recipe, 'state': self.state}
+
+    def __setstate__(self, snapshot: Dict[str, Any]) -> None:
+        builder, args = snapshot['recipe']
+        self.__init__(builder(*args), snapshot['recipe'])
+        self.state = snapshot['state']
+
+    @property
+    def output_columns(self) -> List[str]:
+        """All columns the graph can produce, in declaration order."""
+        return [column for spec in self.features for column in spec.outputs]
+
+    @property
+    def is_fitted(self) -> bool:
+        """Whether every stateful feature has learned its parameters."""
+        return all(spec.name in self.state for spec in self.features if spec.fit is not None)
+
+    def plan(self, columns: Iterable[str]) -> List[FeatureSpec]:
+        """Get the execution order for a frame with the given source columns."""
+        key = frozenset(columns)
+        if key not in self._plans:
+            self._plans[key] = self._resolve(key)
+        return self._plans[key]
+
+    def fit(self, df: pd.DataFrame) -> 'FeatureGraph':
+        """Fit stateful features on ``df``, computing only the columns their fits read."""
+        plan = self.plan(df.columns)
+        # Walk back from the stateful features to the features they depend on
+        needed_columns: set = set()
+        needed: List[FeatureSpec] = []
+        for spec in reversed(plan):
+            if spec.fit is not None or needed_columns.intersection(spec.outputs):
+                needed.append(spec)
+                needed_columns.update(spec.inputs)
+
+        computed: Dict[str, Any] = {}
+        for spec in reversed(needed):
+            with stage_timer(f'features.fit.{spec.name}'):
+                inputs = {c: computed[c] if c in computed else df[c] for c in spec.inputs}
+                if spec.fit is not None:
+                    self.state[spec.name] = spec.fit(inputs)
+                if needed_columns.intersection(spec.outputs):
+                    results = spec.compute(inputs, self.state.get(spec.name))
+                    computed.update({c: pd.Series(v, index=df.index) for c, v in results.items()})
+        return self
+
+    def fit_transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """Fit stateful features on ``df`` and compute all features in batch mode."""
+        return self._run_batch(df, fit=True, inplace=inplace)
+
+    def transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """Compute all features in batch mode using previously fitted state."""
+        return self._run_batch(df, fit=False, inplace=inplace)
+
+    def transform_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute all features for a single record without building a DataFrame."""
+        out = dict(row)
+        for spec in self.plan(out.keys()):
+            inputs = {column: out[column] for column in spec.inputs}
+            state = self.state.get(spec.name)
+            if spec.compute_row is not None:
+                if state is None and spec.fit is not None:
+                    state = spec.fit({c: pd.Series([v]) for c, v in inputs.items()})
+                out.update(spec.compute_row(inputs, state))
+            else:
+                series_inputs = {c: pd.Series([v]) for c, v in inputs.items()}
+                if state is None and spec.fit is not None:
+                    state = spec.fit(series_inputs)
+                results = spec.compute(series_inputs, state)
+                out.update({c: pd.Series(v).iloc[0] for c, v in results.items()})
+        return out
+
+    def _run_batch(self, df: pd.DataFrame, fit: bool, inplace: bool) -> pd.DataFrame:
+        # A single output frame; every feature writes its columns into it
+        out = df if inplace else df.copy()
+        for spec in self.plan(out.columns):
+            with stage_timer(f'features.{spec.name}'):
+                inputs = {column: out[column] for column in spec.inputs}
+                if spec.fit is not None and (fit or spec.name not in self.state):
+                    self.state[spec.name] = spec.fit(inputs)
+                results = spec.compute(inputs, self.state.get(spec.name))
+                for column, values in results.items():
+                    out[column] = values
+        return out
+
+    def _resolve(self, source_columns: FrozenSet[str]) -> List[FeatureSpec]:
+        """Topologically order the features that can run on the given columns."""
+        def available(column: str, spec: FeatureSpec) -> bool:
+            producer = self._producers.get(column)
+            # A source column is usable as-is unless another feature rewrites it
+            return column in source_columns and (producer is None or producer is spec)
+
+        def missing_inputs(spec: FeatureSpec, skipped: set) -> List[str]:
+            missing = []
+            for column in spec.inputs:
+                if available(column, spec):
+                    continue
+                producer = self._producers.get(column)
+                if producer is None or producer is spec or producer.name in skipped:
+                    missing.append(column)
+            return missing
+
+        ordered: List[FeatureSpec] = []
+        done_columns: set = set()
+        skipped: set = set()
+        missing_required: List[str] = []
+        pending = list(self.features)
+
+        while pending:
+            progressed = False
+            for spec in list(pending):
+                missing = missing_inputs(spec, skipped)
+                if missing:
+                    if not spec.optional:
+                        # Report source columns only; derived ones follow from them
+                        missing_required.extend(
+                            c for c in missing
+                            if c not in missing_required and self._producers.get(c) in (None, spec)
+                        )
+                    skipped.add(spec.name)
+                    pending.remove(spec)
+                    progressed = True
+                    continue
+                if all(available(c, spec) or c in done_columns for c in spec.inputs):
+                    ordered.append(spec)
+                    done_columns.update(spec.outputs)
+                    pending.remove(spec)
+                    progressed = True
+            if not progressed:
+                names = ', '.join(spec.name for spec in pending)
+                raise ValueError(f"Cyclic feature dependencies between: {names}")
+
+        if missing_required:
+            raise ValueError(f"Missing columns: {', '.join(missing_required)}")
+        return ordered
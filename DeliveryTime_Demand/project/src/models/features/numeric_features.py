@@ -1,27 +1,23 @@
 """Numeric feature processing."""
 import pandas as pd
 from typing import List
+from .delivery_features import NUMERIC_COLUMNS, numeric_features
+from .feature_graph import FeatureGraph
+from ...utils.instrumentation import timed
 
 class NumericFeatureProcessor:
     def __init__(self):
-        self.numeric_columns = [
-            'Delivery_person_Age',
-            'Vehicle_condition',
-            'multiple_deliveries',
-            'Delivery_person_Ratings'
-        ]
+        self.numeric_columns = list(NUMERIC_COLUMNS)
+        self.feature_graph = FeatureGraph(
+            numeric_features(self.numeric_columns),
+            (numeric_features, (self.numeric_columns,))
+        )
     
+    @timed('features.numeric')
     def process_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """Process numeric features."""
-        df = data.copy()
-        
-        for col in self.numeric_columns:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-                df[col] = df[col].fillna(df[col].median())
-        
-        return df
+        return self.feature_graph.fit_transform(data)
     
     def get_feature_names(self) -> List[str]:
         """Get list of numeric feature names."""
-        return self.numeric_columns
\ No newline at end of file
+        return self.numeric_columns
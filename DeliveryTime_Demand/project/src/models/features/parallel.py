@@ -0,0 +1,61 @@
+"""Row-partitioned feature computation on a process pool."""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from .feature_graph import FeatureGraph
+from ...utils.instrumentation import stage_timer, record_batch_size
+from ...utils.thread_budget import limit_worker_threads
+
+# Graph and frame of the running ``parallel_transform``. Set before the pool
+# forks, so workers read their partition from inherited (copy-on-write)
+# memory instead of receiving it pickled
+_source: Dict[str, Any] = {}
+
+
+def partition_bounds(n_rows: int, partition_rows: int) -> List[Tuple[int, int]]:
+    """(start, stop) row ranges covering ``n_rows`` in partitions of ``partition_rows``."""
+    partition_rows = max(int(partition_rows), 1)
+    return [(start, min(start + partition_rows, n_rows)) for start in range(0, n_rows, partition_rows)]
+
+
+def _transform_partition(start: int, stop: int) -> Dict[str, np.ndarray]:
+    """Feature columns of one row range, as arrays; runs in a worker."""
+    graph, df = _source['graph'], _source['frame']
+    part = graph.transform(df.iloc[start:stop])
+    return {column: part[column].to_numpy() for column in graph.output_columns if column in part}
+
+
+def parallel_transform(graph: FeatureGraph, df: pd.DataFrame, workers: int,
+                       partition_rows: int) -> pd.DataFrame:
+    """``graph.transform(df)`` computed over row partitions on ``workers`` processes.
+
+    The graph must be fitted first (``FeatureGraph.fit`` on the whole frame),
+    so every partition applies the same encoders and fill values. Workers send
+    back only the feature columns, which are concatenated once per column into
+    a single copy of ``df``. Falls back to ``graph.transform`` where processes
+    cannot be forked.
+    """
+    if not graph.is_fitted:
+        raise ValueError("Feature graph must be fitted before a parallel transform")
+    bounds = partition_bounds(len(df), partition_rows)
+    if workers <= 1 or len(bounds) <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        return graph.transform(df)
+
+    record_batch_size('features.parallel_partitions', len(bounds))
+    _source.update(graph=graph, frame=df)
+    try:
+        with stage_timer('features.parallel_transform'):
+            context = multiprocessing.get_context('fork')
+            with ProcessPoolExecutor(min(workers, len(bounds)), mp_context=context,
+                                     initializer=limit_worker_threads) as pool:
+                parts = list(pool.map(_transform_partition, *zip(*bounds)))
+    finally:
+        _source.clear()
+
+    with stage_timer('features.parallel_concat'):
+        out = df.copy()
+        for column in parts[0]:
+            out[column] = np.concatenate([part[column] for part in parts])
+    return out
@@ -2,26 +2,20 @@
 import pandas as pd
 import numpy as np
 from typing import List
+from ...utils import time_series
+from ...utils.instrumentation import timed
 
+@timed('features.lags')
 def create_lag_features(data: pd.DataFrame, target_col: str, lags: List[int]) -> pd.DataFrame:
     """Create lagged features for time series data."""
-    df = data.copy()
-    
-    for lag in lags:
-        df[f'lag_{lag}h'] = df[target_col].shift(lag)
-    
-    return df
+    return time_series.create_lag_features(data, target_col, lags)
 
+@timed('features.rolling')
 def create_rolling_features(data: pd.DataFrame, target_col: str, windows: List[int]) -> pd.DataFrame:
     """Create rolling window features."""
-    df = data.copy()
-    
-    for window in windows:
-        df[f'rolling_mean_{window}h'] = df[target_col].rolling(window=window).mean()
-        df[f'rolling_std_{window}h'] = df[target_col].rolling(window=window).std()
-    
-    return df
+    return time_series.create_rolling_features(data, target_col, windows)
 
+@timed('features.cyclical')
 def add_cyclical_features(data: pd.DataFrame, time_col: str) -> pd.DataFrame:
     """Add cyclical time features."""
     df = data.copy()
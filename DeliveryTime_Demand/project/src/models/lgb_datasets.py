@@ -0,0 +1,109 @@
+"""Persisted LightGBM Datasets, so retraining on the same data skips binning.
+
+``LGBMRegressor.fit`` bins every feature again on each call. Here the binned
+Dataset is built once with the fixed ``LGB_DATASET_CONFIG`` bin parameters,
+saved with ``save_binary`` under the fingerprint of its feature matrix, and
+loaded on later runs. Validation Datasets are binned with the training
+Dataset as reference, as LightGBM requires.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+from ..config.data_config import LGB_DATASET_DIR
+from ..config.model_config import LGB_DATASET_CONFIG
+from ..utils.instrumentation import stage_timer, record_cache
+
+# LGBMRegressor parameters that are not LightGBM training parameters, or
+# that bin data and so belong to the Dataset (fixed in LGB_DATASET_CONFIG)
+_SKLEARN_ONLY_PARAMS = {'class_weight', 'importance_type', 'subsample_for_bin'}
+
+
+def booster_params(regressor: lgb.LGBMRegressor) -> Dict[str, Any]:
+    """``lgb.train`` parameters equivalent to a configured ``LGBMRegressor``.
+
+    The sklearn names (``n_estimators``, ``subsample``, ``random_state``, ...)
+    are LightGBM aliases, so they are passed through unchanged.
+    """
+    params = {
+        name: value for name, value in regressor.get_params().items()
+        if value is not None and name not in _SKLEARN_ONLY_PARAMS
+    }
+    params['objective'] = regressor.objective or 'regression'
+    return params
+
+
+def dataset_fingerprint(X: Union[pd.DataFrame, np.ndarray], y: Optional[np.ndarray] = None,
+                        params: Optional[Dict[str, Any]] = None, reference: Optional[str] = None) -> str:
+    """Hash of a feature matrix, its labels, the Dataset parameters and the reference Dataset."""
+    digest = hashlib.sha256()
+    columns = list(map(str, X.columns)) if isinstance(X, pd.DataFrame) else None
+    digest.update(json.dumps([columns, params, reference], sort_keys=True).encode())
+    digest.update(np.ascontiguousarray(np.asarray(X, dtype=float)).tobytes())
+    if y is not None:
+        digest.update(np.ascontiguousarray(np.asarray(y, dtype=float)).tobytes())
+    return digest.hexdigest()[:24]
+
+
+def cached_dataset(X: Union[pd.DataFrame, np.ndarray], y: np.ndarray,
+                   reference: Optional[lgb.Dataset] = None, seed: Optional[int] = None,
+                   cache_dir: Optional[Union[str, Path]] = None) -> lgb.Dataset:
+    """Constructed Dataset for ``X``/``y``, loaded from its binary file when one exists.
+
+    Args:
+        X: Feature matrix
+        y: Labels
+        reference: Training Dataset whose bins a validation Dataset must use
+        seed: Random seed, which also picks the rows sampled to find bin edges
+        cache_dir: Directory of binary Datasets; defaults to ``LGB_DATASET_DIR``
+    """
+    params = dict(LGB_DATASET_CONFIG['params'])
+    if seed is not None:
+        params['seed'] = seed
+    key = dataset_fingerprint(X, y, params, getattr(reference, 'fingerprint', None))
+    path = Path(cache_dir or LGB_DATASET_DIR) / f"{key}.bin"
+    params['verbose'] = -1
+
+    if path.exists():
+        record_cache('lgb_dataset', True)
+        with stage_timer('lgb_dataset.load'):
+            dataset = lgb.Dataset(str(path), reference=reference, params=params).construct()
+    else:
+        record_cache('lgb_dataset', False)
+        with stage_timer('lgb_dataset.construct'):
+            dataset = lgb.Dataset(X, label=np.asarray(y, dtype=float), reference=reference,
+                                  params=params, free_raw_data=False).construct()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Save under a temporary name and rename so readers never see a partial file
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            dataset.save_binary(str(tmp_path))
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+    dataset.fingerprint = key
+    return dataset
+
+
+def train_cached(regressor: lgb.LGBMRegressor, X: Union[pd.DataFrame, np.ndarray], y: np.ndarray,
+                 X_val: Optional[Union[pd.DataFrame, np.ndarray]] = None, y_val: Optional[np.ndarray] = None,
+                 callbacks: Optional[List[Any]] = None,
+                 cache_dir: Optional[Union[str, Path]] = None) -> lgb.Booster:
+    """Train a booster with the regressor's parameters on cached Datasets.
+
+    Returns the ``lgb.Booster``; it predicts like the fitted regressor would.
+    """
+    seed = regressor.random_state
+    train_set = cached_dataset(X, y, seed=seed, cache_dir=cache_dir)
+    valid_sets = []
+    if X_val is not None and y_val is not None:
+        valid_sets.append(cached_dataset(X_val, y_val, reference=train_set, seed=seed, cache_dir=cache_dir))
+    params = booster_params(regressor)
+    num_boost_round = params.pop('n_estimators')
+    return lgb.train(params, train_set, num_boost_round=num_boost_round,
+                     valid_sets=valid_sets, callbacks=callbacks)
@@ -3,23 +3,19 @@ from typing import Dict, List, Tuple
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from .models import (
-    LightGBMModel,
-    XGBoostModel,
-    RandomForestModel,
-    CatBoostModel,
-    GradientBoostingModel
-)
+from .model_factory import ModelFactory
 from ..utils.console_logger import print_model_results
+from ..utils.instrumentation import stage_timer
 
 class ModelEvaluator:
     def __init__(self):
         self.models = {
-            'LightGBM': LightGBMModel(),
-            'XGBoost': XGBoostModel(),
-            'RandomForest': RandomForestModel(),
-            'CatBoost': CatBoostModel(),
-            'GradientBoosting': GradientBoostingModel()
+            'LightGBM': ModelFactory.get_model('lightgbm'),
+            'XGBoost': ModelFactory.get_model('xgboost'),
+            'RandomForest': ModelFactory.get_model('randomforest'),
+            'CatBoost': ModelFactory.get_model('catboost'),
+            'GradientBoosting': ModelFactory.get_model('gradientboosting'),
+            'LookupTable': ModelFactory.get_model('lookuptable')  # Sanity baseline
         }
         self.results = {}
     
@@ -28,11 +24,17 @@ class ModelEvaluator:
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42
         )
-        
+        return self.evaluate_split(X_train, X_test, y_train, y_test)
+    
+    def evaluate_split(self, X_train: pd.DataFrame, X_test: pd.DataFrame,
+                       y_train: pd.Series, y_test: pd.Series) -> Dict[str, Dict[str, float]]:
+        """Evaluate all models on a given train/test split and return their metrics."""
         for name, model in self.models.items():
             print(f"\nTraining {name}...")
-            model.train(X_train, y_train)
-            y_pred = model.predict(X_test)
+            with stage_timer(f'model.train.{name}'):
+                model.train(X_train, y_train)
+            with stage_timer(f'model.predict.{name}'):
+                y_pred = model.predict(X_test)
             metrics = model.calculate_metrics(y_test, y_pred)
             self.results[name] = metrics
         
@@ -1,32 +1,48 @@
+"""Lazy registry of model backends."""
 from typing import Dict, Type
 from .base_model import BaseModel
-from .models import (
-    LightGBMModel,
-    XGBoostModel,
-    RandomForestModel,
-    CatBoostModel,
-    GradientBoostingModel,
-    DecisionTreeModel
-)
+from . import models as model_wrappers
 
 class ModelFactory:
-    _models: Dict[str, Type[BaseModel]] = {
-        'lightgbm': LightGBMModel,
-        'xgboost': XGBoostModel,
-        'randomforest': RandomForestModel,
-        'catboost': CatBoostModel,
-        'gradientboosting': GradientBoostingModel,
-        'decisiontree': DecisionTreeModel
+    # Model name -> wrapper class name in models/models; resolved on first use
+    _models: Dict[str, str] = {
+        'lightgbm': 'LightGBMModel',
+        'xgboost': 'XGBoostModel',
+        'randomforest': 'RandomForestModel',
+        'catboost': 'CatBoostModel',
+        'gradientboosting': 'GradientBoostingModel',
+        'decisiontree': 'DecisionTreeModel',
+        'lookuptable': 'LookupTableModel'
     }
+    _loaded: Dict[str, Type[BaseModel]] = {}
+    
+    @classmethod
+    def get_model_class(cls, model_name: str) -> Type[BaseModel]:
+        """Get model class by name, importing its backend library on first use."""
+        key = model_name.lower()
+        if key not in cls._models:
+            raise ValueError(f"Model {model_name} not found. Available models: {list(cls._models.keys())}")
+        if key not in cls._loaded:
+            cls._loaded[key] = getattr(model_wrappers, cls._models[key])
+        return cls._loaded[key]
     
     @classmethod
     def get_model(cls, model_name: str) -> BaseModel:
         """Get model instance by name."""
-        if model_name.lower() not in cls._models:
-            raise ValueError(f"Model {model_name} not found. Available models: {list(cls._models.keys())}")
-        return cls._models[model_name.lower()]()
+        return cls.get_model_class(model_name)()
+    
+    @classmethod
+    def register(cls, model_name: str, class_name: str) -> None:
+        """Register a wrapper class exported by models/models under a model name."""
+        cls._models[model_name.lower()] = class_name
+        cls._loaded.pop(model_name.lower(), None)
+    
+    @classmethod
+    def is_loaded(cls, model_name: str) -> bool:
+        """Check whether a model's backend has already been imported."""
+        return model_name.lower() in cls._loaded
     
     @classmethod
     def get_available_models(cls) -> list:
         """Get list of available models."""
-        return list(cls._models.keys())
\ No newline at end of file
+        return list(cls._models.keys())
@@ -1,28 +1,63 @@
 """Model registry for saving and loading trained models."""
+import os
 import pickle
+import tempfile
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Tuple, Union
 from ..config.data_config import MODEL_DIR
 
+def _read_umask() -> int:
+    """Process umask (reading it requires setting it)."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+# Read once at import, before server or reloader threads exist; briefly
+# setting it to 0 later would give files other threads create meanwhile mode 0666
+_UMASK = _read_umask()
+
 class ModelRegistry:
     @staticmethod
-    def save_model(model: Any, model_name: str) -> None:
+    def artifact_path(model_name: str, model_dir: Optional[Union[str, Path]] = None) -> Path:
+        """Path of a model artifact."""
+        return Path(model_dir or MODEL_DIR) / f"{model_name}.pkl"
+    
+    @staticmethod
+    def artifact_version(model_name: str, model_dir: Optional[Union[str, Path]] = None) -> Optional[Tuple[int, int, int]]:
+        """Identity of the artifact currently on disk (inode, mtime, size), or None if absent."""
+        try:
+            stat = ModelRegistry.artifact_path(model_name, model_dir).stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
+    @staticmethod
+    def save_model(model: Any, model_name: str, model_dir: Optional[Union[str, Path]] = None) -> None:
         """Save trained model to disk."""
         try:
-            model_path = MODEL_DIR / f"{model_name}.pkl"
-            with open(model_path, 'wb') as f:
-                pickle.dump(model, f)
+            model_path = ModelRegistry.artifact_path(model_name, model_dir)
+            # Write to a temporary file and rename so readers never see a partial artifact
+            fd, tmp_path = tempfile.mkstemp(dir=model_path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    # mkstemp creates the file 0600; honour the umask like open() does
+                    os.fchmod(f.fileno(), 0o666 & ~_UMASK)
+                    pickle.dump(model, f)
+                os.replace(tmp_path, model_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
         except Exception as e:
             raise RuntimeError(f"Error saving model: {str(e)}")
     
     @staticmethod
-    def load_model(model_name: str) -> Optional[Any]:
+    def load_model(model_name: str, model_dir: Optional[Union[str, Path]] = None) -> Optional[Any]:
         """Load trained model from disk."""
         try:
-            model_path = MODEL_DIR / f"{model_name}.pkl"
+            model_path = ModelRegistry.artifact_path(model_name, model_dir)
             if not model_path.exists():
                 return None
             with open(model_path, 'rb') as f:
                 return pickle.load(f)
         except Exception as e:
-            raise RuntimeError(f"Error loading model: {str(e)}")
\ No newline at end of file
+            raise RuntimeError(f"Error loading model: {str(e)}")
@@ -0,0 +1,120 @@
+"""Background reloading of served model artifacts."""
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from .model_registry import ModelRegistry
+from ..config.serving_config import SERVING_CONFIG
+from ..utils.instrumentation import stage_timer, record_model_reload
+
+class ModelSlot:
+    """The served version of one model artifact.
+
+    Request handlers read ``current`` once and use that object until they
+    finish, so swapping it never affects requests already in flight.
+    """
+
+    def __init__(self, artifact: str, default: Any,
+                 warmup: Optional[Callable[[Any], None]] = None):
+        self.artifact = artifact
+        self.current = default
+        self.warmup = warmup
+        self.version: Optional[Tuple[int, int, int]] = None
+        self.loaded_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+class ModelReloader:
+    """Watches the model directory and swaps in new artifact versions.
+
+    A changed artifact is loaded and warmed up off the request path; only a
+    fully warmed model replaces the current one, with a single reference
+    assignment. A broken artifact is reported and the old model keeps serving.
+    """
+
+    def __init__(self, slots: Iterable[ModelSlot],
+                 model_dir: Optional[Union[str, Path]] = None,
+                 poll_seconds: Optional[float] = None):
+        self.slots: Dict[str, ModelSlot] = {slot.artifact: slot for slot in slots}
+        self.model_dir = model_dir
+        self.poll_seconds = poll_seconds or SERVING_CONFIG['reload_poll_seconds']
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __getitem__(self, artifact: str) -> Any:
+        """Currently served model for an artifact."""
+        return self.slots[artifact].current
+
+    def check(self) -> List[str]:
+        """Reload every artifact whose file changed; returns the ones swapped in."""
+        reloaded = []
+        for artifact, slot in self.slots.items():
+            version = ModelRegistry.artifact_version(artifact, self.model_dir)
+            if version is not None and version != slot.version and self.reload(artifact):
+                reloaded.append(artifact)
+        return reloaded
+
+    def reload(self, artifact: str) -> bool:
+        """Load, warm up and swap in the artifact on disk; False if it failed."""
+        slot = self.slots[artifact]
+        with self._reload_lock:
+            version = ModelRegistry.artifact_version(artifact, self.model_dir)
+            if version is None:
+                slot.last_error = f"No artifact found for {artifact}"
+                record_model_reload(artifact, 'missing')
+                return False
+
+            try:
+                with stage_timer(f'reload.{artifact}'):
+                    candidate = ModelRegistry.load_model(artifact, self.model_dir)
+                    if slot.warmup is not None:
+                        slot.warmup(candidate)
+            except Exception as e:
+                # Remember the version so a broken file is not retried every poll
+                slot.version = version
+                slot.last_error = str(e)
+                record_model_reload(artifact, 'failed')
+                return False
+
+            slot.current = candidate
+            slot.version = version
+            slot.loaded_at = time.time()
+            slot.last_error = None
+            record_model_reload(artifact, 'success')
+            return True
+
+    def start(self) -> None:
+        """Load any artifacts on disk, then keep polling in a daemon thread."""
+        self.check()
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='model-reloader', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Served version of every artifact."""
+        return {
+            artifact: {
+                'model': type(slot.current).__name__,
+                'version': list(slot.version) if slot.version else None,
+                'loaded_at': slot.loaded_at,
+                'last_error': slot.last_error
+            }
+            for artifact, slot in self.slots.items()
+        }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.check()
+            except Exception:
+                # Keep watching; failures are recorded per artifact
+                pass
@@ -1,17 +1,30 @@
-from .lightgbm_model import LightGBMModel
-from .xgboost_model import XGBoostModel
-from .randomforest_model import RandomForestModel
-from .catboost_model import CatBoostModel
-from .gradientboosting_model import GradientBoostingModel
-from .decisiontree_model import DecisionTreeModel
-from .sarima_model import SARIMAModel  # Add this line
+"""Model wrappers, each importing its backend library on first access."""
+import importlib
 
-__all__ = [
-    'LightGBMModel',
-    'XGBoostModel',
-    'RandomForestModel',
-    'CatBoostModel',
-    'GradientBoostingModel',
-    'DecisionTreeModel',
-    'SARIMAModel'  # Add this line
-]
+# Class name -> submodule; nothing is imported until the class is requested
+_MODEL_MODULES = {
+    'LightGBMModel': '.lightgbm_model',
+    'XGBoostModel': '.xgboost_model',
+    'RandomForestModel': '.randomforest_model',
+    'CatBoostModel': '.catboost_model',
+    'GradientBoostingModel': '.gradientboosting_model',
+    'DecisionTreeModel': '.decisiontree_model',
+    'LookupTableModel': '.lookup_table_model',
+    'SARIMAModel': '.sarima_model',
+    'MultiSeriesSARIMAModel': '.sarima_model'
+}
+
+__all__ = list(_MODEL_MODULES)
+
+
+def __getattr__(name):
+    if name not in _MODEL_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_MODEL_MODULES[name], __name__)
+    model_class = getattr(module, name)
+    globals()[name] = model_class
+    return model_class
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
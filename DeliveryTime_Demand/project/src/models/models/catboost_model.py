@@ -1,6 +1,7 @@
 """CatBoost model implementation."""
 from catboost import CatBoostRegressor
 from ..base_model import BaseModel
+from ...utils.thread_budget import threads
 
 class CatBoostModel(BaseModel):
     def __init__(self):
@@ -9,11 +10,15 @@ class CatBoostModel(BaseModel):
             learning_rate=0.01,
             depth=6,
             random_seed=42,
-            verbose=False
+            verbose=False,
+            thread_count=threads()
         )
         
     def train(self, X_train, y_train, X_val=None, y_val=None):
         """Train the model."""
+        # Parameters are fixed once fitted, so prediction threads are passed per call
+        if not self.model.is_fitted():
+            self.model.set_params(thread_count=threads())
         if X_val is not None and y_val is not None:
             eval_set = [(X_val, y_val)]
             self.model.fit(
@@ -27,4 +32,4 @@ class CatBoostModel(BaseModel):
         
     def predict(self, X):
         """Make predictions."""
-        return self.model.predict(X)
\ No newline at end of file
+        return self.model.predict(X, thread_count=threads())
\ No newline at end of file
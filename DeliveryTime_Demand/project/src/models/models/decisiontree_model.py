@@ -1,3 +1,5 @@
+from typing import Tuple
+import numpy as np
 from sklearn.tree import DecisionTreeRegressor
 from ..base_model import BaseModel
 
@@ -9,9 +11,23 @@ class DecisionTreeModel(BaseModel):
             min_samples_leaf=2,
             random_state=42
         )
+        self.leaf_std = None  # Training target std per tree node
         
     def train(self, X_train, y_train, X_val=None, y_val=None):
         self.model.fit(X_train, y_train)
+        # Spread of the training targets in each leaf, for uncertainty estimates
+        y = np.asarray(y_train, dtype=float)
+        leaves = self.model.apply(X_train)
+        n_nodes = self.model.tree_.node_count
+        counts = np.maximum(np.bincount(leaves, minlength=n_nodes), 1)
+        mean = np.bincount(leaves, weights=y, minlength=n_nodes) / counts
+        mean_sq = np.bincount(leaves, weights=y * y, minlength=n_nodes) / counts
+        self.leaf_std = np.sqrt(np.maximum(mean_sq - mean * mean, 0))
         
     def predict(self, X):
-        return self.model.predict(X)
\ No newline at end of file
+        return self.model.predict(X)
+    
+    def predict_with_uncertainty(self, X) -> Tuple[np.ndarray, np.ndarray]:
+        """Prediction and training target std of the leaf each row falls in."""
+        leaves = self.model.apply(X)
+        return self.model.tree_.value[leaves, 0, 0], self.leaf_std[leaves]
@@ -1,10 +1,19 @@
 """LightGBM model implementation."""
 import lightgbm as lgb
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import numpy as np
 from ..base_model import BaseModel
+from ..lgb_datasets import train_cached
+from ..truncation import iteration_curve
+from ...config.model_config import LGB_DATASET_CONFIG
+from ...utils.thread_budget import threads, apply_threads
 
 class LightGBMModel(BaseModel):
+    # Set when trained on a cached Dataset; predicts in place of ``model``
+    booster: Optional[lgb.Booster] = None
+    # MAE and latency per number of trees, on the validation set when given
+    iteration_curve: Optional[List[Dict[str, float]]] = None
+    
     def __init__(self):
         # Updated parameters to avoid warnings
         self.model = lgb.LGBMRegressor(
@@ -16,21 +25,35 @@ class LightGBMModel(BaseModel):
             subsample_freq=5,  # Changed from bagging_freq
             random_state=42,
             verbose=-1,  # Suppress training output
-            force_row_wise=True  # Avoid threading overhead message
+            force_row_wise=True,  # Avoid threading overhead message
+            n_jobs=threads()
         )
         
     def train(self, X_train, y_train, X_val=None, y_val=None):
         """Train the model."""
-        if X_val is not None and y_val is not None:
-            eval_set = [(X_val, y_val)]
-            self.model.fit(
-                X_train, y_train,
-                eval_set=eval_set,
-                callbacks=[lgb.early_stopping(50, verbose=False)]  # Suppress early stopping messages
-            )
+        apply_threads(self.model)
+        if LGB_DATASET_CONFIG['enabled']:
+            callbacks = [lgb.early_stopping(50, verbose=False)] if X_val is not None and y_val is not None else None
+            self.booster = train_cached(self.model, X_train, y_train, X_val, y_val, callbacks=callbacks)
         else:
-            self.model.fit(X_train, y_train)
+            self.booster = None
+            if X_val is not None and y_val is not None:
+                eval_set = [(X_val, y_val)]
+                self.model.fit(
+                    X_train, y_train,
+                    eval_set=eval_set,
+                    callbacks=[lgb.early_stopping(50, verbose=False)]  # Suppress early stopping messages
+                )
+            else:
+                self.model.fit(X_train, y_train)
         
-    def predict(self, X):
-        """Make predictions."""
-        return self.model.predict(X)
\ No newline at end of file
+        estimator = self.booster if self.booster is not None else self.model
+        X_curve, y_curve = (X_val, y_val) if X_val is not None and y_val is not None else (X_train, y_train)
+        booster = self.booster if self.booster is not None else self.model.booster_
+        self.iteration_curve = iteration_curve(estimator, X_curve, y_curve, booster.current_iteration())
+        
+    def predict(self, X, num_iteration: Optional[int] = None):
+        """Make predictions, with the first ``num_iteration`` trees if given."""
+        if self.booster is not None:
+            return self.booster.predict(X, num_iteration=num_iteration, num_threads=threads())
+        return self.model.predict(X, num_iteration=num_iteration, num_threads=threads())
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""Precomputed delivery time lookup table, a fast baseline and fallback."""
+import bisect
+import math
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import numpy as np
+from ..base_model import BaseModel
+from ...config.model_config import LOOKUP_TABLE_CONFIG
+
+
+def group_quantiles(cells: np.ndarray, values: np.ndarray, n_cells: int,
+                    quantiles: List[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """Count and linear-interpolated quantiles of ``values`` per cell in one sort.
+
+    Returns counts of shape (n_cells,) and quantiles of shape (n_cells, len(quantiles)),
+    NaN for empty cells; matches ``np.quantile`` within each cell.
+    """
+    order = np.lexsort((values, cells))
+    values = values[order]
+    counts = np.bincount(cells, minlength=n_cells)
+    starts = np.cumsum(counts) - counts
+
+    stats = np.full((n_cells, len(quantiles)), np.nan)
+    occupied = counts > 0
+    n, first = counts[occupied], starts[occupied]
+    for j, q in enumerate(quantiles):
+        position = q * (n - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, n - 1)
+        fraction = position - lower
+        stats[occupied, j] = values[first + lower] * (1 - fraction) + values[first + upper] * fraction
+    return counts, stats
+
+
+class LookupTableModel(BaseModel):
+    """Median and quantile delivery times over a dense grid of banded keys.
+
+    Keys are the distance band, encoded traffic, weather, vehicle and city, and
+    the hour band. Cells with fewer than ``min_count`` training orders take the
+    values of their parent cell (the same keys without the last one), resolved
+    at training time so prediction is a single integer index into one array.
+    Categories not seen in training fall into an always-empty slot and back off.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or LOOKUP_TABLE_CONFIG
+        self.keys = list(self.config['keys'])
+        self.distance_edges = list(self.config['distance_bands_km'])
+        self.hour_edges = list(self.config['hour_bands'])
+        self.columns = {'distance': 'distance', 'hour': 'hour', **self.config['categorical_columns']}
+        self.quantiles = sorted(set(self.config['quantiles']) | {0.5})
+        self.median_slot = self.quantiles.index(0.5)
+        self.min_count = self.config['min_count']
+        self.sizes: Dict[str, int] = {}
+        self.table: Optional[np.ndarray] = None  # key dims + (n_quantiles,)
+        self.backoff_depth: Optional[np.ndarray] = None  # Number of keys each cell used
+
+    def train(self, X_train, y_train, X_val=None, y_val=None):
+        """Build the table from processed features and delivery times."""
+        y = np.asarray(y_train, dtype=float)
+        known = ~np.isnan(y)
+
+        # Categorical sizes leave one extra slot for unseen codes
+        self.sizes = {'distance': len(self.distance_edges) + 1, 'hour': len(self.hour_edges) + 1}
+        for key in self.keys:
+            if key not in self.sizes:
+                codes = self._column(X_train, key)
+                codes = codes[(codes >= 0) & ~np.isnan(codes)]
+                self.sizes[key] = (int(codes.max()) + 1 if len(codes) else 0) + 1
+
+        indices = [index[known] for index in self._key_indices(X_train)]
+        y = y[known]
+        shape = tuple(self.sizes[key] for key in self.keys)
+
+        # Coarse to fine: each level keeps its own stats where dense enough
+        table, depth = None, None
+        for level in range(len(self.keys) + 1):
+            level_shape = shape[:level]
+            cells = (np.ravel_multi_index(indices[:level], level_shape) if level
+                     else np.zeros(len(y), dtype=np.int64))
+            counts, stats = group_quantiles(cells, y, int(np.prod(level_shape)), self.quantiles)
+            counts = counts.reshape(level_shape)
+            stats = stats.reshape(level_shape + (len(self.quantiles),))
+            if table is None:
+                table, depth = stats, np.zeros(level_shape, dtype=np.int8)
+                continue
+            dense = counts >= self.min_count
+            table = np.where(dense[..., None], stats, table[..., None, :])
+            depth = np.where(dense, level, depth[..., None]).astype(np.int8)
+
+        self.table = table
+        self.backoff_depth = depth
+
+    def predict(self, X) -> np.ndarray:
+        """Median delivery time for each row."""
+        return self.predict_quantiles(X)[:, self.median_slot]
+
+    def predict_quantiles(self, X) -> np.ndarray:
+        """Delivery time quantiles for each row, shape (n, len(self.quantiles))."""
+        if self.table is None:
+            raise RuntimeError("Model must be trained before making predictions")
+        return self.table[tuple(self._key_indices(X))]
+
+    def predict_with_uncertainty(self, X) -> Tuple[np.ndarray, np.ndarray]:
+        """Median and spread between the outer quantiles for each row."""
+        quantiles = self.predict_quantiles(X)
+        return quantiles[:, self.median_slot], quantiles[:, -1] - quantiles[:, 0]
+
+    def predict_row(self, features: Mapping[str, Any]) -> float:
+        """Median delivery time for one processed order without array overhead."""
+        if self.table is None:
+            raise RuntimeError("Model must be trained before making predictions")
+        index = []
+        for key in self.keys:
+            value = float(features[self.columns[key]])
+            if key == 'distance':
+                index.append(bisect.bisect_right(self.distance_edges, value))
+            elif key == 'hour':
+                index.append(bisect.bisect_right(self.hour_edges, value))
+            else:
+                unseen = math.isnan(value) or value < 0 or value >= self.sizes[key] - 1
+                index.append(self.sizes[key] - 1 if unseen else int(value))
+        index.append(self.median_slot)
+        return float(self.table[tuple(index)])
+
+    def _column(self, X, key: str) -> np.ndarray:
+        return np.asarray(X[self.columns[key]], dtype=float)
+
+    def _key_indices(self, X) -> List[np.ndarray]:
+        """Integer index along every key dimension for each row."""
+        indices = []
+        for key in self.keys:
+            values = self._column(X, key)
+            if key == 'distance':
+                indices.append(np.digitize(values, self.distance_edges))
+            elif key == 'hour':
+                indices.append(np.digitize(values, self.hour_edges))
+            else:
+                unseen = np.isnan(values) | (values < 0) | (values >= self.sizes[key] - 1)
+                codes = np.where(unseen, self.sizes[key] - 1, values)
+                indices.append(codes.astype(np.int64))
+        return indices
@@ -1,5 +1,6 @@
 from sklearn.ensemble import RandomForestRegressor
 from ..base_model import BaseModel
+from ...utils.thread_budget import threads, apply_threads
 
 class RandomForestModel(BaseModel):
     def __init__(self):
@@ -8,11 +9,14 @@ class RandomForestModel(BaseModel):
             max_depth=10,
             min_samples_split=5,
             min_samples_leaf=2,
-            random_state=42
+            random_state=42,
+            n_jobs=threads()
         )
         
     def train(self, X_train, y_train, X_val=None, y_val=None):
+        apply_threads(self.model)
         self.model.fit(X_train, y_train)
         
     def predict(self, X):
+        apply_threads(self.model)
         return self.model.predict(X)
\ No newline at end of file
@@ -1,40 +1,147 @@
 """SARIMA model for time series prediction."""
+import time
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 from ..base_model import BaseModel
+from ...config.model_config import SARIMA_CONFIG
+from ...utils.instrumentation import record_cache, stage_timer
+from ...utils.thread_budget import threads, limit_worker_threads
 
 class SARIMAModel(BaseModel):
     def __init__(self):
         self.model = None
-        self.order = (1, 1, 1)
-        self.seasonal_order = (1, 1, 1, 24)  # 24 for hourly data
-    
+        self.results = None
+        self.order = SARIMA_CONFIG['order']
+        self.seasonal_order = SARIMA_CONFIG['seasonal_order']
+        self._forecast_cache: Dict[int, pd.Series] = {}
+
     def train(self, data: pd.DataFrame) -> Dict[str, float]:
         """Train SARIMA model on time series data."""
         try:
+            # Warm start from the previous fit when refitting
+            start_params = self.results.params if self.results is not None else None
+
             # Fit SARIMA model
             self.model = SARIMAX(
                 data,
                 order=self.order,
                 seasonal_order=self.seasonal_order
             )
-            self.results = self.model.fit(disp=False)
-            
+            self.results = self.model.fit(start_params=start_params, disp=False)
+            self._forecast_cache = {}
+
             # Calculate metrics
             y_pred = self.results.get_prediction().predicted_mean
             metrics = self.calculate_metrics(data, y_pred)
-            
+
             return metrics
         except Exception as e:
             raise RuntimeError(f"Error training SARIMA model: {str(e)}")
-    
+
     def predict(self, features: Dict[str, Any]) -> np.ndarray:
         """Make predictions using trained SARIMA model."""
         if self.results is None:
             raise RuntimeError("Model must be trained before making predictions")
-        
+
         steps = features.get('steps', 24)  # Default to 24 hours
-        forecast = self.results.get_forecast(steps=steps)
-        return forecast.predicted_mean
\ No newline at end of file
+        record_cache('sarima_forecast', steps in self._forecast_cache)
+        if steps not in self._forecast_cache:
+            self._forecast_cache[steps] = self.results.get_forecast(steps=steps).predicted_mean
+        return self._forecast_cache[steps]
+
+
+def _fit_series(series: pd.Series, order: Tuple[int, ...], seasonal_order: Tuple[int, ...],
+                start_params: Optional[np.ndarray], maxiter: int) -> Tuple[np.ndarray, float]:
+    """Fit one SARIMA series and return its parameters; runs in a worker process."""
+    start = time.perf_counter()
+    results = SARIMAX(series, order=order, seasonal_order=seasonal_order).fit(
+        start_params=start_params,
+        maxiter=maxiter,
+        disp=False
+    )
+    return np.asarray(results.params), time.perf_counter() - start
+
+
+class MultiSeriesSARIMAModel(BaseModel):
+    """One SARIMA per series (overall and each city), fitted in parallel.
+
+    Refits start the optimizer from the previous parameters of the same series,
+    and forecasts are cached per series and horizon until the next refit.
+    """
+
+    def __init__(self, order: Optional[Tuple[int, ...]] = None,
+                 seasonal_order: Optional[Tuple[int, ...]] = None,
+                 maxiter: Optional[int] = None, n_jobs: Optional[int] = None):
+        self.order = tuple(order or SARIMA_CONFIG['order'])
+        self.seasonal_order = tuple(seasonal_order or SARIMA_CONFIG['seasonal_order'])
+        self.maxiter = maxiter or SARIMA_CONFIG['maxiter']
+        self.n_jobs = n_jobs or SARIMA_CONFIG['n_jobs'] or threads()
+        self.params: Dict[str, np.ndarray] = {}
+        self.results: Dict[str, Any] = {}
+        self.fit_seconds: Dict[str, float] = {}
+        self._forecast_cache: Dict[Tuple[str, int], pd.Series] = {}
+
+    def train(self, data: Dict[str, pd.Series]) -> Dict[str, Dict[str, float]]:
+        """Fit every series in parallel and return in-sample metrics per series.
+
+        Args:
+            data: Hourly order counts keyed by series name, e.g. from
+                ``PeakDemandModel.get_hourly_series``
+        """
+        try:
+            names = list(data)
+            jobs = [
+                (data[name], self.order, self.seasonal_order, self.params.get(name), self.maxiter)
+                for name in names
+            ]
+
+            with stage_timer('sarima.fit_all'):
+                if self.n_jobs == 1 or len(jobs) == 1:
+                    fitted = [_fit_series(*job) for job in jobs]
+                else:
+                    with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(jobs)),
+                                             initializer=limit_worker_threads) as pool:
+                        fitted = list(pool.map(_fit_series, *zip(*jobs)))
+
+            metrics = {}
+            for name, (params, seconds) in zip(names, fitted):
+                # Re-attach fitted parameters without re-optimizing
+                results = SARIMAX(
+                    data[name], order=self.order, seasonal_order=self.seasonal_order
+                ).smooth(params)
+                self.params[name] = params
+                self.results[name] = results
+                self.fit_seconds[name] = seconds
+                metrics[name] = self.calculate_metrics(
+                    data[name].to_numpy(dtype=float),
+                    np.asarray(results.fittedvalues, dtype=float)
+                )
+
+            self._forecast_cache = {}
+            return metrics
+        except Exception as e:
+            raise RuntimeError(f"Error training SARIMA models: {str(e)}")
+
+    def predict(self, features: Optional[Dict[str, Any]] = None) -> Dict[str, pd.Series]:
+        """Forecast the next ``steps`` hours for the requested series (default: all)."""
+        if not self.results:
+            raise RuntimeError("Model must be trained before making predictions")
+
+        features = features or {}
+        steps = features.get('steps', 24)
+        names = features.get('series') or list(self.results)
+        return {name: self.forecast(name, steps) for name in names}
+
+    def forecast(self, series: str, steps: int = 24) -> pd.Series:
+        """Forecast one series, reusing the cached forecast until the next refit."""
+        if series not in self.results:
+            raise ValueError(f"Unknown series {series}. Available series: {list(self.results)}")
+
+        key = (series, steps)
+        record_cache('sarima_forecast', key in self._forecast_cache)
+        if key not in self._forecast_cache:
+            self._forecast_cache[key] = self.results[series].get_forecast(steps=steps).predicted_mean
+        return self._forecast_cache[key]
@@ -3,6 +3,7 @@ import xgboost as xgb
 from typing import Dict, Any
 import numpy as np
 from ..base_model import BaseModel
+from ...utils.thread_budget import threads, apply_threads
 
 class XGBoostModel(BaseModel):
     def __init__(self):
@@ -12,11 +13,13 @@ class XGBoostModel(BaseModel):
             max_depth=6,
             subsample=0.8,
             colsample_bytree=0.8,
-            random_state=42
+            random_state=42,
+            n_jobs=threads()
         )
         
     def train(self, X_train, y_train, X_val=None, y_val=None):
         """Train the model."""
+        apply_threads(self.model)
         if X_val is not None and y_val is not None:
             eval_set = [(X_val, y_val)]
             self.model.fit(
@@ -30,4 +33,5 @@ class XGBoostModel(BaseModel):
         
     def predict(self, X):
         """Make predictions."""
+        apply_threads(self.model)
         return self.model.predict(X)
\ No newline at end of file
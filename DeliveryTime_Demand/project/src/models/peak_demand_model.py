@@ -1,30 +1,76 @@
 """Peak demand prediction model with city-wise analysis."""
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from .base_model import BaseModel
-from .features import extract_time_features
-from ..utils.date_parsers import parse_date
-from ..utils.time_parsers import combine_date_time
+from ..config.model_config import SARIMA_CONFIG
+from ..utils.date_parsers import parse_dates
+from ..utils.time_parsers import parse_hours
+from ..utils.time_series import hourly_demand_profile
 from ..utils.console_logger import print_peak_demand_forecast
+from ..utils.instrumentation import stage_timer, timed, record_batch_size
+
+def order_datetimes(data: pd.DataFrame) -> pd.Series:
+    """Vectorized order timestamps (date plus order hour); unparseable rows are NaT."""
+    return parse_dates(data['Order_Date']) + pd.to_timedelta(parse_hours(data['Time_Orderd']), unit='h')
+
+def hourly_patterns(mean: np.ndarray, std: np.ndarray) -> Dict[int, Dict[str, float]]:
+    """Hour-of-day pattern dict from profile rows, skipping hours never observed."""
+    return {
+        hour: {'mean': round(mean[hour]), 'std': float(std[hour])}
+        for hour in range(24)
+        if not np.isnan(mean[hour])
+    }
 
 class PeakDemandModel(BaseModel):
-    def __init__(self):
-        self.hourly_patterns = {}
-        self.city_patterns = {}
+    # Per-series SARIMA forecaster; None predicts from hourly patterns only
+    forecaster: Optional[Any] = None
+    
+    def __init__(self, forecaster: Optional[Any] = None):
+        """Hourly demand patterns, plus SARIMA forecasts when enabled.
+
+        Args:
+            forecaster: Optional ``MultiSeriesSARIMAModel``; defaults to one when
+                ``SARIMA_CONFIG['peak_demand_forecasts']`` is set
+        """
+        # Mean and std of orders per hour of day (NaN where never observed),
+        # overall and one row per city; arrays so forked workers share them
+        self.hourly_mean = np.empty(0)
+        self.hourly_std = np.empty(0)
+        self.city_index: Dict[str, int] = {}
+        self.city_mean = np.empty((0, 24))
+        self.city_std = np.empty((0, 24))
+        if forecaster is None and SARIMA_CONFIG['peak_demand_forecasts']:
+            # Imported here so serving without forecasts never loads statsmodels
+            from .models import MultiSeriesSARIMAModel
+            forecaster = MultiSeriesSARIMAModel()
+        self.forecaster = forecaster
+    
+    @property
+    def is_trained(self) -> bool:
+        """Whether any hour of demand has been observed."""
+        return bool(len(self.hourly_mean)) and not np.isnan(self.hourly_mean).all()
     
+    @property
+    def hourly_patterns(self) -> Dict[int, Dict[str, float]]:
+        """Overall mean and std of orders per observed hour of day."""
+        return hourly_patterns(self.hourly_mean, self.hourly_std) if len(self.hourly_mean) else {}
+    
+    @property
+    def city_patterns(self) -> Dict[str, Dict[int, Dict[str, float]]]:
+        """Mean and std of orders per observed hour of day for each city."""
+        return {
+            city: hourly_patterns(self.city_mean[row], self.city_std[row])
+            for city, row in self.city_index.items()
+        }
+    
+    @timed('peak_demand.prepare_data')
     def _prepare_data(self, data: pd.DataFrame) -> Dict[str, pd.DataFrame]:
         """Prepare time series data for peak demand prediction."""
         df = data.copy()
         
         # Parse dates and times
-        df['datetime'] = df.apply(
-            lambda row: combine_date_time(
-                parse_date(row['Order_Date']),
-                row['Time_Orderd']
-            ),
-            axis=1
-        )
+        df['datetime'] = order_datetimes(df)
         
         # Remove rows with NaN values
         df = df.dropna(subset=['datetime', 'City'])
@@ -53,35 +99,42 @@ class PeakDemandModel(BaseModel):
             'by_city': city_orders
         }
     
+    def get_hourly_series(self, data: pd.DataFrame) -> Dict[str, pd.Series]:
+        """Get gap-free hourly order counts overall and per city, keyed by series name."""
+        ts_data = self._prepare_data(data)
+        frames = {'overall': ts_data['overall'], **ts_data['by_city']}
+        return {
+            name: frame.set_index('datetime')['order_count'].asfreq('H', fill_value=0)
+            for name, frame in frames.items()
+        }
+    
+    @timed('peak_demand.train')
     def train(self, data: pd.DataFrame) -> Dict[str, float]:
         """Train the peak demand prediction model."""
         try:
-            # Prepare hourly order data
-            ts_data = self._prepare_data(data)
+            record_batch_size('peak_demand.train', len(data))
+            
+            # Order timestamps truncated to the hour; rows without a city are ignored
+            with stage_timer('peak_demand.order_datetimes'):
+                datetimes = order_datetimes(data)
+            cities = data['City']
             
             # Calculate overall hourly patterns
-            overall_patterns = (
-                ts_data['overall'].groupby(ts_data['overall']['datetime'].dt.hour)['order_count']
-                .agg(['mean', 'std'])
-            )
-            self.hourly_patterns = {
-                hour: {'mean': round(row['mean']), 'std': row['std']}
-                for hour, row in overall_patterns.iterrows()
-            }
+            with stage_timer('peak_demand.hourly_patterns'):
+                overall_keys = np.where(cities.notna(), 'overall', None)
+                _, mean, std = hourly_demand_profile(overall_keys, datetimes)
+                self.hourly_mean = mean[0] if len(mean) else np.empty(0)
+                self.hourly_std = std[0] if len(std) else np.empty(0)
+            
+            # Calculate city-wise patterns in one aggregation pass over all cities
+            with stage_timer('peak_demand.city_patterns'):
+                city_keys, mean, std = hourly_demand_profile(cities, datetimes)
+                self.city_index = {city: i for i, city in enumerate(city_keys)}
+                self.city_mean, self.city_std = mean, std
             
-            # Calculate city-wise patterns
-            self.city_patterns = {}
-            for city, city_data in ts_data['by_city'].items():
-                if pd.isna(city):
-                    continue
-                city_patterns = (
-                    city_data.groupby(city_data['datetime'].dt.hour)['order_count']
-                    .agg(['mean', 'std'])
-                )
-                self.city_patterns[city] = {
-                    hour: {'mean': round(row['mean']), 'std': row['std']}
-                    for hour, row in city_patterns.iterrows()
-                }
+            # Refits warm start from the previous fit of each series
+            if self.forecaster is not None:
+                self.forecaster.train(self.get_hourly_series(data))
             
             return {"status": "success", "message": "Model trained successfully"}
             
@@ -90,7 +143,7 @@ class PeakDemandModel(BaseModel):
     
     def predict(self, features: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make predictions using the trained model."""
-        if not self.hourly_patterns:
+        if not self.is_trained:
             raise RuntimeError("Model must be trained before making predictions")
             
         # For single prediction, return next hour's prediction
@@ -98,12 +151,7 @@ class PeakDemandModel(BaseModel):
             hour = features['hour']
             city = features.get('city')
             
-            if city and city in self.city_patterns:
-                stats = self.city_patterns[city].get(hour, {'mean': 0, 'std': 0})
-            else:
-                stats = self.hourly_patterns.get(hour, {'mean': 0, 'std': 0})
-                
-            return {'predicted_orders': round(stats['mean'])}
+            return {'predicted_orders': self._hourly_predictions(city)[hour]}
             
         # Otherwise return full day prediction
         prediction = self.predict_next_day()
@@ -114,17 +162,11 @@ class PeakDemandModel(BaseModel):
     
     def predict_next_day(self, city: Optional[str] = None) -> Dict[str, Any]:
         """Predict peak demand for next day, optionally for a specific city."""
-        if not self.hourly_patterns:
+        if not self.is_trained:
             raise RuntimeError("Model must be trained before making predictions")
         
-        # Get patterns based on city
-        patterns = self.city_patterns.get(city, self.hourly_patterns) if city else self.hourly_patterns
-        
         # Get hourly predictions (rounded to integers)
-        predictions = []
-        for hour in range(24):
-            hour_stats = patterns.get(hour, {'mean': 0, 'std': 0})
-            predictions.append(round(hour_stats['mean']))
+        predictions = self._hourly_predictions(city)
         
         # Identify peak hours (hours with demand > mean + std)
         mean_demand = np.mean(predictions)
@@ -147,7 +189,21 @@ class PeakDemandModel(BaseModel):
             # Add city-wise breakdown
             result['city_predictions'] = {
                 city: self.predict_next_day(city)
-                for city in self.city_patterns.keys()
+                for city in self.city_index
             }
         
-        return result
\ No newline at end of file
+        return result
+    
+    def _hourly_predictions(self, city: Optional[str] = None) -> List[int]:
+        """Orders for each hour of day (0-23) of the next day, overall or for a city."""
+        series = city if city in self.city_index else 'overall'
+        if self.forecaster is not None and series in self.forecaster.results:
+            # The forecast starts after the last observed hour; place it by hour of day
+            forecast = self.forecaster.forecast(series, 24)
+            predictions = [0] * 24
+            for timestamp, value in forecast.items():
+                predictions[timestamp.hour] = round(max(float(value), 0.0))
+            return predictions
+        
+        mean = self.city_mean[self.city_index[city]] if series == city else self.hourly_mean
+        return [0 if np.isnan(value) else round(value) for value in mean.tolist()]
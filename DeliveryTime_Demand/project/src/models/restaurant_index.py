@@ -0,0 +1,205 @@
+"""Restaurant clusters built from order history, looked up by coordinates at serving time."""
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional, Tuple
+from ..config.column_mappings import COLUMNS
+from ..config.model_config import RESTAURANT_INDEX_CONFIG
+from ..utils.date_parsers import parse_dates
+from ..utils.instrumentation import stage_timer, record_batch_size
+from ..utils.spatial import INVALID_ZONE, neighbour_zones, zone_ids
+from ..utils.time_parsers import parse_hours, parse_minutes
+
+# Per-restaurant features added to every processed order
+RESTAURANT_FEATURE_COLUMNS = [
+    'restaurant_prep_minutes',  # Median minutes from order to pickup
+    'restaurant_hourly_orders'  # Average orders per day in the order's hour
+]
+
+class RestaurantIndex:
+    """Array-backed restaurant aggregates with a sorted grid index from location to row.
+
+    The dataset has no restaurant id, so restaurant coordinates are cleaned and
+    snapped to grid cells; each occupied cell is a cluster whose id is the cell
+    id, which stays the same across rebuilds. Lookups binary-search the sorted
+    cluster ids for the query's cell and its neighbours and take the nearest
+    centroid, so serving never scans order history.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or RESTAURANT_INDEX_CONFIG
+        self.cluster_ids = np.empty(0, dtype=np.int64)
+        self.centroids = np.empty((0, 2))
+        self.orders = np.empty(0, dtype=np.int64)
+        self.prep_minutes = np.empty(0)
+        self.hourly_orders = np.empty((0, 24))
+        # Used for orders away from every known cluster
+        self.default_prep_minutes = np.nan
+        self.default_hourly_orders = np.zeros(24)
+
+    def __len__(self) -> int:
+        return len(self.cluster_ids)
+
+    def build(self, data: pd.DataFrame) -> int:
+        """Rebuild the clusters and their aggregates from raw orders; returns the number of clusters."""
+        record_batch_size('restaurant_index.build', len(data))
+        with stage_timer('restaurant_index.build'):
+            lat, lng, cells, prep, hours = self._order_columns(data)
+            valid = cells != INVALID_ZONE
+            days = self._days(data)
+
+            cluster_ids, rows = np.unique(cells[valid], return_inverse=True)
+            frame = pd.DataFrame({'row': rows, 'lat': lat[valid], 'lng': lng[valid], 'prep': prep[valid]})
+            groups = frame.groupby('row', sort=True)
+            orders = groups.size().to_numpy()
+            prep_minutes = groups['prep'].median().to_numpy()
+            prep_counts = groups['prep'].count().to_numpy()
+            prep_minutes[prep_counts < self.config['min_orders']] = np.nan
+
+            hourly = np.zeros((len(cluster_ids), 24))
+            known_hour = ~np.isnan(hours[valid])
+            np.add.at(hourly, (rows[known_hour], hours[valid][known_hour].astype(np.int64)), 1)
+
+            # Swap in whole arrays, so readers never see a partial rebuild
+            self.centroids = groups[['lat', 'lng']].mean().to_numpy()
+            self.orders = orders
+            self.prep_minutes = prep_minutes
+            self.hourly_orders = hourly / days
+            self.default_prep_minutes = float(np.nanmedian(prep[valid])) if np.isfinite(prep[valid]).any() else np.nan
+            self.default_hourly_orders = (np.median(self.hourly_orders, axis=0)
+                                          if len(cluster_ids) else np.zeros(24))
+            self.cluster_ids = cluster_ids
+            return len(cluster_ids)
+
+    def leave_one_out_features(self, data: pd.DataFrame, hour: np.ndarray) -> Dict[str, np.ndarray]:
+        """``RESTAURANT_FEATURE_COLUMNS`` for the orders the index was built from, each without itself.
+
+        Training rows must not see their own pickup time or order in their
+        features, which serving orders never can; every row gets the
+        aggregates of the other orders of its nearest cluster.
+
+        Args:
+            data: The raw orders passed to ``build``
+            hour: Hour feature of each order, as used at serving time
+        """
+        with stage_timer('restaurant_index.leave_one_out'):
+            lat, lng, cells, prep, hours = self._order_columns(data)
+            hour = np.asarray(hour, dtype=np.int64) % 24
+            features = self.features(lat, lng, hour)
+            if not len(self.cluster_ids):
+                return features
+
+            # Rows whose nearest cluster is the one they were counted in
+            own = np.full(len(cells), -1, dtype=np.int64)
+            valid = cells != INVALID_ZONE
+            own[valid] = np.searchsorted(self.cluster_ids, cells[valid])
+            counted = (own >= 0) & (self.rows(lat, lng) == own)
+
+            volume = features['restaurant_hourly_orders']
+            counted_hour = counted & (hours == hour)
+            volume[counted_hour] = self.hourly_orders[own[counted_hour], hour[counted_hour]] - 1 / self._days(data)
+
+            timed = np.flatnonzero(counted & ~np.isnan(prep))
+            if len(timed):
+                median, others = _leave_one_out_medians(own[timed], prep[timed])
+                median[others < self.config['min_orders']] = self.default_prep_minutes
+                features['restaurant_prep_minutes'][timed] = median
+            return features
+
+    def rows(self, lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+        """Row of the nearest cluster to every location, -1 where none is within the search cells."""
+        lat = np.atleast_1d(np.asarray(lat, dtype=float))
+        lng = np.atleast_1d(np.asarray(lng, dtype=float))
+        cells = self._cells(lat, lng)
+        if not len(self.cluster_ids):
+            return np.full(len(cells), -1, dtype=np.int64)
+        if self.config['absolute_coordinates']:
+            lat, lng = np.abs(lat), np.abs(lng)
+
+        # One binary search per neighbouring cell of every location
+        candidates = neighbour_zones(cells, self.config['resolution'], self.config['search_cells'])
+        positions = np.minimum(np.searchsorted(self.cluster_ids, candidates), len(self.cluster_ids) - 1)
+        hit = (self.cluster_ids[positions] == candidates) & (candidates != INVALID_ZONE)
+        # Degrees are close enough to rank clusters this near
+        distance = np.where(
+            hit,
+            (self.centroids[positions, 0] - lat[:, None]) ** 2
+            + ((self.centroids[positions, 1] - lng[:, None]) * np.cos(np.radians(lat))[:, None]) ** 2,
+            np.inf
+        )
+        nearest = distance.argmin(axis=1)
+        found = positions[np.arange(len(cells)), nearest]
+        found[~hit.any(axis=1)] = -1
+        return found
+
+    def features(self, lat: np.ndarray, lng: np.ndarray, hour: np.ndarray) -> Dict[str, np.ndarray]:
+        """``RESTAURANT_FEATURE_COLUMNS`` for many orders; defaults away from known clusters."""
+        rows = self.rows(lat, lng)
+        hour = np.atleast_1d(np.asarray(hour, dtype=np.int64)) % 24
+        found = rows >= 0
+        prep = np.full(len(rows), self.default_prep_minutes)
+        volume = self.default_hourly_orders[hour]
+        prep[found] = self.prep_minutes[rows[found]]
+        volume[found] = self.hourly_orders[rows[found], hour[found]]
+        # Sparse clusters have no prep time of their own
+        prep[np.isnan(prep)] = self.default_prep_minutes
+        return {'restaurant_prep_minutes': prep, 'restaurant_hourly_orders': volume}
+
+    def feature_row(self, lat: float, lng: float, hour: int) -> Dict[str, float]:
+        """``RESTAURANT_FEATURE_COLUMNS`` for a single order."""
+        return {column: float(values[0]) for column, values in self.features(lat, lng, hour).items()}
+
+    def cluster_id(self, lat: float, lng: float) -> Optional[int]:
+        """Stable id of the nearest restaurant cluster, or None away from known clusters."""
+        row = int(self.rows(lat, lng)[0])
+        return int(self.cluster_ids[row]) if row >= 0 else None
+
+    def _cells(self, lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+        return zone_ids(lat, lng, self.config['resolution'], self.config['absolute_coordinates'])
+
+    def _order_columns(self, data: pd.DataFrame) -> Tuple[np.ndarray, ...]:
+        """Cleaned restaurant coordinates, grid cells, prep minutes and order hours of raw orders."""
+        lat = pd.to_numeric(data[COLUMNS['RESTAURANT_LAT']], errors='coerce').to_numpy(dtype=float)
+        lng = pd.to_numeric(data[COLUMNS['RESTAURANT_LNG']], errors='coerce').to_numpy(dtype=float)
+        cells = self._cells(lat, lng)
+        if self.config['absolute_coordinates']:
+            lat, lng = np.abs(lat), np.abs(lng)
+
+        prep = np.full(len(data), np.nan)
+        if COLUMNS['PICKUP_TIME'] in data:
+            # Pickups after midnight wrap around to the next day
+            prep = ((parse_minutes(data[COLUMNS['PICKUP_TIME']])
+                     - parse_minutes(data[COLUMNS['ORDER_TIME']])) % 1440).to_numpy()
+            prep[prep > self.config['max_prep_minutes']] = np.nan
+        hours = parse_hours(data[COLUMNS['ORDER_TIME']]).to_numpy()
+        return lat, lng, cells, prep, hours
+
+    @staticmethod
+    def _days(data: pd.DataFrame) -> int:
+        """Distinct order dates in the history, at least 1."""
+        return (parse_dates(data[COLUMNS['ORDER_DATE']]).nunique() if COLUMNS['ORDER_DATE'] in data else 0) or 1
+
+
+def _leave_one_out_medians(groups: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Median of each value's group without that value, and how many values it was taken over."""
+    order = np.lexsort((values, groups))
+    sorted_values, sorted_groups = values[order], groups[order]
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    sizes = np.diff(np.r_[starts, len(order)])
+    group_start = np.repeat(starts, sizes)
+    rank = np.arange(len(order)) - group_start
+    others = np.repeat(sizes, sizes) - 1
+
+    def remaining(k: np.ndarray) -> np.ndarray:
+        # k-th smallest of the group once the value at ``rank`` is removed
+        k = np.maximum(k, 0)
+        return sorted_values[np.minimum(group_start + k + (k >= rank), len(order) - 1)]
+
+    upper = remaining(others // 2)
+    lower = remaining((others - 1) // 2)
+    median = np.where(others % 2 == 1, upper, (lower + upper) / 2)
+    median[others == 0] = np.nan
+
+    result = np.empty(len(order))
+    counts = np.empty(len(order), dtype=np.int64)
+    result[order], counts[order] = median, others
+    return result, counts
@@ -0,0 +1,76 @@
+"""Accuracy and latency of a boosted model against the number of trees used.
+
+Predicting with the first ``num_iteration`` trees of a booster is cheaper in
+proportion. The iteration curve recorded at training time (MAE and
+single-order latency per tree count) is stored with the model, so serving can
+pick the tree count for a latency budget, or the cheapest one within a known
+accuracy loss when under load.
+"""
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+from ..config.model_config import TRUNCATION_CONFIG
+from ..utils.metrics import calculate_regression_metrics
+from ..utils.thread_budget import thread_budget
+
+
+def checkpoint_iterations(n_iterations: int, checkpoints: Optional[int] = None) -> List[int]:
+    """Evenly spaced tree counts from ``n_iterations / checkpoints`` up to ``n_iterations``."""
+    checkpoints = max(int(checkpoints or TRUNCATION_CONFIG['checkpoints']), 1)
+    return sorted({max(int(round(n_iterations * (i + 1) / checkpoints)), 1) for i in range(checkpoints)})
+
+
+def iteration_curve(estimator: Any, X: np.ndarray, y: np.ndarray, n_iterations: int,
+                    checkpoints: Optional[int] = None, latency_rows: Optional[int] = None) -> List[Dict[str, float]]:
+    """MAE, RMSE and single-order latency of ``estimator`` at each checkpoint tree count.
+
+    Args:
+        estimator: Fitted ``lgb.Booster`` or ``LGBMRegressor``; both take ``num_iteration``
+        X: Feature matrix to score
+        y: Delivery times of ``X``
+        n_iterations: Number of trees in the model
+        checkpoints: Number of tree counts to record
+        latency_rows: Rows of ``X`` predicted one at a time to measure latency,
+            under the 'serving' thread budget the curve is used with
+    """
+    X = np.ascontiguousarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    latency_rows = min(latency_rows or TRUNCATION_CONFIG['latency_rows'], len(X))
+    rows = [X[i:i + 1].copy() for i in range(latency_rows)]
+
+    curve = []
+    for num_iteration in checkpoint_iterations(n_iterations, checkpoints):
+        metrics = calculate_regression_metrics(y, estimator.predict(X, num_iteration=num_iteration))
+        with thread_budget('serving') as n_threads:
+            start = time.perf_counter()
+            for row in rows:
+                estimator.predict(row, num_iteration=num_iteration, num_threads=n_threads)
+            latency_us = (time.perf_counter() - start) * 1e6 / max(latency_rows, 1)
+        curve.append({
+            'num_iteration': num_iteration,
+            'mae': metrics['mae'],
+            'rmse': metrics['rmse'],
+            'latency_us': float(latency_us)
+        })
+    return curve
+
+
+def iterations_for_budget(curve: List[Dict[str, float]], budget_us: float) -> Optional[int]:
+    """Largest recorded tree count whose single-order latency fits ``budget_us``.
+
+    Returns the smallest recorded count when none fits, and None (all trees)
+    without a curve.
+    """
+    if not curve:
+        return None
+    fitting = [point['num_iteration'] for point in curve if point['latency_us'] <= budget_us]
+    return max(fitting) if fitting else min(point['num_iteration'] for point in curve)
+
+
+def iterations_for_accuracy(curve: List[Dict[str, float]], max_mae_increase: float) -> Optional[int]:
+    """Smallest recorded tree count whose MAE is within ``max_mae_increase`` of the best."""
+    if not curve:
+        return None
+    best = min(point['mae'] for point in curve)
+    return min(point['num_iteration'] for point in curve
+               if point['mae'] <= best * (1 + max_mae_increase))
@@ -3,6 +3,11 @@ import numpy as np
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error
 from datetime import datetime, timedelta
+from typing import Dict, Optional
+from .utils.date_parsers import parse_dates
+from .utils.time_series import build_lag_matrix
+
+N_LAGS = 24
 
 class PeakDemandPredictor:
     def __init__(self):
@@ -11,81 +16,169 @@ class PeakDemandPredictor:
             max_depth=10,
             random_state=42
         )
-    
-    def create_time_series_features(self, data):
-        """Create time series features including lag features"""
-        # Group orders by hour to get hourly order counts
-        hourly_orders = data.groupby(['Order_Date', 'hour']).size().reset_index(name='order_count')
-        hourly_orders['datetime'] = pd.to_datetime(hourly_orders['Order_Date']) + \
-                                  pd.to_timedelta(hourly_orders['hour'], unit='h')
-        hourly_orders = hourly_orders.set_index('datetime').sort_index()
-        
-        # Create lag features
-        for i in range(1, 25):  # Last 24 hours
-            hourly_orders[f'lag_{i}'] = hourly_orders['order_count'].shift(i)
-        
+        self.feature_cols = ['hour', 'day_of_week', 'is_weekend'] + \
+                            [f'lag_{i}' for i in range(1, N_LAGS + 1)]
+        # Last N_LAGS hourly counts per series seen in training, oldest first
+        self.history: Dict[str, np.ndarray] = {}
+        self.history_end: Optional[pd.Timestamp] = None
+
+    def hourly_counts(self, data, group_col=None):
+        """Gap-free hourly order counts, one column per series ('overall' if ungrouped)"""
+        datetimes = parse_dates(data['Order_Date']) + pd.to_timedelta(data['hour'], unit='h')
+        groups = data[group_col] if group_col else pd.Series('overall', index=data.index)
+        counts = (
+            pd.DataFrame({'datetime': datetimes, 'series': groups})
+            .dropna()
+            .groupby(['datetime', 'series'])
+            .size()
+            .unstack('series', fill_value=0)
+        )
+        full_index = pd.date_range(counts.index.min(), counts.index.max(), freq='H')
+        return counts.reindex(full_index, fill_value=0)
+
+    def create_time_series_features(self, counts):
+        """Create time series features including lag features from ``hourly_counts`` output"""
+
+        # Lags of every series as a read-only view over the (n_series, hours) counts
+        lags, targets, _ = build_lag_matrix(counts.to_numpy(dtype=float).T, N_LAGS)
+        n_series, n_samples = lags.shape[:2]
+        timestamps = counts.index[N_LAGS:N_LAGS + n_samples]
+
+        # One copy into the design matrix
+        hourly_orders = pd.DataFrame(
+            lags.reshape(-1, N_LAGS),
+            index=pd.DatetimeIndex(np.tile(timestamps, n_series)),
+            columns=[f'lag_{i}' for i in range(1, N_LAGS + 1)]
+        )
+        hourly_orders.insert(0, 'order_count', targets.reshape(-1))
+
         # Create time-based features
         hourly_orders['hour'] = hourly_orders.index.hour
         hourly_orders['day_of_week'] = hourly_orders.index.dayofweek
         hourly_orders['is_weekend'] = hourly_orders['day_of_week'].isin([5, 6]).astype(int)
-        
-        # Drop rows with NaN values (due to lag features)
-        hourly_orders = hourly_orders.dropna()
-        
-        return hourly_orders
-    
-    def train(self, data):
-        """Train the peak demand prediction model"""
+        hourly_orders['series'] = np.repeat(counts.columns.to_numpy(), n_samples)
+
+        return hourly_orders.sort_index(kind='stable')
+
+    def train(self, data, group_col=None):
+        """Train the peak demand prediction model, pooled across series when grouped"""
+        counts = self.hourly_counts(data, group_col)
+
         # Prepare time series data
-        ts_data = self.create_time_series_features(data)
-        
-        # Prepare features and target
-        feature_cols = ['hour', 'day_of_week', 'is_weekend'] + \
-                      [f'lag_{i}' for i in range(1, 25)]
-        
-        X = ts_data[feature_cols]
-        y = ts_data['order_count']
-        
+        ts_data = self.create_time_series_features(counts)
+
+        X = ts_data[self.feature_cols].to_numpy(dtype=float)
+        y = ts_data['order_count'].to_numpy(dtype=float)
+
         # Split data into train and test
         train_size = int(len(ts_data) * 0.8)
         X_train, X_test = X[:train_size], X[train_size:]
         y_train, y_test = y[:train_size], y[train_size:]
-        
+
         # Train model
         self.model.fit(X_train, y_train)
-        
+
         # Evaluate model
         y_pred = self.model.predict(X_test)
         mae = mean_absolute_error(y_test, y_pred)
         print(f"Peak Demand Model MAE: {mae:.2f} orders")
-    
-    def predict_next_day(self, current_data=None):
-        """Predict order demand for the next 24 hours"""
+
+        # Keep the real most recent history to seed forecasts
+        self.history = {
+            series: counts[series].to_numpy(dtype=float)[-N_LAGS:]
+            for series in counts.columns
+        }
+        self.history_end = counts.index[-1]
+
+    def forecast(self, history: np.ndarray, start: pd.Timestamp, horizon: int = 24) -> np.ndarray:
+        """Recursively forecast many series together, one batched predict per step.
+
+        Args:
+            history: Array of shape (n_series, >= 24) with the most recent hourly
+                counts of each series, oldest first
+            start: Timestamp of the first hour to forecast
+            horizon: Number of hours to forecast
+
+        Returns:
+            Array of shape (n_series, horizon)
+        """
+        history = np.atleast_2d(np.asarray(history, dtype=float))
+        if history.shape[1] < N_LAGS:
+            raise ValueError(f"Need at least {N_LAGS} hours of history, got {history.shape[1]}")
+        n_series = history.shape[0]
+
+        # Ring buffer of lag values; slot `pos` is the next hour to be written
+        ring = history[:, -N_LAGS:].copy()
+        pos = 0
+        lag_offsets = np.arange(1, N_LAGS + 1)
+
+        X = np.empty((n_series, len(self.feature_cols)))
+        predictions = np.empty((n_series, horizon))
+        for step in range(horizon):
+            timestamp = start + pd.Timedelta(hours=step)
+            X[:, 0] = timestamp.hour
+            X[:, 1] = timestamp.dayofweek
+            X[:, 2] = int(timestamp.dayofweek in (5, 6))
+            # lag_k is the value k hours before this step
+            X[:, 3:] = ring[:, (pos - lag_offsets) % N_LAGS]
+
+            step_predictions = self.model.predict(X)
+            predictions[:, step] = step_predictions
+
+            # Feed predictions back in as the newest lag
+            ring[:, pos] = step_predictions
+            pos = (pos + 1) % N_LAGS
+
+        return predictions
+
+    def predict_next_day(self, current_data: Optional[np.ndarray] = None,
+                         start: Optional[pd.Timestamp] = None):
+        """Predict order demand for the next 24 hours
+
+        ``current_data`` holds recent hourly counts; it defaults to the real
+        history seen in training, which must then be a single series.
+        """
         if current_data is None:
-            # Use dummy data for demonstration
-            current_data = np.random.randint(10, 50, size=24)
-        
-        predictions = []
-        next_day_hours = range(24)
-        
-        for hour in next_day_hours:
-            features = np.array([[
-                hour,  # hour
-                0,     # day_of_week (dummy)
-                0,     # is_weekend (dummy)
-                *current_data[-24:]  # last 24 hours of data
-            ]])
-            
-            pred = self.model.predict(features)[0]
-            predictions.append(pred)
-        
-        # Find peak hours (hours with demand > mean + std)
-        mean_demand = np.mean(predictions)
-        std_demand = np.std(predictions)
-        peak_hours = [h for h in next_day_hours if predictions[h] > mean_demand + std_demand]
-        
-        return {
-            'hourly_predictions': predictions,
-            'peak_hours': peak_hours,
-            'total_orders': sum(predictions)
-        }
\ No newline at end of file
+            if len(self.history) > 1:
+                raise ValueError(
+                    "Model was trained per series; use predict_next_day_by_series"
+                )
+            current_data = next(iter(self.history.values()), None)
+        if current_data is None:
+            raise RuntimeError("Model must be trained before making predictions")
+        return self.predict_next_day_by_series({'overall': current_data}, start)['overall']
+
+    def predict_next_day_by_series(self, current_data: Optional[Dict[str, np.ndarray]] = None,
+                                   start: Optional[pd.Timestamp] = None):
+        """Predict the next 24 hours of several series with one batched forecast
+
+        ``current_data`` maps series names to recent hourly counts and defaults
+        to the real history of every series seen in training.
+        """
+        if current_data is None:
+            if not self.history:
+                raise RuntimeError("Model must be trained before making predictions")
+            current_data = self.history
+
+        if start is None:
+            if self.history_end is not None:
+                start = self.history_end + pd.Timedelta(hours=1)
+            else:
+                start = pd.Timestamp(datetime.now().date() + timedelta(days=1))
+
+        names = list(current_data)
+        history = np.vstack([np.asarray(current_data[name], dtype=float)[-N_LAGS:] for name in names])
+        forecasts = self.forecast(history, start, horizon=24)
+
+        results = {}
+        for name, predictions in zip(names, forecasts):
+            # Find peak hours (hours with demand > mean + std)
+            mean_demand = np.mean(predictions)
+            std_demand = np.std(predictions)
+            results[name] = {
+                'hourly_predictions': predictions.tolist(),
+                'peak_hours': [h for h in range(24) if predictions[h] > mean_demand + std_demand],
+                'total_orders': float(predictions.sum())
+            }
+
+        return results
@@ -0,0 +1,216 @@
+"""Chunked scoring of large CSV/NDJSON order files with streamed NDJSON output.
+
+Usage:
+    python -m src.prediction.batch_scoring orders.csv --output scores.ndjson
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from .delivery_pipeline import DeliveryPipeline
+from ..data_processor import DRIVER_ID_FIELD
+from ..config.serving_config import SERVING_CONFIG
+from ..utils.instrumentation import stage_timer, record_batch_size
+from ..utils.validation import ORDER_FIELDS, validate_order_batch
+
+FORMATS = ('csv', 'ndjson')
+READ_BLOCK_BYTES = 1 << 16
+# Error reported for a line that is not a well-formed CSV row or JSON object
+UNPARSEABLE_ROW = 'unparseable_row'
+
+
+def _chunk_sizes() -> Iterator[int]:
+    yield SERVING_CONFIG['scoring_first_chunk_rows']
+    while True:
+        yield SERVING_CONFIG['scoring_chunk_rows']
+
+
+def _csv_fields(line: bytes) -> Optional[int]:
+    """Number of fields of one CSV line, or None if it cannot be read."""
+    try:
+        return len(next(csv.reader([line.decode()])))
+    except (UnicodeDecodeError, csv.Error, StopIteration):
+        return None
+
+
+def _json_record(line: bytes) -> Optional[dict]:
+    """One NDJSON line as a dict, or None if it is not a JSON object."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def parse_chunk(lines: List[bytes], fmt: str,
+                header: Optional[bytes] = None) -> Tuple[pd.DataFrame, List[int]]:
+    """Parse raw lines of one chunk; CSV chunks need the file's header line.
+
+    Returns:
+        The parsed orders in line order, and the positions in ``lines`` of the
+        lines that could not be parsed (malformed JSON, ragged CSV rows)
+    """
+    if fmt == 'csv':
+        width = _csv_fields(header)
+        widths = [_csv_fields(line) for line in lines]
+        unparseable = [i for i, fields in enumerate(widths) if fields != width]
+        good = [line for line, fields in zip(lines, widths) if fields == width]
+        # Keep every field as text; validation does the type checks
+        orders = pd.read_csv(io.BytesIO(header + b''.join(good)), dtype=str, keep_default_na=True)
+        return orders, unparseable
+    records = [_json_record(line) for line in lines]
+    unparseable = [i for i, record in enumerate(records) if record is None]
+    orders = pd.DataFrame.from_records([r for r in records if r is not None],
+                                       columns=list(ORDER_FIELDS) + [DRIVER_ID_FIELD])
+    return orders, unparseable
+
+
+def score_chunk(pipeline: DeliveryPipeline, orders: pd.DataFrame, first_row: int = 0,
+                unparseable: Sequence[int] = ()) -> bytes:
+    """Validate, featurize and predict one chunk; returns NDJSON, one line per input row.
+
+    Args:
+        pipeline: Delivery pipeline to score with
+        orders: Parsed orders of the chunk, in input order
+        first_row: Row number of the chunk's first input row
+        unparseable: Positions in the chunk of input rows that could not be
+            parsed; they get an ``unparseable_row`` error and ``orders`` fill
+            the other positions
+    """
+    record_batch_size('score_chunk', len(orders))
+    with stage_timer('score_chunk'):
+        orders = orders.reset_index(drop=True)
+        # Chunk position of every parsed order
+        parsed = np.ones(len(orders) + len(unparseable), dtype=bool)
+        parsed[list(unparseable)] = False
+        positions = np.flatnonzero(parsed)
+        valid, errors = validate_order_batch(orders, pipeline.processor.known_categories())
+        # CSV fields arrive as text; validation has checked they parse
+        valid = valid.astype({field: float for field, field_type in ORDER_FIELDS.items() if field_type is float})
+
+        estimates = np.empty(0)
+        if len(valid):
+            processed = pipeline.processor.process_orders(valid)
+            estimates = pipeline.model.predict_batch(pipeline.model._prepare_features(processed))
+
+        # Assemble output rows in input order
+        lines = [None] * len(parsed)
+        for row, estimate in zip(positions[valid.index], estimates):
+            lines[row] = f'{{"row": {first_row + row}, "estimated_time": {float(estimate)!r}}}'
+        rows, starts = np.unique(errors['row'], return_index=True)
+        for row, start, end in zip(positions[rows.astype(np.int64)], starts, list(starts[1:]) + [len(errors)]):
+            row_errors = [{'field': e['field'], 'error': e['error']} for e in errors[start:end]]
+            lines[row] = json.dumps({'row': first_row + int(row), 'errors': row_errors})
+        for row in unparseable:
+            lines[row] = json.dumps({'row': first_row + int(row), 'errors': [{'field': None, 'error': UNPARSEABLE_ROW}]})
+        return ('\n'.join(lines) + '\n').encode() if lines else b''
+
+
+class OrderChunker:
+    """Splits a byte stream of orders into bounded chunks of whole lines.
+
+    Lines may span the byte blocks fed in. The first chunk is small so the
+    first results go out quickly; later chunks use ``scoring_chunk_rows``.
+    """
+
+    def __init__(self, fmt: str = 'csv'):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format {fmt}. Available formats: {list(FORMATS)}")
+        self.fmt = fmt
+        self.header: Optional[bytes] = None
+        self.first_row = 0
+        self._pending = b''
+        self._lines: List[bytes] = []
+        self._sizes = _chunk_sizes()
+        self._target = next(self._sizes)
+
+    def feed(self, data: bytes) -> List[Tuple[List[bytes], int]]:
+        """Add a block of bytes; returns the (lines, first_row) chunks completed by it."""
+        self._pending += data
+        *lines, self._pending = self._pending.split(b'\n')
+        return self._add(lines)
+
+    def close(self) -> List[Tuple[List[bytes], int]]:
+        """Flush the trailing line and the last partial chunk."""
+        chunks = self._add([self._pending])
+        self._pending = b''
+        if self._lines:
+            chunks.append(self._take())
+        return chunks
+
+    def _add(self, lines: List[bytes]) -> List[Tuple[List[bytes], int]]:
+        chunks = []
+        for line in lines:
+            if not line.strip():
+                continue
+            if self.fmt == 'csv' and self.header is None:
+                self.header = line + b'\n'
+                continue
+            self._lines.append(line + b'\n')
+            if len(self._lines) >= self._target:
+                chunks.append(self._take())
+                self._target = next(self._sizes)
+        return chunks
+
+    def _take(self) -> Tuple[List[bytes], int]:
+        chunk = (self._lines, self.first_row)
+        self.first_row += len(self._lines)
+        self._lines = []
+        return chunk
+
+
+def score_raw_chunk(pipeline: DeliveryPipeline, lines: List[bytes], first_row: int,
+                    fmt: str, header: Optional[bytes] = None) -> bytes:
+    """Parse and score one chunk from ``OrderChunker``; malformed lines are reported per row."""
+    try:
+        orders, unparseable = parse_chunk(lines, fmt, header)
+    except Exception as e:
+        raise ValueError(f"Rows {first_row}-{first_row + len(lines) - 1} could not be parsed: {str(e)}")
+    return score_chunk(pipeline, orders, first_row, unparseable)
+
+
+def score_stream(pipeline: DeliveryPipeline, blocks: Iterable[bytes], fmt: str = 'csv') -> Iterator[bytes]:
+    """Score a byte stream of orders chunk by chunk, yielding NDJSON per chunk."""
+    chunker = OrderChunker(fmt)
+    for block in blocks:
+        for lines, first_row in chunker.feed(block):
+            yield score_raw_chunk(pipeline, lines, first_row, fmt, chunker.header)
+    for lines, first_row in chunker.close():
+        yield score_raw_chunk(pipeline, lines, first_row, fmt, chunker.header)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from ..models.model_registry import ModelRegistry
+
+    parser = argparse.ArgumentParser(description="Score an order file with the delivery time model.")
+    parser.add_argument('input', help="CSV or NDJSON file of API orders, '-' for stdin")
+    parser.add_argument('--format', choices=FORMATS, help="Defaults to the input file extension")
+    parser.add_argument('--output', help="NDJSON output file; defaults to stdout")
+    parser.add_argument('--artifact', default=SERVING_CONFIG['artifacts']['delivery'])
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ('ndjson' if args.input.endswith(('.ndjson', '.jsonl')) else 'csv')
+    pipeline = ModelRegistry.load_model(args.artifact)
+    if pipeline is None:
+        parser.error(f"No trained artifact named {args.artifact}")
+
+    source = sys.stdin.buffer if args.input == '-' else open(args.input, 'rb')
+    target = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        blocks = iter(lambda: source.read(READ_BLOCK_BYTES), b'')
+        for output in score_stream(pipeline, blocks, fmt):
+            target.write(output)
+            target.flush()
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if target is not sys.stdout.buffer:
+            target.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Delivery time pipeline deployed as a single artifact.
+
+Usage:
+    python -m src.prediction.delivery_pipeline data/delivery_data.csv
+"""
+import argparse
+import pandas as pd
+from typing import Dict, Any, Optional, Union
+from ..config.model_config import CASCADE_CONFIG
+from ..config.serving_config import SERVING_CONFIG
+from ..data_processor import DataProcessor
+from ..models.base_model import BaseModel
+from ..models.cascade_model import CascadeModel
+from ..models.delivery_time_model import DeliveryTimeModel
+from ..utils.thread_budget import set_thread_context
+
+class DeliveryPipeline:
+    """Fitted feature processor and delivery time model, versioned and swapped together.
+
+    The model defaults to a ``CascadeModel`` when ``CASCADE_CONFIG['enabled']``
+    is set and to ``DeliveryTimeModel`` otherwise.
+    """
+    
+    def __init__(self, processor: Optional[DataProcessor] = None,
+                 model: Optional[Union[DeliveryTimeModel, CascadeModel]] = None):
+        self.processor = processor or DataProcessor()
+        self.model: BaseModel = model or (CascadeModel() if CASCADE_CONFIG['enabled'] else DeliveryTimeModel())
+    
+    @property
+    def is_trained(self) -> bool:
+        return self.model.is_trained
+    
+    def train(self, data: pd.DataFrame) -> Dict[str, float]:
+        """Fit the feature processor and the model on raw orders."""
+        return self.model.train(self.processor.preprocess(data))
+    
+    def predict(self, order_data: Dict[str, Any]) -> float:
+        """Predict delivery time for one API order."""
+        return self.model.predict(self.processor.process_single_order(order_data))
+
+
+def main() -> None:
+    from ..models.model_registry import ModelRegistry
+
+    parser = argparse.ArgumentParser(description="Train the delivery pipeline and publish it for the API.")
+    parser.add_argument('data', help="CSV of raw orders")
+    parser.add_argument('--model-dir', help="Artifact directory (default: MODEL_DIR)")
+    parser.add_argument('--artifact', default=SERVING_CONFIG['artifacts']['delivery'])
+    args = parser.parse_args()
+
+    set_thread_context('training')
+    pipeline = DeliveryPipeline()
+    metrics = pipeline.train(pd.read_csv(args.data))
+    # Running API servers swap the new artifact in through their ModelReloader
+    ModelRegistry.save_model(pipeline, args.artifact, args.model_dir)
+    print(f"Trained {type(pipeline.model).__name__}: {metrics}")
+
+
+if __name__ == '__main__':
+    main()
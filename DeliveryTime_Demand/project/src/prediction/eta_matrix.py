@@ -0,0 +1,74 @@
+"""Many-to-many delivery time estimates for dispatch."""
+from typing import Dict, Any, Optional
+import numpy as np
+from ..config.model_config import ETA_MATRIX_CONFIG
+from ..models.delivery_time_model import DeliveryTimeModel
+from ..utils.distance import haversine_matrix
+from ..utils.instrumentation import stage_timer, record_batch_size
+
+
+def eta_matrix(model: DeliveryTimeModel, context: Dict[str, Any],
+               origins: np.ndarray, destinations: np.ndarray,
+               tile_rows: Optional[int] = None, tile_cols: Optional[int] = None,
+               origin_features: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+    """Estimate delivery time for every origin/destination pair.
+
+    Args:
+        model: Trained delivery time model
+        context: Processed features of one order carrying the shared context
+            (weather, traffic, vehicle, time), e.g. from ``process_single_order``
+        origins: Array of shape (n, 2) with latitude, longitude
+        destinations: Array of shape (m, 2) with latitude, longitude
+        tile_rows: Origins per tile; defaults to ``ETA_MATRIX_CONFIG``
+        tile_cols: Destinations per tile; defaults to ``ETA_MATRIX_CONFIG``
+        origin_features: Optional per-origin values, shape (n,), of feature
+            columns that depend on the origin (e.g. restaurant features);
+            other columns come from ``context``
+
+    Returns:
+        Array of shape (n, m) with estimated minutes
+    """
+    origins = np.asarray(origins, dtype=float).reshape(-1, 2)
+    destinations = np.asarray(destinations, dtype=float).reshape(-1, 2)
+    n, m = len(origins), len(destinations)
+    if n * m > ETA_MATRIX_CONFIG['max_pairs']:
+        raise ValueError(f"{n} x {m} pairs exceeds the limit of {ETA_MATRIX_CONFIG['max_pairs']}")
+
+    tile_rows = min(tile_rows or ETA_MATRIX_CONFIG['tile_rows'], n) or 1
+    tile_cols = min(tile_cols or ETA_MATRIX_CONFIG['tile_cols'], m) or 1
+    record_batch_size('eta_matrix', n * m)
+
+    feature_columns = model._get_feature_columns()
+    base = model._prepare_features_row(context)
+    distance_index = feature_columns.index('distance')
+    origin_columns = {
+        feature_columns.index(column): np.asarray(values, dtype=float)
+        for column, values in (origin_features or {}).items() if column in feature_columns
+    }
+
+    # One reusable feature buffer per tile keeps memory flat for large n x m;
+    # context columns are written once and only the distance column changes
+    buffer = np.empty((tile_rows, tile_cols, len(feature_columns)))
+    buffer[:] = base
+    result = np.empty((n, m))
+
+    with stage_timer('eta_matrix.total'):
+        for row_start in range(0, n, tile_rows):
+            tile_origins = origins[row_start:row_start + tile_rows]
+            rows = len(tile_origins)
+            for col_start in range(0, m, tile_cols):
+                tile_destinations = destinations[col_start:col_start + tile_cols]
+                cols = len(tile_destinations)
+                tile = buffer[:rows, :cols]
+                for index, values in origin_columns.items():
+                    tile[..., index] = values[row_start:row_start + rows, None]
+
+                tile[..., distance_index] = haversine_matrix(
+                    tile_origins[:, 0], tile_origins[:, 1],
+                    tile_destinations[:, 0], tile_destinations[:, 1]
+                )
+
+                predictions = model.predict_batch(tile.reshape(rows * cols, -1))
+                result[row_start:row_start + rows, col_start:col_start + cols] = predictions.reshape(rows, cols)
+
+    return result
@@ -31,10 +31,10 @@ def print_delivery_prediction(estimated_time: float, features: Dict[str, Any]):
     
     print(f"Estimated delivery time: {estimated_time:.1f} minutes")
     print("\nOrder details:")
-    print(f"  Weather: {features['weather']}")
-    print(f"  Traffic: {features['traffic']}")
-    print(f"  Vehicle: {features['vehicle_type']}")
-    print(f"  Order time: {features['order_time']}")
+    print(f"  Weather: {features.get('weather', features.get('Weatherconditions'))}")
+    print(f"  Traffic: {features.get('traffic', features.get('Road_traffic_density'))}")
+    print(f"  Vehicle: {features.get('vehicle_type', features.get('Type_of_vehicle'))}")
+    print(f"  Order time: {features.get('order_time', features.get('Time_Orderd'))}")
 
 def print_peak_demand_forecast(prediction: Dict[str, Any]):
     """Print peak demand predictions to console."""
@@ -1,10 +1,37 @@
 """Date parsing utilities with support for multiple formats."""
+from datetime import datetime
 import pandas as pd
 from typing import Optional
 
+# Tried in order; the dataset uses DD-MM-YYYY, ISO dates show up in API payloads
+DATE_FORMATS = ['%d-%m-%Y', '%Y-%m-%d']
+
 def parse_date(date_str: str) -> Optional[pd.Timestamp]:
     """Parse date string with DD-MM-YYYY format."""
     try:
         return pd.to_datetime(date_str, format='%d-%m-%Y')
     except ValueError as e:
-        raise ValueError(f"Error parsing date {date_str}: {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Error parsing date {date_str}: {str(e)}")
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """Parse a column of dates, trying each supported format; unparseable values become NaT."""
+    parsed = pd.to_datetime(values, format=DATE_FORMATS[0], errors='coerce')
+    for date_format in DATE_FORMATS[1:]:
+        missing = parsed.isna() & values.notna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(values[missing], format=date_format, errors='coerce')
+    return parsed
+
+def parse_date_or_none(value) -> Optional[datetime]:
+    """Parse a single date in any supported format, returning None on failure."""
+    if isinstance(value, datetime):
+        return value
+    if value is None or pd.isna(value):
+        return None
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), date_format)
+        except ValueError:
+            continue
+    return None
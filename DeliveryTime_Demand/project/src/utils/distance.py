@@ -12,4 +12,15 @@ def calculate_haversine_distance(lat1: float, lon1: float, lat2: float, lon2: fl
     a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
     c = 2 * np.arcsin(np.sqrt(a))
     
-    return R * c
\ No newline at end of file
+    return R * c
+
+def haversine_matrix(lat1: np.ndarray, lon1: np.ndarray,
+                     lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Great circle distances in km between every origin (rows) and destination (columns)."""
+    R = 6371  # Earth's radius in kilometers
+    
+    lat1, lon1 = np.radians(lat1)[:, None], np.radians(lon1)[:, None]
+    lat2, lon2 = np.radians(lat2)[None, :], np.radians(lon2)[None, :]
+    
+    a = np.sin((lat2 - lat1)/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1)/2)**2
+    return 2 * R * np.arcsin(np.sqrt(a))
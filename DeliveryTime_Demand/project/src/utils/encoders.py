@@ -1,19 +1,19 @@
 from typing import Dict, List
-from sklearn.preprocessing import LabelEncoder
 import pandas as pd
+from ..models.features.delivery_features import categorical_feature, encode_label
+from ..models.features.feature_graph import FeatureGraph
 
 class FeatureEncoder:
     def __init__(self):
-        self.encoders: Dict[str, LabelEncoder] = {}
+        self.encoders: Dict[str, Dict[str, int]] = {}
         
     def fit_transform(self, df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
         """Fit and transform categorical columns using label encoding."""
-        df = df.copy()
+        graph = FeatureGraph(categorical_feature(col, optional=False) for col in columns)
+        df = graph.fit_transform(df)
         
         for col in columns:
-            if col not in self.encoders:
-                self.encoders[col] = LabelEncoder()
-            df[f'{col}_encoded'] = self.encoders[col].fit_transform(df[col])
+            self.encoders[col] = graph.state[f'encode_{col}']
         
         return df
     
@@ -23,6 +23,6 @@ class FeatureEncoder:
         
         for feature_name, value in feature_dict.items():
             if feature_name in self.encoders:
-                encoded[f'{feature_name}_encoded'] = self.encoders[feature_name].transform([value])[0]
+                encoded[f'{feature_name}_encoded'] = encode_label(value, self.encoders[feature_name])
                 
-        return encoded
\ No newline at end of file
+        return encoded
@@ -1,29 +1,28 @@
 """Utility functions for encoding categorical features."""
 from typing import Dict
 import pandas as pd
-from sklearn.preprocessing import LabelEncoder
 from ..config.column_mappings import ENCODED_COLUMNS
+from ..models.features.delivery_features import categorical_feature, numeric_feature
+from ..models.features.feature_graph import FeatureGraph
 
 class CategoryEncoder:
     def __init__(self):
-        self.encoders: Dict[str, LabelEncoder] = {}
         self.feature_mappings = ENCODED_COLUMNS
+        numeric_columns = ['Delivery_person_Age', 'Vehicle_condition', 'multiple_deliveries']
+        self.feature_graph = FeatureGraph(
+            [numeric_feature(col) for col in numeric_columns] +
+            [categorical_feature(original, encoded) for original, encoded in self.feature_mappings.items()]
+        )
+    
+    @property
+    def encoders(self) -> Dict[str, Dict[str, int]]:
+        """Fitted label mappings keyed by original column."""
+        return {
+            original: self.feature_graph.state[f'encode_{original}']
+            for original in self.feature_mappings
+            if f'encode_{original}' in self.feature_graph.state
+        }
     
     def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """Fit and transform categorical columns."""
-        df = df.copy()
-        
-        # Convert numeric columns to appropriate types
-        numeric_columns = ['Delivery_person_Age', 'Vehicle_condition', 'multiple_deliveries']
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Encode categorical columns
-        for original, encoded in self.feature_mappings.items():
-            if original in df.columns:
-                if original not in self.encoders:
-                    self.encoders[original] = LabelEncoder()
-                df[encoded] = self.encoders[original].fit_transform(df[original].fillna('Unknown'))
-        
-        return df
\ No newline at end of file
+        return self.feature_graph.fit_transform(df)
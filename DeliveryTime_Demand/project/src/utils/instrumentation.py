@@ -0,0 +1,270 @@
+"""Stage timing, histograms and Prometheus text export."""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config.metrics_config import METRICS_CONFIG
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    def __init__(self, buckets: List[float]):
+        self.buckets = tuple(sorted(buckets))
+        # One slot per bucket plus the +Inf overflow slot
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> List[int]:
+        """Get cumulative bucket counts, ending with the +Inf bucket."""
+        total = 0
+        cumulative = []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = True, namespace: str = ''):
+        self.enabled = enabled
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._help: Dict[str, str] = {}
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None,
+                buckets: Optional[List[float]] = None, help_text: str = '') -> None:
+        """Add an observation to a labelled histogram."""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(buckets or METRICS_CONFIG['latency_buckets'])
+                self._help.setdefault(name, help_text)
+            series[key].observe(value)
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None,
+            amount: float = 1.0, help_text: str = '') -> None:
+        """Increment a labelled counter."""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+            self._help.setdefault(name, help_text)
+
+    def get_histogram(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[Histogram]:
+        """Get a histogram by name and labels, if it has been observed."""
+        return self._histograms.get(name, {}).get(_label_key(labels))
+
+    def get_counter(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
+        """Get the current value of a counter."""
+        return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    def reset(self) -> None:
+        """Drop all recorded metrics."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._help.clear()
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full_name = self._full_name(name)
+                if self._help.get(name):
+                    lines.append(f"# HELP {full_name} {self._help[name]}")
+                lines.append(f"# TYPE {full_name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{full_name}{_format_labels(key)} {_format_value(value)}")
+
+            for name, series in sorted(self._histograms.items()):
+                full_name = self._full_name(name)
+                if self._help.get(name):
+                    lines.append(f"# HELP {full_name} {self._help[name]}")
+                lines.append(f"# TYPE {full_name} histogram")
+                for key, hist in sorted(series.items()):
+                    cumulative = hist.cumulative_counts()
+                    for bound, count in zip(hist.buckets, cumulative):
+                        le_key = key + (('le', _format_value(bound)),)
+                        lines.append(f"{full_name}_bucket{_format_labels(le_key)} {count}")
+                    inf_key = key + (('le', '+Inf'),)
+                    lines.append(f"{full_name}_bucket{_format_labels(inf_key)} {cumulative[-1]}")
+                    lines.append(f"{full_name}_sum{_format_labels(key)} {_format_value(hist.sum)}")
+                    lines.append(f"{full_name}_count{_format_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def _full_name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ''
+    pairs = []
+    for name, value in key:
+        escaped = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+# Process-wide registry used by every instrumented stage
+registry = MetricsRegistry(
+    enabled=METRICS_CONFIG['enabled'],
+    namespace=METRICS_CONFIG['namespace']
+)
+
+# Notified when every stage starts and ends, e.g. a memory profiler; None when unused
+_stage_listener: Optional[Any] = None
+
+
+def set_stage_listener(listener: Optional[Any]) -> None:
+    """Install an object whose ``enter(stage)`` and ``exit(stage)`` wrap every stage."""
+    global _stage_listener
+    _stage_listener = listener
+
+
+class _StageTimer:
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self) -> '_StageTimer':
+        if _stage_listener is not None:
+            _stage_listener.enter(self.stage)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        registry.observe(
+            'stage_duration_seconds',
+            time.perf_counter() - self.start,
+            {'stage': self.stage},
+            help_text='Time spent in each pipeline stage.'
+        )
+        if _stage_listener is not None:
+            _stage_listener.exit(self.stage)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def stage_timer(stage: str):
+    """Context manager timing a named stage; a shared no-op when metrics are disabled."""
+    if not registry.enabled and _stage_listener is None:
+        return _NULL_TIMER
+    return _StageTimer(stage)
+
+
+def timed(stage: str) -> Callable:
+    """Decorator timing every call of the wrapped function as a named stage."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not registry.enabled and _stage_listener is None:
+                return func(*args, **kwargs)
+            with _StageTimer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_batch_size(stage: str, size: int) -> None:
+    """Record the number of rows processed by a stage."""
+    registry.observe(
+        'batch_size_rows',
+        size,
+        {'stage': stage},
+        buckets=METRICS_CONFIG['batch_size_buckets'],
+        help_text='Rows processed per call of each stage.'
+    )
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Record a cache lookup as a hit or a miss."""
+    registry.inc(
+        'cache_requests_total',
+        {'cache': cache, 'result': 'hit' if hit else 'miss'},
+        help_text='Cache lookups by cache name and result.'
+    )
+
+
+def record_request(method: str, path: str, status: int, duration: float) -> None:
+    """Record an HTTP request's status and latency."""
+    registry.inc(
+        'http_requests_total',
+        {'method': method, 'path': path, 'status': str(status)},
+        help_text='HTTP requests by method, path and status code.'
+    )
+    registry.observe(
+        'http_request_duration_seconds',
+        duration,
+        {'method': method, 'path': path},
+        help_text='HTTP request latency.'
+    )
+
+
+def record_model_reload(artifact: str, result: str) -> None:
+    """Record a model artifact reload attempt and its outcome."""
+    registry.inc(
+        'model_reloads_total',
+        {'artifact': artifact, 'result': result},
+        help_text='Model artifact reloads by artifact and result.'
+    )
+
+
+def record_cascade(stage: str, rows: int) -> None:
+    """Record orders answered by a stage of the model cascade."""
+    registry.inc(
+        'cascade_predictions_total',
+        {'stage': stage},
+        amount=rows,
+        help_text='Orders answered by each model cascade stage (cheap or full).'
+    )
+
+
+def record_truncation(reason: str) -> None:
+    """Record a prediction made with fewer trees and why (budget or load)."""
+    registry.inc(
+        'truncated_predictions_total',
+        {'reason': reason},
+        help_text='Predictions made with a truncated booster by reason.'
+    )
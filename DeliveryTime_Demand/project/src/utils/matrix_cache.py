@@ -0,0 +1,140 @@
+"""Memory-mapped cache of model-ready training matrices.
+
+The float32 feature matrix, target and train/test split of a processed frame
+are written once as ``.npy`` files under a directory named by the data
+fingerprint, then memory-mapped by every later run. Rows are stored in split
+order (training rows first), so the train and test sets are slices of the
+mapped arrays rather than copies.
+"""
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from ..config.data_config import TRAINING_CACHE_DIR
+from .instrumentation import stage_timer, record_cache
+
+TARGET_COLUMN = 'time_taken(min)'
+# Numeric-looking columns that are not model inputs
+EXCLUDED_COLUMNS = [TARGET_COLUMN, 'Order_Date', 'Time_Orderd']
+# Bump when the on-disk layout changes
+CACHE_VERSION = 1
+
+
+def select_feature_columns(data: pd.DataFrame) -> List[str]:
+    """Encoded categorical and numeric columns of a processed frame."""
+    return [col for col in data.columns
+            if (col.endswith('_encoded') or pd.api.types.is_numeric_dtype(data[col]))
+            and col not in EXCLUDED_COLUMNS]
+
+
+def data_fingerprint(data: pd.DataFrame, *params) -> str:
+    """Content hash of a frame's columns, dtypes and values, plus any extra parameters."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([CACHE_VERSION, list(map(str, data.columns)),
+                              list(map(str, data.dtypes)), list(params)]).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:24]
+
+
+class TrainingMatrices:
+    """Feature matrix, target and split of one processed dataset.
+
+    Args:
+        X: Float32 feature matrix, training rows first
+        y: Float32 target in the same row order
+        rows: Position of every row in the source frame
+        n_train: Number of training rows
+        feature_columns: Column name of every feature in ``X``
+    """
+
+    def __init__(self, X: np.ndarray, y: np.ndarray, rows: np.ndarray,
+                 n_train: int, feature_columns: List[str]):
+        self.X = X
+        self.y = y
+        self.rows = rows
+        self.n_train = n_train
+        self.feature_columns = feature_columns
+
+    def split(self, train_rows: Optional[np.ndarray] = None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
+        """X_train, X_test, y_train, y_test as frames over the (mapped) arrays, without copying.
+
+        ``train_rows`` selects a subset of the training rows (copied); the test
+        set is always complete, so runs on different subsets stay comparable.
+        """
+        def frame(X: np.ndarray) -> pd.DataFrame:
+            return pd.DataFrame(X, columns=self.feature_columns, copy=False)
+
+        X_train, y_train = self.X[:self.n_train], self.y[:self.n_train]
+        if train_rows is not None:
+            X_train, y_train = X_train[train_rows], y_train[train_rows]
+        return (frame(X_train), frame(self.X[self.n_train:]),
+                pd.Series(y_train, name=TARGET_COLUMN, copy=False),
+                pd.Series(self.y[self.n_train:], name=TARGET_COLUMN, copy=False))
+
+
+def build_training_matrices(data: pd.DataFrame, test_size: float = 0.2,
+                            random_state: int = 42) -> TrainingMatrices:
+    """Model-ready arrays of a processed frame, in memory."""
+    feature_columns = select_feature_columns(data)
+    train_rows, test_rows = train_test_split(
+        np.arange(len(data)), test_size=test_size, random_state=random_state
+    )
+    rows = np.concatenate([train_rows, test_rows])
+    X = data[feature_columns].to_numpy(dtype=np.float32)[rows]
+    y = data[TARGET_COLUMN].to_numpy(dtype=np.float32)[rows]
+    return TrainingMatrices(X, y, rows, len(train_rows), feature_columns)
+
+
+def load_training_matrices(data: pd.DataFrame, test_size: float = 0.2, random_state: int = 42,
+                           cache_dir: Optional[Union[str, Path]] = None) -> TrainingMatrices:
+    """Memory-mapped training arrays of a processed frame, built on the first call.
+
+    Args:
+        data: Processed frame with feature columns and the target
+        test_size: Share of rows held out for evaluation
+        random_state: Seed of the split
+        cache_dir: Cache location; defaults to ``TRAINING_CACHE_DIR``
+    """
+    with stage_timer('training_matrices.fingerprint'):
+        columns = select_feature_columns(data) + [TARGET_COLUMN]
+        key = data_fingerprint(data[columns], test_size, random_state)
+    path = Path(cache_dir or TRAINING_CACHE_DIR) / key
+
+    if not (path / 'meta.json').exists():
+        record_cache('training_matrices', False)
+        with stage_timer('training_matrices.build'):
+            matrices = build_training_matrices(data, test_size, random_state)
+            _write(path, matrices)
+    else:
+        record_cache('training_matrices', True)
+
+    with stage_timer('training_matrices.load'):
+        with open(path / 'meta.json') as f:
+            meta = json.load(f)
+        arrays = {name: np.load(path / f'{name}.npy', mmap_mode='r') for name in ('X', 'y', 'rows')}
+    return TrainingMatrices(arrays['X'], arrays['y'], arrays['rows'], meta['n_train'], meta['feature_columns'])
+
+
+def _write(path: Path, matrices: TrainingMatrices) -> None:
+    """Write the arrays to a temporary directory and rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    tmp.mkdir()
+    try:
+        for name in ('X', 'y', 'rows'):
+            np.save(tmp / f'{name}.npy', getattr(matrices, name))
+        # meta.json marks a complete entry
+        with open(tmp / 'meta.json', 'w') as f:
+            json.dump({'n_train': int(matrices.n_train), 'feature_columns': matrices.feature_columns}, f)
+        os.replace(tmp, path)
+    except OSError:
+        # Another run wrote the same entry first
+        if not (path / 'meta.json').exists():
+            raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
@@ -0,0 +1,194 @@
+"""Opt-in per-stage memory profiling of training runs.
+
+While a ``MemoryProfiler`` is active it is notified by every ``stage_timer``
+and ``timed`` stage (CSV load, each feature graph step, matrix build, each
+model fit, peak demand training, ...) and records for each one:
+
+- the traced Python/NumPy allocations still held at its end and its peak
+  above its start (``tracemalloc``; native LightGBM/XGBoost buffers are not
+  traced),
+- resident memory at its end and how far it raised the process's peak RSS,
+  which does cover native memory.
+
+Usage:
+    python -m src.main --memory-report data/reports/memory_profile.json
+    python -m src.utils.memory_profiler current.json --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+import pandas as pd
+from ..config.data_config import REPORT_DIR
+from ..config.metrics_config import MEMORY_PROFILE_CONFIG
+from .instrumentation import set_stage_listener
+
+REPORT_COLUMNS = ['stage', 'depth', 'seconds', 'traced_delta_mb', 'traced_peak_mb',
+                  'rss_mb', 'peak_rss_mb', 'peak_rss_increase_mb']
+_MB = 1024 * 1024
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, where /proc is available."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss() -> int:
+    """Highest resident set size of this process so far, in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemoryProfiler:
+    """Records traced-allocation and RSS deltas of every instrumented stage.
+
+    Stages nest: a stage's peak includes the peaks of the stages inside it,
+    and ``depth`` in the report gives the nesting level.
+    """
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._started_tracing = False
+
+    def start(self) -> 'MemoryProfiler':
+        """Start tracing allocations and receiving stage events."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        set_stage_listener(self)
+        return self
+
+    def stop(self) -> None:
+        """Stop receiving stage events, and tracing if this profiler started it."""
+        set_stage_listener(None)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def enter(self, stage: str) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # The enclosing stage's peak so far, before it is reset for this one
+            self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+        tracemalloc.reset_peak()
+        self._stack.append({
+            'stage': stage,
+            'start': time.perf_counter(),
+            'traced_start': current,
+            'peak': current,
+            'peak_rss_start': peak_rss()
+        })
+
+    def exit(self, stage: str) -> None:
+        if not self._stack or self._stack[-1]['stage'] != stage:
+            return
+        entry = self._stack.pop()
+        current, peak = tracemalloc.get_traced_memory()
+        stage_peak = max(entry['peak'], peak)
+        if self._stack:
+            self._stack[-1]['peak'] = max(self._stack[-1]['peak'], stage_peak)
+        tracemalloc.reset_peak()
+
+        rss, max_rss = current_rss(), peak_rss()
+        self.records.append({
+            'stage': stage,
+            'depth': len(self._stack),
+            'seconds': time.perf_counter() - entry['start'],
+            'traced_delta_mb': (current - entry['traced_start']) / _MB,
+            'traced_peak_mb': (stage_peak - entry['traced_start']) / _MB,
+            'rss_mb': rss / _MB if rss is not None else None,
+            'peak_rss_mb': max_rss / _MB,
+            'peak_rss_increase_mb': (max_rss - entry['peak_rss_start']) / _MB
+        })
+
+    def report(self) -> pd.DataFrame:
+        """One row per completed stage, in completion order."""
+        return pd.DataFrame(self.records, columns=REPORT_COLUMNS)
+
+    def write_report(self, path: Union[str, Path]) -> Path:
+        """Write the report as JSON, with the run's overall peak RSS."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'peak_rss_mb': peak_rss() / _MB, 'stages': self.records}, f, indent=2)
+        return path
+
+
+def load_report(path: Union[str, Path]) -> pd.DataFrame:
+    """Stages of a JSON report written by ``MemoryProfiler.write_report``."""
+    with open(path) as f:
+        return pd.DataFrame(json.load(f)['stages'], columns=REPORT_COLUMNS)
+
+
+def compare_reports(baseline: pd.DataFrame, current: pd.DataFrame,
+                    tolerance: Optional[float] = None) -> pd.DataFrame:
+    """Per-stage traced peak and peak RSS increase of two runs, flagging regressions.
+
+    Stages that ran more than once (e.g. a feature step in fit and transform)
+    are compared by their largest value.
+    """
+    tolerance = MEMORY_PROFILE_CONFIG['regression_tolerance'] if tolerance is None else tolerance
+    metrics = ['traced_peak_mb', 'peak_rss_increase_mb']
+    merged = baseline.groupby('stage')[metrics].max().join(
+        current.groupby('stage')[metrics].max(), how='outer', lsuffix='_baseline', rsuffix='_current'
+    )
+    merged['traced_peak_change_mb'] = merged['traced_peak_mb_current'] - merged['traced_peak_mb_baseline']
+    merged['regression'] = (
+        merged['traced_peak_mb_current'] > merged['traced_peak_mb_baseline'].clip(lower=1.0) * (1 + tolerance)
+    )
+    return merged.reset_index()
+
+
+@contextmanager
+def profile_memory(report_path: Optional[Union[str, Path]] = None) -> Iterator[Optional[MemoryProfiler]]:
+    """Profile the stages run inside the block when a report path is given or profiling is enabled.
+
+    On exit the report is written, printed, and compared with the configured
+    baseline if there is one. Yields None when profiling is off.
+    """
+    report_path = report_path or MEMORY_PROFILE_CONFIG['report_path']
+    if report_path is None and not MEMORY_PROFILE_CONFIG['enabled']:
+        yield None
+        return
+
+    profiler = MemoryProfiler().start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        path = profiler.write_report(report_path or REPORT_DIR / 'memory_profile.json')
+        print(f"\nMemory profile written to {path}")
+        print(profiler.report().to_string(index=False, float_format='%.1f'))
+        if MEMORY_PROFILE_CONFIG['baseline_path']:
+            comparison = compare_reports(load_report(MEMORY_PROFILE_CONFIG['baseline_path']), profiler.report())
+            print(comparison.to_string(index=False, float_format='%.1f'))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare a memory profile report with a baseline.")
+    parser.add_argument('report', help="JSON report of the run to check")
+    parser.add_argument('--baseline', required=True, help="JSON report of the baseline run")
+    parser.add_argument('--tolerance', type=float, help="Allowed growth of a stage's traced peak")
+    args = parser.parse_args()
+
+    comparison = compare_reports(load_report(args.baseline), load_report(args.report), args.tolerance)
+    print(comparison.to_string(index=False, float_format='%.1f'))
+    # Non-zero exit lets CI fail on a regression
+    sys.exit(1 if comparison['regression'].any() else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Pre-forking uvicorn launcher that shares preloaded models between workers."""
+import gc
+import json
+import os
+import signal
+import socket
+import time
+from typing import Any, Callable, List, Optional
+import uvicorn
+from .shared_arrays import worker_memory_report
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Listening socket inherited by every worker."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def fork_worker(app: Any, sock: socket.socket) -> int:
+    """Fork one uvicorn server on the shared socket; returns its pid."""
+    pid = os.fork()
+    if pid == 0:
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1):
+            signal.signal(signum, signal.SIG_DFL)
+        server = uvicorn.Server(uvicorn.Config(app))
+        server.run(sockets=[sock])
+        os._exit(0)
+    return pid
+
+
+def serve_preforked(app: Any, host: str, port: int, workers: int,
+                    preload: Optional[Callable[[], None]] = None,
+                    reload: Optional[Callable[[], bool]] = None,
+                    poll_seconds: float = 5.0,
+                    on_exit: Optional[Callable[[], None]] = None) -> None:
+    """Load models once, then fork ``workers`` uvicorn servers on one socket.
+
+    uvicorn's own ``--workers`` spawns fresh interpreters, so each worker
+    loads its own copy of every model. Forking after ``preload`` instead lets
+    the workers share the parent's pages copy-on-write. ``gc.freeze`` moves
+    the preloaded objects out of the collector's reach so collections in the
+    workers don't write to (and un-share) their headers.
+
+    The parent supervises the workers:
+
+    - Workers do not reload models themselves. Every ``poll_seconds``, or on
+      SIGHUP, the parent calls ``reload``. When it returns True, a new
+      generation of workers is forked from the updated parent and the old
+      one is stopped gracefully, so in-flight requests finish on old models.
+    - A worker that exits unexpectedly is replaced.
+    - SIGTERM/SIGINT stop all workers. SIGUSR1 prints each worker's memory.
+    """
+    if preload is not None:
+        preload()
+    sock = bind_socket(host, port)
+
+    def spawn_generation() -> List[int]:
+        # Unfreeze first so models superseded since the last generation can be collected
+        gc.unfreeze()
+        gc.collect()
+        gc.freeze()
+        return [fork_worker(app, sock) for _ in range(workers)]
+
+    children: List[int] = spawn_generation()
+    retiring: List[int] = []
+    flags = {'stopping': False, 'reload': False}
+
+    def stop(signum, frame):
+        flags['stopping'] = True
+        for pid in children + retiring:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def request_reload(signum, frame):
+        flags['reload'] = True
+
+    def report(signum, frame):
+        print(json.dumps(worker_memory_report(children)), flush=True)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGHUP, request_reload)
+    signal.signal(signal.SIGUSR1, report)
+
+    next_poll = time.monotonic() + poll_seconds
+    try:
+        while children or retiring:
+            # Reap exited workers; replace current ones that died unexpectedly
+            while True:
+                try:
+                    pid, _ = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    pid = 0
+                if pid == 0:
+                    break
+                if pid in retiring:
+                    retiring.remove(pid)
+                elif pid in children:
+                    children.remove(pid)
+                    if not flags['stopping']:
+                        children.append(fork_worker(app, sock))
+
+            if flags['stopping']:
+                time.sleep(0.1)
+                continue
+
+            if reload is not None and (flags['reload'] or time.monotonic() >= next_poll):
+                flags['reload'] = False
+                next_poll = time.monotonic() + poll_seconds
+                if reload():
+                    retiring += children
+                    children = spawn_generation()
+                    for pid in retiring:
+                        try:
+                            os.kill(pid, signal.SIGTERM)
+                        except ProcessLookupError:
+                            pass
+            time.sleep(0.1)
+    finally:
+        sock.close()
+        if on_exit is not None:
+            on_exit()
@@ -0,0 +1,201 @@
+"""Incremental lag and rolling-window statistics for live hourly demand."""
+import math
+import pickle
+from pathlib import Path
+from typing import Dict, Iterable, Sequence, Union
+import numpy as np
+import pandas as pd
+
+DEFAULT_LAGS = (1, 2, 3, 6, 12, 24)
+DEFAULT_WINDOWS = (3, 6, 12, 24)
+
+# Running sums drift slightly under repeated add/subtract; recompute them
+# exactly from the buffer this often (amortized O(1) per update)
+RESYNC_INTERVAL = 10000
+
+
+class RollingFeatureState:
+    """O(1)-update lag and rolling mean/std state for one hourly series.
+
+    ``features()`` returns exactly what ``create_lag_features`` and
+    ``create_rolling_features`` produce for the row of the latest value:
+    ``lag_k`` is the value k hours earlier and rolling windows include the
+    latest value. NaN values propagate into every window containing them,
+    as with pandas rolling.
+    """
+
+    def __init__(self, lags: Sequence[int] = DEFAULT_LAGS,
+                 windows: Sequence[int] = DEFAULT_WINDOWS):
+        self.lags = tuple(lags)
+        self.windows = tuple(windows)
+        # Room for the current value plus the longest lag or window
+        self.capacity = max(max(self.lags, default=0), max(self.windows, default=0)) + 1
+        self.buffer = np.full(self.capacity, np.nan)
+        self.position = 0  # Next slot to write
+        self.count = 0  # Values pushed so far
+        self.sums = np.zeros(len(self.windows))
+        self.sums_sq = np.zeros(len(self.windows))
+        self.nan_counts = np.zeros(len(self.windows), dtype=np.int64)
+
+    def update(self, value: float) -> None:
+        """Push the next hourly value."""
+        value = float(value)
+        for i, window in enumerate(self.windows):
+            if self.count >= window:
+                self._remove(i, self.buffer[(self.position - window) % self.capacity])
+            self._add(i, value)
+
+        self.buffer[self.position] = value
+        self.position = (self.position + 1) % self.capacity
+        self.count += 1
+
+        if self.count % RESYNC_INTERVAL == 0:
+            self._resync()
+
+    def update_many(self, values: Iterable[float]) -> None:
+        """Push several hourly values in order."""
+        for value in values:
+            self.update(value)
+
+    def lag(self, k: int) -> float:
+        """Value k hours before the latest one."""
+        if k >= self.capacity:
+            raise ValueError(f"Lag {k} exceeds buffer capacity {self.capacity - 1}")
+        if self.count <= k:
+            return math.nan
+        return float(self.buffer[(self.position - 1 - k) % self.capacity])
+
+    def rolling_mean(self, window: int) -> float:
+        """Mean of the latest ``window`` values."""
+        i = self.windows.index(window)
+        if self.count < window or self.nan_counts[i]:
+            return math.nan
+        return float(self.sums[i] / window)
+
+    def rolling_std(self, window: int) -> float:
+        """Sample standard deviation (ddof=1) of the latest ``window`` values."""
+        i = self.windows.index(window)
+        if self.count < window or self.nan_counts[i] or window < 2:
+            return math.nan
+        variance = (self.sums_sq[i] - self.sums[i] * self.sums[i] / window) / (window - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def features(self) -> Dict[str, float]:
+        """Lag and rolling features for the latest value."""
+        result = {f'lag_{k}h': self.lag(k) for k in self.lags}
+        for window in self.windows:
+            result[f'rolling_mean_{window}h'] = self.rolling_mean(window)
+            result[f'rolling_std_{window}h'] = self.rolling_std(window)
+        return result
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serializable snapshot of the state."""
+        return {
+            'lags': self.lags,
+            'windows': self.windows,
+            'buffer': self.buffer.copy(),
+            'position': self.position,
+            'count': self.count
+        }
+
+    @classmethod
+    def from_dict(cls, snapshot: Dict[str, object]) -> 'RollingFeatureState':
+        """Restore a state from ``to_dict`` output."""
+        state = cls(snapshot['lags'], snapshot['windows'])
+        state.buffer[:] = snapshot['buffer']
+        state.position = int(snapshot['position'])
+        state.count = int(snapshot['count'])
+        state._resync()
+        return state
+
+    def _add(self, i: int, value: float) -> None:
+        if math.isnan(value):
+            self.nan_counts[i] += 1
+        else:
+            self.sums[i] += value
+            self.sums_sq[i] += value * value
+
+    def _remove(self, i: int, value: float) -> None:
+        if math.isnan(value):
+            self.nan_counts[i] -= 1
+        else:
+            self.sums[i] -= value
+            self.sums_sq[i] -= value * value
+
+    def _resync(self) -> None:
+        """Recompute running sums exactly from the buffer."""
+        for i, window in enumerate(self.windows):
+            n = min(window, self.count)
+            slots = (self.position - 1 - np.arange(n)) % self.capacity
+            values = self.buffer[slots]
+            observed = values[~np.isnan(values)]
+            self.sums[i] = observed.sum()
+            self.sums_sq[i] = (observed * observed).sum()
+            self.nan_counts[i] = len(values) - len(observed)
+
+
+class RollingStateStore:
+    """Rolling feature states keyed by series (e.g. city), checkpointable to disk."""
+
+    def __init__(self, lags: Sequence[int] = DEFAULT_LAGS,
+                 windows: Sequence[int] = DEFAULT_WINDOWS):
+        self.lags = tuple(lags)
+        self.windows = tuple(windows)
+        self.states: Dict[str, RollingFeatureState] = {}
+
+    def update(self, key: str, value: float) -> Dict[str, float]:
+        """Push the next hourly value of a series and return its features."""
+        if key not in self.states:
+            self.states[key] = RollingFeatureState(self.lags, self.windows)
+        state = self.states[key]
+        state.update(value)
+        return state.features()
+
+    def features(self, key: str) -> Dict[str, float]:
+        """Current features of a series."""
+        if key not in self.states:
+            raise KeyError(f"No rolling state for {key}")
+        return self.states[key].features()
+
+    @classmethod
+    def from_history(cls, history: Union[pd.DataFrame, Dict[str, Sequence[float]]],
+                     lags: Sequence[int] = DEFAULT_LAGS,
+                     windows: Sequence[int] = DEFAULT_WINDOWS) -> 'RollingStateStore':
+        """Seed states from historical hourly values (columns or dict entries per series)."""
+        store = cls(lags, windows)
+        for key in history:
+            values = np.asarray(history[key], dtype=float)
+            state = RollingFeatureState(lags, windows)
+            # Only the tail that fits in the buffer matters
+            state.update_many(values[-state.capacity:])
+            state.count = len(values)
+            store.states[key] = state
+        return store
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Checkpoint all states to disk."""
+        try:
+            snapshot = {
+                'lags': self.lags,
+                'windows': self.windows,
+                'states': {key: state.to_dict() for key, state in self.states.items()}
+            }
+            with open(path, 'wb') as f:
+                pickle.dump(snapshot, f)
+        except Exception as e:
+            raise RuntimeError(f"Error saving rolling state: {str(e)}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'RollingStateStore':
+        """Restore states from a checkpoint written by ``save``."""
+        try:
+            with open(path, 'rb') as f:
+                snapshot = pickle.load(f)
+            store = cls(snapshot['lags'], snapshot['windows'])
+            store.states = {
+                key: RollingFeatureState.from_dict(state)
+                for key, state in snapshot['states'].items()
+            }
+            return store
+        except Exception as e:
+            raise RuntimeError(f"Error loading rolling state: {str(e)}")
@@ -0,0 +1,89 @@
+"""Stratified subsampling for fast training and evaluation runs."""
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from ..config.model_config import SAMPLING_CONFIG
+from .matrix_cache import TrainingMatrices
+
+
+def strata(data: pd.DataFrame, columns: Optional[List[str]] = None,
+           target_column: Optional[str] = None, target_quantiles: Optional[int] = None) -> np.ndarray:
+    """Stratum id of every row: its categorical values and target quantile bin combined."""
+    columns = SAMPLING_CONFIG['columns'] if columns is None else columns
+    target_column = target_column or SAMPLING_CONFIG['target_column']
+    target_quantiles = target_quantiles or SAMPLING_CONFIG['target_quantiles']
+
+    codes, sizes = [], []
+    for column in columns:
+        column_codes, uniques = pd.factorize(data[column])
+        # Missing values (-1) get their own code
+        codes.append(column_codes + 1)
+        sizes.append(len(uniques) + 1)
+
+    if target_column in data:
+        target = pd.to_numeric(data[target_column], errors='coerce').to_numpy(dtype=float)
+        edges = np.unique(np.nanquantile(target, np.linspace(0, 1, target_quantiles + 1)[1:-1])) \
+            if np.isfinite(target).any() else np.empty(0)
+        bins = np.where(np.isnan(target), 0, np.digitize(target, edges) + 1)
+        codes.append(bins)
+        sizes.append(len(edges) + 2)
+
+    if not codes:
+        return np.zeros(len(data), dtype=np.int64)
+    return np.ravel_multi_index(codes, sizes).astype(np.int64)
+
+
+def stratified_sample_indices(keys: np.ndarray, fraction: float, seed: Optional[int] = None) -> np.ndarray:
+    """Sorted positions of a ``fraction`` of the rows, drawn from every stratum in proportion.
+
+    Each stratum keeps ``ceil(fraction * size)`` rows, so rare strata are
+    represented by at least one row. The same seed draws the same rows.
+    """
+    if not 0 < fraction <= 1:
+        raise ValueError(f"Sample fraction must be in (0, 1], got {fraction}")
+    rng = np.random.default_rng(SAMPLING_CONFIG['seed'] if seed is None else seed)
+
+    # Shuffle within strata: order rows by stratum, then by a random key
+    order = np.lexsort((rng.random(len(keys)), keys))
+    _, stratum, counts = np.unique(keys[order], return_inverse=True, return_counts=True)
+    starts = np.cumsum(counts) - counts
+    rank = np.arange(len(keys)) - starts[stratum]
+    quota = np.ceil(counts * fraction).astype(np.int64)
+    return np.sort(order[rank < quota[stratum]])
+
+
+def stratified_sample(data: pd.DataFrame, fraction: float, seed: Optional[int] = None) -> pd.DataFrame:
+    """Stratified subsample of a frame by city, weather, traffic and delivery time quantile."""
+    return data.iloc[stratified_sample_indices(strata(data), fraction, seed)]
+
+
+def sample_training_rows(matrices: TrainingMatrices, data: pd.DataFrame,
+                         fraction: float, seed: Optional[int] = None) -> np.ndarray:
+    """Stratified subset of the training rows of ``matrices``, for ``matrices.split``.
+
+    Args:
+        matrices: Training matrices built from ``data``
+        data: Processed frame holding the strata columns and the target
+        fraction: Share of training rows to keep
+        seed: Random seed; defaults to ``SAMPLING_CONFIG['seed']``
+    """
+    training = data.iloc[np.asarray(matrices.rows[:matrices.n_train])]
+    return stratified_sample_indices(strata(training), fraction, seed)
+
+
+def compare_metrics(full: Dict[str, Dict[str, float]],
+                    sample: Dict[str, Dict[str, float]]) -> pd.DataFrame:
+    """Per-model metrics of a full run next to a sampled run, with their differences."""
+    rows = []
+    for name in full:
+        if name not in sample:
+            continue
+        for metric, value in full[name].items():
+            rows.append({
+                'model': name,
+                'metric': metric,
+                'full': value,
+                'sample': sample[name][metric],
+                'difference': sample[name][metric] - value
+            })
+    return pd.DataFrame(rows, columns=['model', 'metric', 'full', 'sample', 'difference'])
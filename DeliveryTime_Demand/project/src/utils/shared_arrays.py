@@ -0,0 +1,150 @@
+"""Read-only and shared-memory model arrays for forked API workers.
+
+Only NumPy arrays held by objects defined in this package are covered. In
+the served artifacts these are the driver profile and restaurant index
+arrays of the delivery pipeline's processor and the hourly demand tables of
+the peak demand model; the zone demand and lookup-table models are array
+backed too.
+
+Not covered: LightGBM boosters keep their trees in native memory, feature
+encoder mappings and other fitted feature state are small Python dicts, and
+sklearn/pandas state is left as-is. In preforked mode those are shared
+copy-on-write by ``fork`` alone; ``gc.freeze`` keeps the collector off their
+headers, but reading Python objects still updates their reference counts and
+so un-shares the pages they sit on.
+"""
+import mmap
+import os
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+# Only objects defined in this package are walked; third-party internals
+# (pandas blocks, sklearn/LightGBM estimators) are left untouched
+_PACKAGE = __name__.split('.')[0] + '.'
+
+# Blocks created by this process, keyed by the id of the object they were
+# shared for; kept referenced so their buffers stay mapped
+_blocks: Dict[int, List[shared_memory.SharedMemory]] = {}
+
+_MEMORY_FIELDS = {
+    'Rss': 'rss',
+    'Pss': 'pss',
+    'Shared_Clean': 'shared_clean',
+    'Shared_Dirty': 'shared_dirty',
+    'Private_Clean': 'private_clean',
+    'Private_Dirty': 'private_dirty'
+}
+
+
+def _array_slots(obj: Any, seen: set) -> Iterator[Tuple[Any, Any, np.ndarray]]:
+    """Yield (container, key, array) for every NumPy array reachable from ``obj``."""
+    if id(obj) in seen:
+        return
+    seen.add(id(obj))
+
+    if isinstance(obj, dict):
+        items = list(obj.items())
+    elif isinstance(obj, list):
+        items = list(enumerate(obj))
+    elif type(obj).__module__.startswith(_PACKAGE) and hasattr(obj, '__dict__'):
+        items = list(vars(obj).items())
+        obj = vars(obj)
+    else:
+        return
+
+    for key, value in items:
+        if isinstance(value, np.ndarray):
+            if value.dtype != object:
+                yield obj, key, value
+        else:
+            yield from _array_slots(value, seen)
+
+
+def freeze_arrays(obj: Any) -> int:
+    """Mark every NumPy array reachable from ``obj`` read-only; returns bytes covered.
+
+    Served models never mutate their arrays, and read-only flags make an
+    accidental write fail loudly instead of silently un-sharing forked pages.
+    """
+    total = 0
+    for _, _, array in _array_slots(obj, set()):
+        array.flags.writeable = False
+        total += array.nbytes
+    return total
+
+
+def share_arrays(obj: Any, min_bytes: int = 0) -> int:
+    """Move arrays of at least ``min_bytes`` reachable from ``obj`` into shared memory.
+
+    Arrays are replaced in place by read-only views of ``SharedMemory`` blocks,
+    which forked workers map instead of copying. Returns the bytes moved.
+    """
+    moved = 0
+    for container, key, array in list(_array_slots(obj, set())):
+        if array.nbytes < min_bytes or array.nbytes == 0:
+            continue
+        block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+        shared[...] = array
+        shared.flags.writeable = False
+        container[key] = shared
+        _blocks.setdefault(id(obj), []).append(block)
+        moved += array.nbytes
+    return moved
+
+
+def touch_arrays(obj: Any) -> int:
+    """Read one byte of every page of the arrays reachable from ``obj``; returns bytes covered.
+
+    Shared-memory blocks are mapped lazily, so a fresh worker would take the
+    page faults on its first requests; touching the pages at startup moves
+    that cost off the request path.
+    """
+    total = 0
+    for _, _, array in _array_slots(obj, set()):
+        if array.nbytes and array.flags.c_contiguous:
+            array.reshape(-1).view(np.uint8)[::mmap.PAGESIZE].sum()
+            total += array.nbytes
+    return total
+
+
+def release_shared_arrays(obj: Any = None) -> None:
+    """Unlink the blocks created by ``share_arrays`` for ``obj`` (default: all).
+
+    Processes that still map a block keep it until they exit, so this is safe
+    to call in the parent once a replaced model is no longer served.
+    """
+    keys = [id(obj)] if obj is not None else list(_blocks)
+    for key in keys:
+        for block in _blocks.pop(key, []):
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def process_memory(pid: Optional[int] = None) -> Dict[str, Optional[int]]:
+    """Memory of a process in bytes; ``unique`` is what exiting it would free.
+
+    Reads ``/proc/<pid>/smaps_rollup`` and returns None values where it is
+    unavailable (non-Linux systems).
+    """
+    report: Dict[str, Optional[int]] = {name: None for name in _MEMORY_FIELDS.values()}
+    report['unique'] = None
+    try:
+        with open(f"/proc/{pid or os.getpid()}/smaps_rollup") as f:
+            for line in f:
+                field, _, value = line.partition(':')
+                if field in _MEMORY_FIELDS:
+                    report[_MEMORY_FIELDS[field]] = int(value.split()[0]) * 1024
+    except OSError:
+        return report
+    if report['private_clean'] is not None and report['private_dirty'] is not None:
+        report['unique'] = report['private_clean'] + report['private_dirty']
+    return report
+
+
+def worker_memory_report(pids: List[int]) -> Dict[int, Dict[str, Optional[int]]]:
+    """Memory of every worker process, keyed by pid."""
+    return {pid: process_memory(pid) for pid in pids}
@@ -0,0 +1,76 @@
+"""Vectorized spatial binning of coordinates into hierarchical grid zones."""
+from typing import Dict, Sequence, Tuple
+import numpy as np
+
+INVALID_ZONE = -1
+
+
+def clean_coordinates(lat: np.ndarray, lng: np.ndarray,
+                      absolute: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Fix sign flips and flag missing, zero or out-of-range coordinates.
+    
+    Returns:
+        Cleaned latitude and longitude arrays and a boolean validity mask
+    """
+    lat = np.asarray(lat, dtype=float)
+    lng = np.asarray(lng, dtype=float)
+    if absolute:
+        lat = np.abs(lat)
+        lng = np.abs(lng)
+    valid = (
+        np.isfinite(lat) & np.isfinite(lng)
+        & (np.abs(lat) <= 90) & (np.abs(lng) <= 180)
+        # (0, 0) and near-zero coordinates are placeholders in this dataset
+        & ~((np.abs(lat) < 1e-6) | (np.abs(lng) < 1e-6))
+    )
+    return lat, lng, valid
+
+
+def _grid_width(resolution: float) -> int:
+    return int(np.ceil(360.0 / resolution))
+
+
+def zone_ids(lat: np.ndarray, lng: np.ndarray, resolution: float,
+             absolute: bool = True) -> np.ndarray:
+    """Integer tile id per coordinate pair; invalid coordinates get INVALID_ZONE."""
+    lat, lng, valid = clean_coordinates(lat, lng, absolute)
+    # Rounding first keeps tile edges consistent across resolutions despite float error
+    rows = np.floor(np.round((np.where(valid, lat, 0.0) + 90.0) / resolution, 9)).astype(np.int64)
+    cols = np.floor(np.round((np.where(valid, lng, 0.0) + 180.0) / resolution, 9)).astype(np.int64)
+    ids = rows * _grid_width(resolution) + cols
+    return np.where(valid, ids, INVALID_ZONE)
+
+
+def zone_hierarchy(lat: np.ndarray, lng: np.ndarray, resolutions: Sequence[float],
+                   absolute: bool = True) -> Dict[float, np.ndarray]:
+    """Tile ids at every resolution, keyed by resolution."""
+    return {resolution: zone_ids(lat, lng, resolution, absolute) for resolution in resolutions}
+
+
+def parent_zone(zone: np.ndarray, resolution: float, parent_resolution: float) -> np.ndarray:
+    """Map tile ids to the enclosing tile at a coarser resolution."""
+    factor = parent_resolution / resolution
+    if abs(factor - round(factor)) > 1e-9 or factor < 1:
+        raise ValueError(f"{parent_resolution} is not a multiple of {resolution}")
+    factor = int(round(factor))
+    zone = np.asarray(zone, dtype=np.int64)
+    width = _grid_width(resolution)
+    parent = (zone // width // factor) * _grid_width(parent_resolution) + (zone % width) // factor
+    return np.where(zone == INVALID_ZONE, INVALID_ZONE, parent)
+
+
+def neighbour_zones(zone: np.ndarray, resolution: float, reach: int = 1) -> np.ndarray:
+    """Tile ids within ``reach`` tiles of each tile, shape (n, (2 * reach + 1) ** 2); invalid tiles stay invalid."""
+    zone = np.asarray(zone, dtype=np.int64).reshape(-1, 1)
+    steps = np.arange(-reach, reach + 1)
+    offsets = (steps[:, None] * _grid_width(resolution) + steps[None, :]).ravel()
+    return np.where(zone == INVALID_ZONE, INVALID_ZONE, zone + offsets)
+
+
+def zone_center(zone: np.ndarray, resolution: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Latitude and longitude of tile centers."""
+    zone = np.asarray(zone, dtype=np.int64)
+    width = _grid_width(resolution)
+    lat = (zone // width + 0.5) * resolution - 90.0
+    lng = (zone % width + 0.5) * resolution - 180.0
+    return lat, lng
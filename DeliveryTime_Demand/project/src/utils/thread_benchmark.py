@@ -0,0 +1,75 @@
+"""Prediction throughput of several worker processes with and without the thread budget.
+
+Simulates API workers: each process predicts batches with a 1000-tree
+LightGBM model for a fixed time, either with library default threads (every
+process uses every core) or with the 'serving' budget.
+
+    python -m src.utils.thread_benchmark --workers 4 --batch 1 --seconds 5
+"""
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict
+import lightgbm as lgb
+import numpy as np
+from .thread_budget import available_cpus, context_threads, set_thread_context
+
+# Model and inputs of the running benchmark, inherited by forked workers
+_source: Dict[str, Any] = {}
+
+
+def _train_model(n_rows: int, n_features: int, seed: int) -> lgb.Booster:
+    """1000-tree booster shaped like the delivery time model, on synthetic data."""
+    rng = np.random.default_rng(seed)
+    X = rng.random((n_rows, n_features))
+    y = 15 + 30 * X[:, 0] + 10 * X[:, 1] * X[:, 2] + rng.normal(0, 2, n_rows)
+    regressor = lgb.LGBMRegressor(n_estimators=1000, learning_rate=0.01, num_leaves=31,
+                                  random_state=seed, verbose=-1)
+    return regressor.fit(X, y).booster_
+
+
+def _worker_rate(budgeted: bool, seconds: float) -> float:
+    """Rows predicted per second by one worker process."""
+    booster, batch = _source['booster'], _source['batch']
+    # 0 lets LightGBM use OpenMP's default of every core
+    num_threads = set_thread_context('serving') if budgeted else 0
+    rows, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        booster.predict(batch, num_threads=num_threads)
+        rows += len(batch)
+    return rows / (time.perf_counter() - start)
+
+
+def run_benchmark(workers: int, batch: int, seconds: float, seed: int = 42) -> Dict[str, float]:
+    """Total rows per second of ``workers`` processes with default threads and with the budget."""
+    _source['booster'] = _train_model(20000, 16, seed)
+    _source['batch'] = np.random.default_rng(seed).random((batch, 16))
+    context = multiprocessing.get_context('fork')
+    results = {}
+    try:
+        for mode, budgeted in (('library_default', False), ('thread_budget', True)):
+            with ProcessPoolExecutor(workers, mp_context=context) as pool:
+                results[mode] = sum(pool.map(_worker_rate, [budgeted] * workers, [seconds] * workers))
+    finally:
+        _source.clear()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark prediction throughput with the thread budget.")
+    parser.add_argument('--workers', type=int, default=available_cpus(), help="Worker processes")
+    parser.add_argument('--batch', type=int, default=1, help="Rows per prediction call")
+    parser.add_argument('--seconds', type=float, default=5.0, help="Duration of each run")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.workers, args.batch, args.seconds)
+    print(f"{available_cpus()} CPUs, {args.workers} workers, batches of {args.batch} rows, "
+          f"'serving' budget of {context_threads('serving')} thread(s) per worker")
+    for mode, rate in results.items():
+        print(f"{mode:>16}: {rate:12,.0f} rows/s")
+    print(f"{'speedup':>16}: {results['thread_budget'] / results['library_default']:12.2f}x")
+
+
+if __name__ == '__main__':
+    main()
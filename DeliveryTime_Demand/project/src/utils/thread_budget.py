@@ -0,0 +1,82 @@
+"""One CPU thread budget for every model library in the process.
+
+LightGBM, XGBoost, CatBoost and scikit-learn each default to all cores, and
+OpenMP and BLAS keep their own pools. With several API workers or process
+pools that oversubscribes the CPU. Processes select a context from
+``THREAD_BUDGET_CONFIG`` ('serving' in API workers, 'training' for model
+fitting, 'worker' in pool processes); model wrappers read ``threads()`` for
+their ``n_jobs``/``thread_count``/``num_threads`` and the OpenMP and BLAS pools
+are capped with threadpoolctl.
+"""
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from threadpoolctl import threadpool_limits
+from ..config.model_config import THREAD_BUDGET_CONFIG
+
+_state: Dict[str, Optional[Any]] = {'context': None, 'threads': None}
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def context_threads(context: str) -> int:
+    """Threads per process in a context, capped by the total budget."""
+    if context not in THREAD_BUDGET_CONFIG['contexts']:
+        raise ValueError(f"Unknown thread context {context}. "
+                         f"Available contexts: {list(THREAD_BUDGET_CONFIG['contexts'])}")
+    total = THREAD_BUDGET_CONFIG['total'] or available_cpus()
+    return max(1, min(THREAD_BUDGET_CONFIG['contexts'][context] or total, total))
+
+
+def current_context() -> str:
+    """Name of the active context."""
+    return _state['context'] or THREAD_BUDGET_CONFIG['default_context']
+
+
+def threads() -> int:
+    """Threads a model may use in the active context."""
+    return _state['threads'] or context_threads(current_context())
+
+
+def set_thread_context(context: str) -> int:
+    """Switch the whole process to a context's budget and return its thread count.
+
+    Also caps the OpenMP and BLAS pools of loaded libraries and exports
+    ``OMP_NUM_THREADS`` for processes started later.
+    """
+    n_threads = context_threads(context)
+    _state.update(context=context, threads=n_threads)
+    threadpool_limits(n_threads)
+    os.environ['OMP_NUM_THREADS'] = str(n_threads)
+    return n_threads
+
+
+@contextmanager
+def thread_budget(context: str) -> Iterator[int]:
+    """Use a context's budget inside a block, then restore the previous one."""
+    previous = dict(_state)
+    n_threads = context_threads(context)
+    _state.update(context=context, threads=n_threads)
+    try:
+        with threadpool_limits(n_threads):
+            yield n_threads
+    finally:
+        _state.update(previous)
+
+
+def limit_worker_threads() -> None:
+    """Process pool initializer: one budget of 'worker' threads per pool process."""
+    set_thread_context('worker')
+
+
+def apply_threads(estimator: Any) -> int:
+    """Set a scikit-learn style estimator's ``n_jobs`` to the active budget; returns it."""
+    n_threads = threads()
+    if getattr(estimator, 'n_jobs', n_threads) != n_threads:
+        estimator.set_params(n_jobs=n_threads)
+    return n_threads
@@ -32,7 +32,9 @@ def parse_time(time_value: Any) -> Optional[pd.Timestamp]:
 
 def extract_time_features(df: pd.DataFrame) -> pd.DataFrame:
     """Extract time-based features from datetime columns with error handling."""
-    df = df.copy()
+    # Imported here: the feature definitions live with the models and depend on utils
+    from ..models.features.delivery_features import time_features
+    from ..models.features.feature_graph import FeatureGraph
     
     try:
         # Handle Time_Order column
@@ -43,27 +45,10 @@ def extract_time_features(df: pd.DataFrame) -> pd.DataFrame:
         else:
             raise KeyError("Neither 'Time_Order' nor 'Time_Orderd' column found in dataframe")
         
-        # Convert time strings to datetime and handle NaN values
-        parsed_times = df[time_col].apply(parse_time)
-        df['hour'] = parsed_times.apply(lambda x: x.hour if x is not None else None)
-        
-        # Fill NaN hours with median
-        median_hour = df['hour'].median()
-        df['hour'] = df['hour'].fillna(median_hour)
-        
-        # Handle Order_Date column with multiple format support
-        if 'Order_Date' in df.columns:
-            parsed_dates = df['Order_Date'].apply(parse_date)
-            df['day_of_week'] = parsed_dates.apply(lambda x: x.dayofweek if x is not None else None)
-            df['is_weekend'] = df['day_of_week'].isin([5, 6]).astype(int)
-            
-            # Handle any unparseable dates
-            median_day = df['day_of_week'].median()
-            df['day_of_week'] = df['day_of_week'].fillna(median_day)
-        else:
+        if 'Order_Date' not in df.columns:
             raise KeyError("'Order_Date' column not found in dataframe")
         
-        return df
+        return FeatureGraph(time_features(time_column=time_col)).fit_transform(df)
         
     except Exception as e:
         raise ValueError(f"Error extracting time features: {str(e)}")
@@ -1,8 +1,12 @@
 """Time parsing utilities."""
+import re
+import numpy as np
 import pandas as pd
 from typing import Optional, Union
 from datetime import time
 
+_CLOCK_PATTERN = re.compile(r'^\s*(\d{1,2}):(\d{2})(?::(\d{2}))?')
+
 def decimal_to_hour(decimal_time: Union[float, str]) -> Optional[int]:
     """Convert decimal time to hour.
     
@@ -31,6 +35,61 @@ def decimal_to_hour(decimal_time: Union[float, str]) -> Optional[int]:
     except (ValueError, TypeError):
         return None
 
+def decimal_to_time(decimal_time: float) -> Optional[str]:
+    """Convert decimal time (fraction of a day) to an HH:MM:SS string."""
+    try:
+        if pd.isna(decimal_time):
+            return None
+        total_seconds = int(round(float(decimal_time) * 86400)) % 86400
+        return f"{total_seconds // 3600:02d}:{total_seconds % 3600 // 60:02d}:{total_seconds % 60:02d}"
+    except (ValueError, TypeError):
+        return None
+
+def parse_standard_time(time_str: str) -> Optional[pd.Timestamp]:
+    """Parse HH:MM or HH:MM:SS strings, returning None if neither matches."""
+    for time_format in ('%H:%M:%S', '%H:%M'):
+        try:
+            return pd.to_datetime(time_str.strip(), format=time_format)
+        except (ValueError, AttributeError):
+            continue
+    return None
+
+def parse_hour(value: Union[float, str]) -> Optional[int]:
+    """Extract the hour from a decimal day fraction or an HH:MM[:SS] string."""
+    hour = decimal_to_hour(value)
+    if hour is None and isinstance(value, str):
+        match = _CLOCK_PATTERN.match(value)
+        if match:
+            hour = int(match.group(1)) % 24
+    return hour
+
+def parse_hours(values: pd.Series) -> pd.Series:
+    """Vectorized parse_hour; unparseable values become NaN."""
+    # Order times repeat heavily, so parse each distinct value once
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    hours = np.trunc(pd.to_numeric(uniques, errors='coerce') * 24)
+    hours = hours.where(hours < 24, hours % 24)
+    missing = hours.isna()
+    if missing.any():
+        clock_hours = uniques[missing].astype(str).str.extract(_CLOCK_PATTERN.pattern, expand=False)[0]
+        hours[missing] = pd.to_numeric(clock_hours, errors='coerce') % 24
+    parsed = np.append(hours.to_numpy(dtype=float), np.nan)[codes]
+    return pd.Series(parsed, index=values.index)
+
+def parse_minutes(values: pd.Series) -> pd.Series:
+    """Minutes since midnight from decimal day fractions or HH:MM[:SS] strings; unparseable values become NaN."""
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    minutes = pd.to_numeric(uniques, errors='coerce') * 1440
+    missing = minutes.isna()
+    if missing.any():
+        clock = uniques[missing].astype(str).str.extract(_CLOCK_PATTERN.pattern, expand=False)
+        clock = clock.apply(pd.to_numeric, errors='coerce')
+        minutes[missing] = (clock[0] % 24) * 60 + clock[1] + clock[2].fillna(0) / 60
+    parsed = np.append((minutes % 1440).to_numpy(dtype=float), np.nan)[codes]
+    return pd.Series(parsed, index=values.index)
+
 def combine_date_time(date: pd.Timestamp, decimal_time: Union[float, str]) -> Optional[pd.Timestamp]:
     """Combine date and decimal time into timestamp."""
     try:
@@ -46,4 +105,4 @@ def combine_date_time(date: pd.Timestamp, decimal_time: Union[float, str]) -> Op
             time(hour=hour)
         )
     except Exception:
-        return None
\ No newline at end of file
+        return None
@@ -1,17 +1,93 @@
 import pandas as pd
 import numpy as np
-from typing import List, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import List, Optional, Tuple, Union
+
+def to_hourly_calendar(data: Union[pd.Series, pd.DataFrame],
+                       freq: str = 'H',
+                       fill_value: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, pd.DatetimeIndex]:
+    """Reindex one or many series onto a gap-free calendar.
+    
+    Args:
+        data: Series, or DataFrame with one column per series, indexed by timestamp
+        freq: Calendar frequency
+        fill_value: Value for missing periods; NaN when None
+        
+    Returns:
+        values of shape (n_series, n_periods), observed mask of the same shape
+        and the calendar index
+    """
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    calendar = pd.date_range(frame.index.min(), frame.index.max(), freq=freq)
+    aligned = frame.reindex(calendar)
+    values = aligned.to_numpy(dtype=float).T
+    mask = ~np.isnan(values)
+    if fill_value is not None:
+        values[~mask] = fill_value
+    return values, mask, calendar
+
+def lag_windows(values: np.ndarray, n_lags: int) -> np.ndarray:
+    """Read-only view of shape (..., T - n_lags, n_lags) of lag_1..lag_n for each time t >= n_lags."""
+    return sliding_window_view(values, n_lags, axis=-1)[..., :-1, ::-1]
+
+def rolling_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """Read-only view of shape (..., T - window + 1, window) of windows ending at each time, oldest first."""
+    return sliding_window_view(values, window, axis=-1)
+
+def multi_step_targets(values: np.ndarray, n_lags: int, horizon: int) -> np.ndarray:
+    """Read-only view of shape (..., T - n_lags - horizon + 1, horizon) of the next `horizon` values after each lag window."""
+    return sliding_window_view(values[..., n_lags:], horizon, axis=-1)
+
+def window_valid(mask: np.ndarray, window: int) -> np.ndarray:
+    """Flag windows whose every period is observed, in O(n) via cumulative sums."""
+    missing = np.concatenate(
+        [np.zeros(mask.shape[:-1] + (1,), dtype=np.int64), np.cumsum(~mask, axis=-1)],
+        axis=-1
+    )
+    return (missing[..., window:] - missing[..., :-window]) == 0
+
+def build_lag_matrix(values: np.ndarray,
+                     n_lags: int,
+                     horizon: int = 1,
+                     mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Build lag features and multi-step targets for one or many series without copying.
+    
+    Args:
+        values: Array of shape (T,) or (n_series, T) on a gap-free calendar
+        n_lags: Number of lags per sample
+        horizon: Number of future steps per target
+        mask: Observed flags aligned with values (see to_hourly_calendar)
+        
+    Returns:
+        X view (..., n_samples, n_lags) with lag_1 first, Y view (..., n_samples, horizon)
+        and a boolean array (..., n_samples) marking samples whose lags and targets
+        were all observed
+    """
+    n_samples = values.shape[-1] - n_lags - horizon + 1
+    if n_samples <= 0:
+        raise ValueError(f"Need more than {n_lags + horizon - 1} periods, got {values.shape[-1]}")
+    X = lag_windows(values, n_lags)[..., :n_samples, :]
+    Y = multi_step_targets(values, n_lags, horizon)
+    if mask is None:
+        valid = np.ones(values.shape[:-1] + (n_samples,), dtype=bool)
+    else:
+        valid = window_valid(mask, n_lags + horizon)
+    return X, Y, valid
 
 def create_lag_features(data: pd.DataFrame, 
                        target_col: str,
                        lag_hours: List[int] = [1, 2, 3, 6, 12, 24]) -> pd.DataFrame:
     """Create lag features for time series data."""
-    df = data.copy()
-    
-    for lag in lag_hours:
-        df[f'lag_{lag}h'] = df[target_col].shift(lag)
-    
-    return df
+    max_lag = max(lag_hours)
+    padded = np.concatenate([np.full(max_lag, np.nan), data[target_col].to_numpy(dtype=float)])
+    # Row t holds [v_t, v_t-1, ..., v_t-max_lag]; only the requested lags are gathered
+    windows = sliding_window_view(padded, max_lag + 1)[:, ::-1]
+    lags = pd.DataFrame(
+        windows[:, lag_hours],
+        index=data.index,
+        columns=[f'lag_{lag}h' for lag in lag_hours]
+    )
+    return pd.concat([data.drop(columns=lags.columns, errors='ignore'), lags], axis=1)
 
 def create_rolling_features(data: pd.DataFrame, 
                           target_col: str,
@@ -29,14 +105,11 @@ def prepare_time_series_data(data: pd.DataFrame,
                            target_col: str,
                            sequence_length: int = 24) -> Tuple[np.ndarray, np.ndarray]:
     """Prepare sequences for LSTM model."""
-    values = data[target_col].values
-    X, y = [], []
-    
-    for i in range(len(values) - sequence_length):
-        X.append(values[i:i+sequence_length])
-        y.append(values[i+1:i+sequence_length+1])
+    values = data[target_col].to_numpy()
     
-    return np.array(X), np.array(y)
+    # Read-only views over `values`; y is X shifted one step ahead
+    windows = sliding_window_view(values, sequence_length)
+    return windows[:-1], windows[1:]
 
 def add_cyclical_features(data: pd.DataFrame, 
                          time_col: str) -> pd.DataFrame:
@@ -51,4 +124,51 @@ def add_cyclical_features(data: pd.DataFrame,
     df['day_sin'] = np.sin(2 * np.pi * df[time_col].dt.dayofweek / 7)
     df['day_cos'] = np.cos(2 * np.pi * df[time_col].dt.dayofweek / 7)
     
-    return df
\ No newline at end of file
+    return df
+
+def hourly_demand_profile(keys: Union[np.ndarray, pd.Series],
+                          datetimes: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-key hour-of-day demand mean and std in a single aggregation pass.
+    
+    Equivalent to counting orders per key in hourly bins (zero-filled between
+    each key's first and last order) and then taking mean and std (ddof=1) of
+    those bins per hour of day, without materializing the bins.
+    
+    Returns:
+        Sorted unique keys, and mean and std arrays of shape (n_keys, 24);
+        hours with no bins are NaN
+    """
+    keys = pd.Series(np.asarray(keys), index=datetimes.index)
+    valid = keys.notna() & datetimes.notna()
+    codes, uniques = pd.factorize(keys[valid], sort=True)
+    hour_bins = datetimes[valid].to_numpy(dtype='datetime64[h]').astype(np.int64)
+    n_keys = len(uniques)
+    
+    # Orders per (key, hourly bin), one hash aggregation over all rows
+    bin_counts = pd.Series(1, index=[codes, hour_bins]).groupby(level=[0, 1]).size()
+    key_index = bin_counts.index.get_level_values(0).to_numpy()
+    bin_index = bin_counts.index.get_level_values(1).to_numpy()
+    counts = bin_counts.to_numpy(dtype=float)
+    
+    total = np.zeros((n_keys, 24))
+    total_sq = np.zeros((n_keys, 24))
+    np.add.at(total, (key_index, bin_index % 24), counts)
+    np.add.at(total_sq, (key_index, bin_index % 24), counts * counts)
+    
+    # Number of hourly bins per hour of day within each key's [first, last] span
+    first = np.full(n_keys, np.iinfo(np.int64).max)
+    last = np.full(n_keys, np.iinfo(np.int64).min)
+    np.minimum.at(first, key_index, bin_index)
+    np.maximum.at(last, key_index, bin_index)
+    hours = np.arange(24)
+    n_bins = (
+        np.floor_divide(last[:, None] - hours, 24)
+        - np.floor_divide(first[:, None] - 1 - hours, 24)
+    ).astype(float)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(n_bins > 0, total / n_bins, np.nan)
+        variance = (total_sq - total * total / n_bins) / (n_bins - 1)
+        std = np.where(n_bins > 1, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+    
+    return np.asarray(uniques), mean, std
@@ -1,5 +1,25 @@
 """Input validation utilities."""
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .time_parsers import parse_hours
+
+# API order fields and their types
+ORDER_FIELDS = {
+    'restaurant_lat': float,
+    'restaurant_lng': float,
+    'delivery_lat': float,
+    'delivery_lng': float,
+    'weather': str,
+    'traffic': str,
+    'vehicle_type': str,
+    'order_time': str
+}
+
+COORDINATE_PAIRS = [('restaurant_lat', 'restaurant_lng'), ('delivery_lat', 'delivery_lng')]
+
+# One record per failed check: row position in the batch, field and error code
+VALIDATION_ERROR_DTYPE = np.dtype([('row', np.int64), ('field', 'U16'), ('error', 'U24')])
 
 def validate_coordinates(lat: float, lng: float) -> None:
     """Validate latitude and longitude values."""
@@ -8,20 +28,19 @@ def validate_coordinates(lat: float, lng: float) -> None:
     if not -180 <= lng <= 180:
         raise ValueError(f"Invalid longitude: {lng}")
 
+def validate_coordinate_arrays(lat: np.ndarray, lng: np.ndarray) -> None:
+    """Validate arrays of latitude and longitude values."""
+    lat, lng = np.asarray(lat, dtype=float), np.asarray(lng, dtype=float)
+    bad_lat = ~((lat >= -90) & (lat <= 90))
+    if bad_lat.any():
+        raise ValueError(f"Invalid latitude: {lat[bad_lat][0]}")
+    bad_lng = ~((lng >= -180) & (lng <= 180))
+    if bad_lng.any():
+        raise ValueError(f"Invalid longitude: {lng[bad_lng][0]}")
+
 def validate_order_data(order_data: Dict[str, Any]) -> None:
     """Validate order data contains required fields with correct types."""
-    required_fields = {
-        'restaurant_lat': float,
-        'restaurant_lng': float,
-        'delivery_lat': float,
-        'delivery_lng': float,
-        'weather': str,
-        'traffic': str,
-        'vehicle_type': str,
-        'order_time': str
-    }
-    
-    for field, field_type in required_fields.items():
+    for field, field_type in ORDER_FIELDS.items():
         if field not in order_data:
             raise ValueError(f"Missing required field: {field}")
         if not isinstance(order_data[field], field_type):
@@ -29,4 +48,66 @@ def validate_order_data(order_data: Dict[str, Any]) -> None:
     
     # Validate coordinates
     validate_coordinates(order_data['restaurant_lat'], order_data['restaurant_lng'])
-    validate_coordinates(order_data['delivery_lat'], order_data['delivery_lng'])
\ No newline at end of file
+    validate_coordinates(order_data['delivery_lat'], order_data['delivery_lng'])
+
+def validate_order_batch(orders: pd.DataFrame,
+                         known_categories: Optional[Dict[str, Iterable[str]]] = None
+                         ) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Validate a batch of API orders column by column.
+    
+    Checks missing values and types, coordinate ranges, (0, 0)-style
+    placeholder coordinates, parseable order times and, when
+    ``known_categories`` is given, categorical values seen in training.
+    
+    Returns:
+        The valid rows and a ``VALIDATION_ERROR_DTYPE`` array with one record
+        per failed check, ordered by row
+    """
+    missing_fields = [field for field in ORDER_FIELDS if field not in orders.columns]
+    if missing_fields:
+        raise ValueError(f"Missing required field: {', '.join(missing_fields)}")
+    
+    checks: List[Tuple[str, str, np.ndarray]] = []
+    
+    numeric = {}
+    for field, field_type in ORDER_FIELDS.items():
+        values = orders[field]
+        missing = values.isna().to_numpy()
+        if field_type is float:
+            numeric[field] = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+            checks.append((field, 'missing', missing))
+            checks.append((field, 'invalid_type', np.isnan(numeric[field]) & ~missing))
+        else:
+            codes, uniques = pd.factorize(values)
+            blank = np.append(pd.Series(uniques, dtype=object).astype(str).str.strip().eq('').to_numpy(), False)[codes]
+            checks.append((field, 'missing', missing | blank))
+    
+    for lat_field, lng_field in COORDINATE_PAIRS:
+        lat, lng = numeric[lat_field], numeric[lng_field]
+        checks.append((lat_field, 'invalid_latitude', np.abs(lat) > 90))
+        checks.append((lng_field, 'invalid_longitude', np.abs(lng) > 180))
+        # (0, 0) and near-zero coordinates are placeholders in this dataset
+        checks.append((lat_field, 'zero_coordinates', (np.abs(lat) < 1e-6) | (np.abs(lng) < 1e-6)))
+    
+    hours = parse_hours(orders['order_time'].where(orders['order_time'].notna()))
+    checks.append(('order_time', 'unparseable_time', (hours.isna() & orders['order_time'].notna()).to_numpy()))
+    
+    for field, categories in (known_categories or {}).items():
+        values = orders[field]
+        unknown = ~values.isin(list(categories)).to_numpy() & values.notna().to_numpy()
+        checks.append((field, 'unknown_category', unknown))
+    
+    failed_rows = [np.flatnonzero(mask) for _, _, mask in checks]
+    errors = np.empty(sum(len(rows) for rows in failed_rows), dtype=VALIDATION_ERROR_DTYPE)
+    start = 0
+    for (field, error, _), rows in zip(checks, failed_rows):
+        block = errors[start:start + len(rows)]
+        block['row'] = rows
+        block['field'] = field
+        block['error'] = error
+        start += len(rows)
+    errors = errors[np.argsort(errors['row'], kind='stable')]
+    
+    valid = np.ones(len(orders), dtype=bool)
+    valid[errors['row']] = False
+    return orders[valid], errors
@@ -0,0 +1,43 @@
+"""Shared fixtures."""
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Seasonal SARIMA fits take seconds per series; tests opt in with a small forecaster
+os.environ.setdefault('PEAK_DEMAND_SARIMA', '0')
+
+def make_delivery_data(n_rows: int = 500, seed: int = 0) -> pd.DataFrame:
+    """Synthetic orders shaped like the raw delivery dataset."""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp('2022-02-11') + pd.to_timedelta(rng.integers(0, 30, n_rows), unit='D')
+    restaurant_lat = rng.uniform(12.9, 13.1, n_rows)
+    restaurant_lng = rng.uniform(77.5, 77.7, n_rows)
+    distance_scale = rng.uniform(0.005, 0.1, n_rows)
+    df = pd.DataFrame({
+        'Delivery_person_ID': [f'DRV{i:03d}' for i in rng.integers(0, 40, n_rows)],
+        'Delivery_person_Age': rng.integers(20, 40, n_rows).astype(str),
+        'Delivery_person_Ratings': rng.uniform(3.5, 5.0, n_rows).round(1),
+        'Restaurant_latitude': restaurant_lat,
+        'Restaurant_longitude': restaurant_lng,
+        'Delivery_location_latitude': restaurant_lat + distance_scale,
+        'Delivery_location_longitude': restaurant_lng + distance_scale,
+        'Order_Date': dates.strftime('%d-%m-%Y'),
+        'Time_Orderd': (rng.integers(8 * 60, 23 * 60, n_rows) / (24 * 60)).round(6).astype(str),
+        'Time_Order_picked': (rng.integers(8 * 60, 23 * 60, n_rows) / (24 * 60)).round(6).astype(str),
+        'Weatherconditions': rng.choice(['Sunny', 'Stormy', 'Cloudy', 'Fog', 'Windy', 'Sandstorms'], n_rows),
+        'Road_traffic_density': rng.choice(['Low', 'Medium', 'High', 'Jam'], n_rows),
+        'Vehicle_condition': rng.integers(0, 3, n_rows),
+        'Type_of_order': rng.choice(['Snack', 'Meal', 'Drinks', 'Buffet'], n_rows),
+        'Type_of_vehicle': rng.choice(['motorcycle', 'scooter', 'electric_scooter'], n_rows),
+        'multiple_deliveries': rng.integers(0, 3, n_rows),
+        'Festival': rng.choice(['No', 'Yes'], n_rows, p=[0.95, 0.05]),
+        'City': rng.choice(['Urban', 'Metropolitian', 'Semi-Urban'], n_rows)
+    })
+    traffic_delay = df['Road_traffic_density'].map({'Low': 0, 'Medium': 5, 'High': 10, 'Jam': 15})
+    df['time_taken(min)'] = (15 + distance_scale * 150 + traffic_delay + rng.normal(0, 3, n_rows)).round()
+    return df
+
+@pytest.fixture
+def delivery_data():
+    return make_delivery_data()
@@ -0,0 +1,79 @@
+"""Tests for chunked file scoring."""
+import json
+import numpy as np
+import pytest
+from src.config.serving_config import SERVING_CONFIG
+from src.prediction.batch_scoring import OrderChunker, score_stream
+from src.prediction.delivery_pipeline import DeliveryPipeline
+
+ORDERS = [
+    {'restaurant_lat': 12.95, 'restaurant_lng': 77.55, 'delivery_lat': 12.99, 'delivery_lng': 77.61,
+     'weather': 'Fog', 'traffic': 'Jam', 'vehicle_type': 'scooter', 'order_time': '18:30'},
+    {'restaurant_lat': 13.02, 'restaurant_lng': 77.60, 'delivery_lat': 13.05, 'delivery_lng': 77.63,
+     'weather': 'Sunny', 'traffic': 'Low', 'vehicle_type': 'motorcycle', 'order_time': '09:05'},
+    {'restaurant_lat': 95.0, 'restaurant_lng': 77.60, 'delivery_lat': 13.05, 'delivery_lng': 77.63,
+     'weather': 'Hail', 'traffic': 'Low', 'vehicle_type': 'motorcycle', 'order_time': '09:05'}
+]
+
+@pytest.fixture
+def pipeline(delivery_data):
+    pipeline = DeliveryPipeline()
+    pipeline.model.model.set_params(n_estimators=20)
+    pipeline.train(delivery_data)
+    return pipeline
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setitem(SERVING_CONFIG, 'scoring_first_chunk_rows', 1)
+    monkeypatch.setitem(SERVING_CONFIG, 'scoring_chunk_rows', 2)
+
+def to_csv(orders):
+    columns = list(orders[0])
+    lines = [','.join(columns)] + [','.join(str(order[c]) for c in columns) for order in orders]
+    return ('\n'.join(lines) + '\n').encode()
+
+def score(pipeline, body, fmt, block_bytes=7):
+    blocks = [body[i:i + block_bytes] for i in range(0, len(body), block_bytes)]
+    return [json.loads(line) for output in score_stream(pipeline, blocks, fmt) for line in output.splitlines()]
+
+def test_chunker_splits_lines_across_blocks(small_chunks):
+    chunker = OrderChunker('csv')
+    chunks = chunker.feed(b'a,b\n1,') + chunker.feed(b'2\n3,4\n5,6') + chunker.close()
+    assert chunker.header == b'a,b\n'
+    assert chunks == [([b'1,2\n'], 0), ([b'3,4\n', b'5,6\n'], 1)]
+
+@pytest.mark.parametrize('fmt', ['csv', 'ndjson'])
+def test_streamed_scores_match_single_predictions(pipeline, small_chunks, fmt):
+    orders = ORDERS * 2
+    if fmt == 'csv':
+        body = to_csv(orders)
+    else:
+        body = b''.join(json.dumps(order).encode() + b'\n' for order in orders)
+
+    results = score(pipeline, body, fmt)
+
+    assert [r['row'] for r in results] == list(range(len(orders)))
+    for result, order in zip(results, orders):
+        if order is ORDERS[2]:
+            assert {(e['field'], e['error']) for e in result['errors']} == {
+                ('restaurant_lat', 'invalid_latitude'), ('weather', 'unknown_category')
+            }
+        else:
+            assert np.isclose(result['estimated_time'], pipeline.predict(dict(order)))
+
+@pytest.mark.parametrize('fmt', ['csv', 'ndjson'])
+def test_malformed_lines_are_reported_per_row(pipeline, small_chunks, fmt):
+    if fmt == 'csv':
+        lines = to_csv(ORDERS[:2]).splitlines(keepends=True)
+        body = b''.join([lines[0], lines[1], b'1,2,3\n', lines[2], b'"unterminated,\n'])
+    else:
+        good = [json.dumps(order).encode() + b'\n' for order in ORDERS[:2]]
+        body = b''.join([good[0], b'{"restaurant_lat": \n', good[1], b'[1, 2]\n'])
+
+    results = score(pipeline, body, fmt)
+
+    assert [r['row'] for r in results] == [0, 1, 2, 3]
+    unparseable = [{'field': None, 'error': 'unparseable_row'}]
+    assert results[1]['errors'] == unparseable and results[3]['errors'] == unparseable
+    assert np.isclose(results[0]['estimated_time'], pipeline.predict(dict(ORDERS[0])))
+    assert np.isclose(results[2]['estimated_time'], pipeline.predict(dict(ORDERS[1])))
@@ -0,0 +1,74 @@
+"""Tests for the cheap-then-full model cascade."""
+import numpy as np
+import pytest
+from src.data_processor import DataProcessor
+from src.config.model_config import CASCADE_CONFIG
+from src.models.cascade_model import CascadeModel
+from src.prediction.delivery_pipeline import DeliveryPipeline
+from src.utils.instrumentation import registry
+
+@pytest.mark.parametrize('cheap_model', ['lookuptable', 'decisiontree'])
+def test_threshold_keeps_mae_within_budget(delivery_data, cheap_model):
+    processed = DataProcessor().preprocess(delivery_data)
+    model = CascadeModel(cheap_model=cheap_model)
+    model.train(processed)
+
+    full_mae = model.tuning[0]['mae']  # Nothing kept on the cheap stage
+    chosen = [row for row in model.tuning if row['threshold'] == model.threshold][0]
+    assert chosen['mae'] <= full_mae * (1 + model.config['max_mae_increase'])
+    # No larger candidate threshold meets the budget
+    assert all(row['mae'] > full_mae * (1 + model.config['max_mae_increase'])
+               for row in model.tuning if row['threshold'] > model.threshold)
+
+def test_escalates_only_uncertain_orders(delivery_data):
+    processed = DataProcessor().preprocess(delivery_data)
+    model = CascadeModel()
+    model.train(processed)
+    X = model._prepare_features(processed)
+
+    model.threshold = np.inf
+    cheap = model.cheap.predict(model._cheap_input(X))
+    np.testing.assert_allclose(model.predict_batch(X), cheap)
+
+    model.threshold = -np.inf
+    np.testing.assert_allclose(model.predict_batch(X), model.full.predict_batch(X))
+
+    registry.reset()
+    _, spread = model.cheap.predict_with_uncertainty(model._cheap_input(X))
+    model.threshold = float(np.median(spread))
+    model.predict_batch(X)
+    assert registry.get_counter('cascade_predictions_total', {'stage': 'cheap'}) == (spread <= model.threshold).sum()
+    assert registry.get_counter('cascade_predictions_total', {'stage': 'full'}) == (spread > model.threshold).sum()
+
+def test_pipeline_predicts_with_cascade(delivery_data):
+    pipeline = DeliveryPipeline(model=CascadeModel())
+    pipeline.train(delivery_data)
+    order = {
+        'restaurant_lat': 12.95, 'restaurant_lng': 77.6, 'delivery_lat': 12.99, 'delivery_lng': 77.64,
+        'weather': 'Sunny', 'traffic': 'Jam', 'vehicle_type': 'scooter', 'order_time': '0.75'
+    }
+    assert np.isfinite(pipeline.predict(order))
+
+def test_enabled_cascade_is_trained_and_served_by_the_pipeline(delivery_data, monkeypatch):
+    import run
+    monkeypatch.setitem(CASCADE_CONFIG, 'enabled', True)
+    pipeline = DeliveryPipeline()
+    assert isinstance(pipeline.model, CascadeModel)
+    pipeline.model.full.model.set_params(n_estimators=40)
+    pipeline.train(delivery_data)
+
+    registry.reset()
+    # Single orders, the ETA matrix and file scoring
+    run.warmup_delivery(pipeline)
+    served = sum(registry.get_counter('cascade_predictions_total', {'stage': stage}) for stage in ('cheap', 'full'))
+    assert served > 0
+
+    order = {'restaurant_lat': 12.95, 'restaurant_lng': 77.55, 'delivery_lat': 12.99, 'delivery_lng': 77.61,
+             'weather': 'Fog', 'traffic': 'Jam', 'vehicle_type': 'scooter', 'order_time': '18:30'}
+    context = pipeline.processor.process_single_order(order)
+    # A budget nothing fits gets the smallest recorded tree count
+    num_iteration = run.serving_iterations(pipeline.model, '0')
+    assert num_iteration is not None and num_iteration < pipeline.model.full.n_iterations
+    pipeline.model.threshold = -np.inf  # Escalate, so the truncated full model answers
+    assert pipeline.model.predict(context, num_iteration=num_iteration) == pytest.approx(
+        pipeline.model.full.predict(context, num_iteration=num_iteration))
@@ -0,0 +1,54 @@
+"""Tests for the driver profile store."""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_processor import DataProcessor, ORDER_DEFAULTS
+from src.models.driver_profiles import DriverProfileStore
+
+def orders(ids, dates, ratings, times, ages=None):
+    return pd.DataFrame({
+        'Delivery_person_ID': ids,
+        'Order_Date': dates,
+        'Delivery_person_Age': ages or ['30'] * len(ids),
+        'Delivery_person_Ratings': ratings,
+        'Vehicle_condition': [1] * len(ids),
+        'time_taken(min)': times
+    })
+
+def test_refresh_keeps_latest_values_and_running_averages():
+    store = DriverProfileStore()
+    assert store.refresh(orders(['A', 'B', 'A'], ['02-03-2022', '01-03-2022', '01-03-2022'],
+                                [4.8, 4.0, 4.2], [20, 30, 40])) == 2
+    # Older orders and missing values do not replace the latest rating
+    assert store.refresh(orders(['A', 'C', 'B'], ['01-02-2022', '05-03-2022', '06-03-2022'],
+                                [3.0, 4.9, np.nan], [30, 25, 50])) == 1
+
+    a, b = store.lookup('A'), store.lookup(' B ')
+    assert a['Delivery_person_Ratings'] == 4.8 and a['deliveries'] == 3 and a['avg_time'] == 30
+    assert b['Delivery_person_Ratings'] == 4.0 and b['avg_time'] == 40
+    assert store.lookup('C')['deliveries'] == 1
+    assert store.lookup('missing') is None
+    rows = store.rows(['C', 'X', None, np.nan, 'A'])
+    np.testing.assert_array_equal(rows, [store.index['C'], -1, -1, -1, store.index['A']])
+    assert store.index['C'] == 2
+
+def test_processor_uses_driver_profile(delivery_data):
+    processor = DataProcessor()
+    processor.preprocess(delivery_data)
+    driver = delivery_data['Delivery_person_ID'].iloc[0]
+    latest = processor.driver_profiles.lookup(driver)
+
+    order = {'restaurant_lat': 12.95, 'restaurant_lng': 77.55, 'delivery_lat': 12.99, 'delivery_lng': 77.61,
+             'weather': 'Fog', 'traffic': 'Jam', 'vehicle_type': 'scooter', 'order_time': '18:30'}
+    default = processor.process_single_order(order)
+    profiled = processor.process_single_order({**order, 'driver_id': driver})
+    unknown = processor.process_single_order({**order, 'driver_id': 'nobody'})
+
+    assert default['Delivery_person_Ratings'] == ORDER_DEFAULTS['Delivery_person_Ratings']
+    assert profiled['Delivery_person_Ratings'] == pytest.approx(latest['Delivery_person_Ratings'])
+    assert unknown == default
+
+    batch = processor.process_orders(pd.DataFrame([{**order, 'driver_id': driver}, {**order, 'driver_id': None}]))
+    assert batch['Delivery_person_Ratings'].tolist() == pytest.approx(
+        [latest['Delivery_person_Ratings'], ORDER_DEFAULTS['Delivery_person_Ratings']]
+    )
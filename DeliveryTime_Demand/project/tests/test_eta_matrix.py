@@ -0,0 +1,60 @@
+"""Tests for the many-to-many ETA matrix."""
+import numpy as np
+import pytest
+from src.data_processor import DataProcessor
+from src.models.delivery_time_model import DeliveryTimeModel
+from src.prediction.eta_matrix import eta_matrix
+from src.utils.distance import calculate_haversine_distance, haversine_matrix
+
+@pytest.fixture
+def trained(delivery_data):
+    processor = DataProcessor()
+    model = DeliveryTimeModel()
+    model.model.set_params(n_estimators=50)
+    model.train(processor.preprocess(delivery_data))
+    return processor, model
+
+def order(origin, destination):
+    return {
+        'restaurant_lat': origin[0], 'restaurant_lng': origin[1],
+        'delivery_lat': destination[0], 'delivery_lng': destination[1],
+        'weather': 'Fog', 'traffic': 'Jam', 'vehicle_type': 'scooter', 'order_time': '18:30'
+    }
+
+def test_haversine_matrix_matches_pairwise():
+    rng = np.random.default_rng(0)
+    a, b = rng.uniform(12, 13, (5, 2)), rng.uniform(77, 78, (7, 2))
+    expected = [[calculate_haversine_distance(*p, *q) for q in b] for p in a]
+    np.testing.assert_allclose(haversine_matrix(a[:, 0], a[:, 1], b[:, 0], b[:, 1]), expected)
+
+def test_tiled_matrix_matches_single_predictions(trained):
+    processor, model = trained
+    rng = np.random.default_rng(1)
+    origins = np.column_stack([rng.uniform(12.9, 13.1, 5), rng.uniform(77.5, 77.7, 5)])
+    destinations = np.column_stack([rng.uniform(12.9, 13.1, 7), rng.uniform(77.5, 77.7, 7)])
+
+    context = processor.process_single_order(order(origins[0], destinations[0]))
+    matrix = eta_matrix(model, context, origins, destinations, tile_rows=2, tile_cols=3)
+
+    expected = [
+        [model.predict(processor.process_single_order(order(o, d))) for d in destinations]
+        for o in origins
+    ]
+    assert matrix.shape == (5, 7)
+    np.testing.assert_allclose(matrix, expected)
+
+def test_origin_features_follow_each_origin(trained, delivery_data):
+    processor, model = trained
+    # Known restaurants, so each origin has its own cluster features
+    origins = delivery_data[['Restaurant_latitude', 'Restaurant_longitude']].to_numpy()[:4]
+    destinations = origins[::-1] + 0.01
+
+    context = processor.process_single_order(order(origins[0], destinations[0]))
+    features = processor.restaurant_index.features(origins[:, 0], origins[:, 1], np.full(4, context['hour']))
+    matrix = eta_matrix(model, context, origins, destinations, tile_rows=3, origin_features=features)
+
+    expected = [
+        [model.predict(processor.process_single_order(order(o, d))) for d in destinations]
+        for o in origins
+    ]
+    np.testing.assert_allclose(matrix, expected)
@@ -0,0 +1,53 @@
+"""Tests for the declarative feature graph."""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_processor import DataProcessor
+from src.models.features import FeatureGraph, FeatureSpec, build_delivery_feature_graph
+
+def _spec(name, inputs, outputs):
+    return FeatureSpec(name, inputs, outputs, lambda cols, state: {out: 1 for out in outputs})
+
+def test_features_are_ordered_by_dependency():
+    graph = FeatureGraph([
+        _spec('c', ['b'], ['c']),
+        _spec('b', ['a'], ['b']),
+        _spec('a', ['raw'], ['a'])
+    ])
+    assert [spec.name for spec in graph.plan(['raw'])] == ['a', 'b', 'c']
+
+def test_cycles_and_missing_inputs_are_rejected():
+    cyclic = FeatureGraph([_spec('x', ['y'], ['x']), _spec('y', ['x'], ['y'])])
+    with pytest.raises(ValueError, match="Cyclic"):
+        cyclic.plan(['raw'])
+    with pytest.raises(ValueError, match="Missing columns: raw"):
+        FeatureGraph([_spec('a', ['raw'], ['a'])]).plan(['other'])
+
+def test_row_mode_matches_batch_mode(delivery_data):
+    graph = build_delivery_feature_graph()
+    batch = graph.fit_transform(delivery_data)
+    for i in [0, 7, 42]:
+        row = graph.transform_row(delivery_data.iloc[i].to_dict())
+        for column in graph.output_columns:
+            assert row[column] == pytest.approx(batch[column].iloc[i]), column
+
+def test_unseen_categories_encode_to_minus_one(delivery_data):
+    graph = build_delivery_feature_graph()
+    graph.fit_transform(delivery_data)
+    row = delivery_data.iloc[0].to_dict()
+    row['Weatherconditions'] = 'Hail'
+    assert graph.transform_row(row)['Weatherconditions_encoded'] == -1
+
+def test_processor_serves_with_training_encoders(delivery_data):
+    processor = DataProcessor()
+    processed = processor.preprocess(delivery_data)
+    order = processor.process_single_order({
+        'restaurant_lat': 12.95, 'restaurant_lng': 77.6,
+        'delivery_lat': 12.97, 'delivery_lng': 77.62,
+        'weather': 'Sunny', 'traffic': 'Jam',
+        'vehicle_type': 'scooter', 'order_time': '21:55'
+    })
+    assert order['hour'] == 21
+    jam_code = processed.loc[processed['Road_traffic_density'] == 'Jam', 'Road_traffic_density_encoded'].iloc[0]
+    assert order['Road_traffic_density_encoded'] == jam_code
+    assert np.isfinite(order['distance'])
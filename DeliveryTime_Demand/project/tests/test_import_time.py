@@ -0,0 +1,50 @@
+"""Import-time budget for the serving path."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Generous wall-clock budget; the strict check is which libraries get loaded
+IMPORT_BUDGET_SECONDS = 5.0
+
+TRAINING_ONLY_MODULES = ['xgboost', 'catboost', 'statsmodels', 'sklearn.ensemble']
+
+SERVING_IMPORTS = [
+    'src.data_processor',
+    'src.models.delivery_time_model',
+    'src.models.peak_demand_model',
+    'src.models.model_factory',
+    'src.models.model_evaluator'
+]
+
+def _import_in_subprocess(modules, probe):
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        + "".join(f"import {module}\n" for module in modules)
+        + "elapsed = time.perf_counter() - start\n"
+        + probe
+        + f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {TRAINING_ONLY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def test_serving_imports_skip_training_backends():
+    result = _import_in_subprocess(SERVING_IMPORTS, '')
+    assert result['loaded'] == []
+    assert result['elapsed'] < IMPORT_BUDGET_SECONDS
+
+def test_factory_imports_backend_on_first_use():
+    probe = (
+        "from src.models.model_factory import ModelFactory\n"
+        "assert not ModelFactory.is_loaded('decisiontree')\n"
+        "ModelFactory.get_model('decisiontree')\n"
+        "assert ModelFactory.is_loaded('decisiontree')\n"
+    )
+    result = _import_in_subprocess(['src.models.model_factory'], probe)
+    assert result['loaded'] == []
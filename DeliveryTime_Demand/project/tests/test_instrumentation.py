@@ -0,0 +1,71 @@
+"""Tests for stage timing and metrics export."""
+import pytest
+from src.utils import instrumentation
+from src.utils.instrumentation import MetricsRegistry, registry, stage_timer, timed
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    enabled = registry.enabled
+    registry.reset()
+    yield
+    registry.enabled = enabled
+    registry.reset()
+
+def test_histogram_renders_cumulative_buckets():
+    metrics = MetricsRegistry(namespace='test')
+    for value in [0.5, 1.5, 3.0]:
+        metrics.observe('latency_seconds', value, {'stage': 'a'}, buckets=[1.0, 2.0])
+    text = metrics.render_prometheus()
+    assert '# TYPE test_latency_seconds histogram' in text
+    assert 'test_latency_seconds_bucket{stage="a",le="1"} 1' in text
+    assert 'test_latency_seconds_bucket{stage="a",le="2"} 2' in text
+    assert 'test_latency_seconds_bucket{stage="a",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{stage="a"} 3' in text
+
+def test_timers_record_stages_when_enabled():
+    registry.enabled = True
+
+    @timed('unit.decorated')
+    def work():
+        return 42
+
+    assert work() == 42
+    with stage_timer('unit.block'):
+        pass
+    instrumentation.record_cache('unit', hit=True)
+
+    assert registry.get_histogram('stage_duration_seconds', {'stage': 'unit.decorated'}).count == 1
+    assert registry.get_histogram('stage_duration_seconds', {'stage': 'unit.block'}).count == 1
+    assert registry.get_counter('cache_requests_total', {'cache': 'unit', 'result': 'hit'}) == 1
+
+def test_timers_are_no_ops_when_disabled():
+    registry.enabled = False
+
+    @timed('unit.disabled')
+    def work():
+        return 'ok'
+
+    assert work() == 'ok'
+    with stage_timer('unit.disabled_block'):
+        pass
+    assert registry.render_prometheus() == "\n"
+
+def test_request_metrics_use_route_templates():
+    import asyncio
+    import httpx
+    import run
+
+    async def send():
+        transport = httpx.ASGITransport(app=run.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            await client.get('/nope/x1')
+            await client.get('/nope/x2')
+            await client.post('/admin/models/foo/reload')
+
+    registry.enabled = True
+    asyncio.run(send())
+    labels = {'method': 'GET', 'path': 'unmatched', 'status': '404'}
+    assert registry.get_counter('http_requests_total', labels) == 2
+    labels = {'method': 'POST', 'path': '/admin/models/{artifact}/reload', 'status': '404'}
+    assert registry.get_counter('http_requests_total', labels) == 1
+    assert '/nope/x1' not in registry.render_prometheus()
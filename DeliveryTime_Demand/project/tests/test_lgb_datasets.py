@@ -0,0 +1,60 @@
+"""Tests for persisted LightGBM Datasets."""
+import pickle
+import lightgbm as lgb
+import numpy as np
+import pytest
+from src.config.model_config import LGB_DATASET_CONFIG
+from src.data_processor import DataProcessor
+from src.models import lgb_datasets
+from src.models.delivery_time_model import DeliveryTimeModel
+from src.models.lgb_datasets import train_cached
+from src.utils.matrix_cache import build_training_matrices
+
+@pytest.fixture
+def split(delivery_data):
+    return build_training_matrices(DataProcessor().preprocess(delivery_data)).split()
+
+@pytest.fixture
+def dataset_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(lgb_datasets, 'LGB_DATASET_DIR', tmp_path)
+    return tmp_path
+
+def regressor():
+    return lgb.LGBMRegressor(n_estimators=30, subsample=0.8, subsample_freq=5,
+                             random_state=42, verbose=-1, force_row_wise=True)
+
+def test_cached_training_matches_fit_and_reuses_the_binary(split, dataset_dir):
+    X_train, X_test, y_train, y_test = split
+    fitted = regressor().fit(X_train, y_train)
+
+    first = train_cached(regressor(), X_train, y_train)
+    files = sorted(dataset_dir.iterdir())
+    second = train_cached(regressor(), X_train, y_train)
+
+    assert len(files) == 1 and sorted(dataset_dir.iterdir()) == files
+    np.testing.assert_allclose(first.predict(X_test), fitted.predict(X_test))
+    np.testing.assert_allclose(second.predict(X_test), fitted.predict(X_test))
+
+def test_validation_dataset_uses_training_bins(split, dataset_dir):
+    X_train, X_test, y_train, y_test = split
+    callbacks = [lgb.early_stopping(5, verbose=False)]
+    first = train_cached(regressor(), X_train, y_train, X_test, y_test, callbacks=callbacks)
+    second = train_cached(regressor(), X_train, y_train, X_test, y_test, callbacks=callbacks)
+    assert len(list(dataset_dir.iterdir())) == 2
+    assert first.best_iteration == second.best_iteration > 0
+
+def test_delivery_model_trains_on_cached_dataset(delivery_data, dataset_dir, monkeypatch):
+    processed = DataProcessor().preprocess(delivery_data)
+    plain = DeliveryTimeModel()
+    plain.model.set_params(n_estimators=30)
+    plain.train(processed)
+
+    monkeypatch.setitem(LGB_DATASET_CONFIG, 'enabled', True)
+    cached = DeliveryTimeModel()
+    cached.model.set_params(n_estimators=30)
+    cached.train(processed)
+    restored = pickle.loads(pickle.dumps(cached))
+
+    X = cached._prepare_features(processed)
+    assert cached.booster is not None
+    np.testing.assert_allclose(restored.predict_batch(X), plain.predict_batch(X))
@@ -0,0 +1,36 @@
+"""Tests for the lookup table baseline."""
+import numpy as np
+import pandas as pd
+from src.data_processor import DataProcessor
+from src.models.model_factory import ModelFactory
+from src.models.models.lookup_table_model import group_quantiles
+
+def test_group_quantiles_match_numpy():
+    rng = np.random.default_rng(0)
+    cells = rng.integers(0, 6, 200)
+    values = rng.normal(30, 5, 200)
+    counts, stats = group_quantiles(cells, values, 8, [0.1, 0.5, 0.9])
+    for cell in range(8):
+        assert counts[cell] == (cells == cell).sum()
+        if counts[cell]:
+            np.testing.assert_allclose(stats[cell], np.quantile(values[cells == cell], [0.1, 0.5, 0.9]))
+        else:
+            assert np.isnan(stats[cell]).all()
+
+def test_lookup_table_backs_off_and_predicts(delivery_data):
+    processed = DataProcessor().preprocess(delivery_data)
+    model = ModelFactory.get_model('lookuptable')
+    model.train(processed, processed['time_taken(min)'])
+
+    predictions = model.predict(processed)
+    assert not np.isnan(predictions).any()
+    # 500 orders cannot fill every fine cell, so most back off to coarser keys
+    assert (model.backoff_depth < len(model.keys)).any()
+
+    # Single-row path agrees with batch indexing
+    rows = processed.head(20).to_dict('records')
+    np.testing.assert_allclose([model.predict_row(row) for row in rows], predictions[:20])
+
+    # Unseen categories fall back instead of failing
+    unseen = processed.head(1).assign(Weatherconditions_encoded=-1, City_encoded=99)
+    assert not np.isnan(model.predict(unseen)).any()
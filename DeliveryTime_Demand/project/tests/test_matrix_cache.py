@@ -0,0 +1,43 @@
+"""Tests for the memory-mapped training matrix cache."""
+import numpy as np
+import pytest
+from sklearn.model_selection import train_test_split
+from src.data_processor import DataProcessor
+from src.models.model_factory import ModelFactory
+from src.utils.matrix_cache import load_training_matrices, select_feature_columns
+
+@pytest.fixture
+def processed(delivery_data):
+    return DataProcessor().preprocess(delivery_data)
+
+def test_cached_matrices_are_mapped_and_match_the_split(processed, tmp_path):
+    first = load_training_matrices(processed, cache_dir=tmp_path)
+    second = load_training_matrices(processed, cache_dir=tmp_path)
+    assert len(list(tmp_path.iterdir())) == 1
+    assert isinstance(second.X, np.memmap) and second.X.dtype == np.float32
+
+    columns = select_feature_columns(processed)
+    X_train, X_test, y_train, y_test = train_test_split(
+        processed[columns], processed['time_taken(min)'], test_size=0.2, random_state=42
+    )
+    split = second.split()
+    np.testing.assert_allclose(split[0].to_numpy(), X_train.to_numpy(dtype=np.float32))
+    np.testing.assert_allclose(split[3].to_numpy(), y_test.to_numpy(dtype=np.float32))
+    np.testing.assert_array_equal(first.X, second.X)
+    # Train and test frames are views of the mapped file
+    assert np.shares_memory(split[0].to_numpy(), second.X)
+    assert np.shares_memory(split[1].to_numpy(), second.X)
+
+def test_changed_data_gets_a_new_entry(processed, tmp_path):
+    load_training_matrices(processed, cache_dir=tmp_path)
+    changed = processed.copy()
+    changed.loc[changed.index[0], 'time_taken(min)'] += 1
+    load_training_matrices(changed, cache_dir=tmp_path)
+    load_training_matrices(processed, test_size=0.3, cache_dir=tmp_path)
+    assert len(list(tmp_path.iterdir())) == 3
+
+def test_models_train_on_cached_split(processed, tmp_path):
+    X_train, X_test, y_train, y_test = load_training_matrices(processed, cache_dir=tmp_path).split()
+    model = ModelFactory.get_model('lookuptable')
+    model.train(X_train, y_train)
+    assert np.isfinite(model.predict(X_test)).all()
@@ -0,0 +1,49 @@
+"""Tests for the per-stage memory profiler."""
+import numpy as np
+import pandas as pd
+from src.data_processor import DataProcessor
+from src.models.peak_demand_model import PeakDemandModel
+from src.utils import instrumentation
+from src.utils.instrumentation import registry, stage_timer
+from src.utils.memory_profiler import MemoryProfiler, compare_reports, load_report, profile_memory
+
+def test_nested_stages_record_allocations(monkeypatch):
+    # Profiling works with metrics turned off
+    monkeypatch.setattr(registry, 'enabled', False)
+    profiler = MemoryProfiler().start()
+    try:
+        with stage_timer('outer'):
+            kept = np.ones(2_000_000)  # 16 MB held after the stage
+            with stage_timer('inner'):
+                temporary = np.ones(4_000_000)  # 32 MB freed inside
+                del temporary
+    finally:
+        profiler.stop()
+    assert instrumentation._stage_listener is None
+
+    report = profiler.report().set_index('stage')
+    assert list(report.index) == ['inner', 'outer']
+    assert report.loc['inner', 'depth'] == 1 and report.loc['outer', 'depth'] == 0
+    assert 30 < report.loc['inner', 'traced_peak_mb'] < 34
+    assert abs(report.loc['inner', 'traced_delta_mb']) < 1
+    assert 15 < report.loc['outer', 'traced_delta_mb'] < 17
+    # The outer peak includes the inner stage's temporary
+    assert report.loc['outer', 'traced_peak_mb'] > 45
+    del kept
+
+def test_training_report_and_baseline_comparison(tmp_path, delivery_data):
+    path = tmp_path / 'memory.json'
+    with profile_memory(path):
+        processed = DataProcessor().preprocess(delivery_data)
+        PeakDemandModel().train(processed)
+
+    report = load_report(path)
+    stages = set(report['stage'])
+    assert {'preprocess.feature_graph', 'peak_demand.train'} <= stages
+    # One stage per feature graph step
+    assert any(stage.startswith('features.') for stage in stages)
+
+    grown = report.assign(traced_peak_mb=report['traced_peak_mb'] * 2 + 5)
+    comparison = compare_reports(report, grown).set_index('stage')
+    assert comparison['regression'].all()
+    assert not compare_reports(report, report)['regression'].any()
@@ -0,0 +1,71 @@
+"""Tests for hot model reloading."""
+import os
+import stat
+import threading
+from src.models.model_registry import ModelRegistry
+from src.models.model_reloader import ModelReloader, ModelSlot
+from src.prediction.delivery_pipeline import DeliveryPipeline
+
+ORDER = {
+    'restaurant_lat': 12.97, 'restaurant_lng': 77.59,
+    'delivery_lat': 12.99, 'delivery_lng': 77.61,
+    'weather': 'Sunny', 'traffic': 'Jam', 'vehicle_type': 'scooter', 'order_time': '19:00'
+}
+
+def test_reload_swaps_only_after_warmup(tmp_path):
+    started = threading.Event()
+    release = threading.Event()
+
+    def warmup(model):
+        started.set()
+        release.wait(5)
+
+    slot = ModelSlot('demo', {'version': 0}, warmup)
+    reloader = ModelReloader([slot], model_dir=tmp_path)
+    assert reloader.check() == []
+
+    ModelRegistry.save_model({'version': 1}, 'demo', tmp_path)
+    in_flight = reloader['demo']
+    worker = threading.Thread(target=reloader.check)
+    worker.start()
+    assert started.wait(5)
+    # Still warming up: requests keep getting the old model
+    assert reloader['demo'] == {'version': 0}
+    release.set()
+    worker.join()
+
+    assert reloader['demo'] == {'version': 1}
+    assert in_flight == {'version': 0}
+    assert reloader.check() == []
+
+def test_broken_artifact_keeps_serving_old_model(tmp_path):
+    slot = ModelSlot('demo', {'version': 0})
+    reloader = ModelReloader([slot], model_dir=tmp_path)
+    (tmp_path / 'demo.pkl').write_bytes(b'not a pickle')
+
+    assert reloader.check() == []
+    assert reloader['demo'] == {'version': 0}
+    assert slot.last_error
+    # The same broken version is not retried on every poll
+    assert reloader.check() == []
+
+def test_delivery_pipeline_round_trip(tmp_path, delivery_data):
+    pipeline = DeliveryPipeline()
+    pipeline.model.model.set_params(n_estimators=20)
+    pipeline.train(delivery_data)
+    ModelRegistry.save_model(pipeline, 'delivery_pipeline', tmp_path)
+
+    reloader = ModelReloader(
+        [ModelSlot('delivery_pipeline', DeliveryPipeline(), lambda p: p.predict(dict(ORDER)))],
+        model_dir=tmp_path
+    )
+    assert reloader.check() == ['delivery_pipeline']
+    assert reloader['delivery_pipeline'].predict(dict(ORDER)) == pipeline.predict(dict(ORDER))
+
+def test_saved_artifacts_honour_umask(tmp_path):
+    old = os.umask(0o022)
+    try:
+        ModelRegistry.save_model({'version': 1}, 'demo', tmp_path)
+    finally:
+        os.umask(old)
+    assert stat.S_IMODE((tmp_path / 'demo.pkl').stat().st_mode) == 0o644
@@ -0,0 +1,34 @@
+"""Tests for partitioned parallel preprocessing."""
+import pandas as pd
+import pytest
+from src.config.model_config import PREPROCESSING_CONFIG
+from src.data_processor import DataProcessor
+from src.models.features import build_delivery_feature_graph
+from src.models.features.parallel import partition_bounds
+
+@pytest.fixture
+def small_partitions(monkeypatch):
+    monkeypatch.setitem(PREPROCESSING_CONFIG, 'min_parallel_rows', 0)
+    monkeypatch.setitem(PREPROCESSING_CONFIG, 'partition_rows', 128)
+
+def test_partition_bounds_cover_all_rows():
+    assert partition_bounds(10, 4) == [(0, 4), (4, 8), (8, 10)]
+    assert partition_bounds(0, 4) == []
+
+def test_fit_learns_the_same_state_as_fit_transform(delivery_data):
+    fitted = build_delivery_feature_graph().fit(delivery_data)
+    reference = build_delivery_feature_graph()
+    reference.fit_transform(delivery_data)
+    assert fitted.state.keys() == reference.state.keys()
+    assert all(fitted.state[name] == reference.state[name] for name in reference.state)
+
+def test_parallel_preprocess_matches_serial(delivery_data, small_partitions):
+    serial = DataProcessor().preprocess(delivery_data, workers=1)
+    processor = DataProcessor()
+    parallel = processor.preprocess(delivery_data, workers=2)
+    pd.testing.assert_frame_equal(parallel, serial)
+
+    new_orders = delivery_data.sample(300, random_state=1)
+    pd.testing.assert_frame_equal(
+        processor.transform(new_orders, workers=2), processor.transform(new_orders, workers=1)
+    )
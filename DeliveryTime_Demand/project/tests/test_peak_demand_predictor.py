@@ -0,0 +1,44 @@
+"""Tests for batched recursive demand forecasting."""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_processor import DataProcessor
+from src.peak_demand_predictor import PeakDemandPredictor, N_LAGS
+
+class CountingModel:
+    """Predicts lag_1 + 1 and counts predict calls."""
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, X):
+        self.calls += 1
+        return X[:, 3] + 1
+
+def test_forecast_feeds_predictions_back_as_lags():
+    predictor = PeakDemandPredictor()
+    predictor.model = CountingModel()
+    history = np.vstack([np.arange(N_LAGS), np.full(N_LAGS, 10.0)])
+    forecasts = predictor.forecast(history, pd.Timestamp('2022-03-01'), horizon=5)
+    np.testing.assert_array_equal(forecasts[0], [24, 25, 26, 27, 28])
+    np.testing.assert_array_equal(forecasts[1], [11, 12, 13, 14, 15])
+    assert predictor.model.calls == 5
+
+def test_predict_next_day_uses_real_history_per_city(delivery_data, capsys):
+    processed = DataProcessor().preprocess(delivery_data)
+    predictor = PeakDemandPredictor()
+    predictor.train(processed, group_col='City')
+    results = predictor.predict_next_day_by_series()
+    assert set(results) == {'Urban', 'Metropolitian', 'Semi-Urban'}
+    for city, result in results.items():
+        assert len(result['hourly_predictions']) == 24
+        assert len(predictor.history[city]) == N_LAGS
+    single = predictor.predict_next_day(predictor.history['Urban'])
+    assert single['hourly_predictions'] == pytest.approx(results['Urban']['hourly_predictions'])
+
+def test_predict_next_day_is_flat_when_ungrouped(delivery_data, capsys):
+    processed = DataProcessor().preprocess(delivery_data)
+    predictor = PeakDemandPredictor()
+    predictor.train(processed)
+    result = predictor.predict_next_day()
+    assert set(result) == {'hourly_predictions', 'peak_hours', 'total_orders'}
+    assert len(result['hourly_predictions']) == 24
@@ -0,0 +1,103 @@
+"""Tests for the startup warm-up and the readiness probes."""
+import asyncio
+import socket
+import threading
+import time
+import httpx
+import uvicorn
+import run
+from src.models.model_registry import ModelRegistry
+from src.models.model_reloader import ModelReloader, ModelSlot
+from src.prediction.delivery_pipeline import DeliveryPipeline
+from src.utils import thread_budget
+
+def probe(path):
+    async def send():
+        transport = httpx.ASGITransport(app=run.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.get(path)
+    return asyncio.run(send())
+
+def test_ready_only_after_models_load_and_warm_up(tmp_path, delivery_data, monkeypatch):
+    pipeline = DeliveryPipeline()
+    pipeline.model.model.set_params(n_estimators=20)
+    pipeline.train(delivery_data)
+
+    warmed = []
+    def warmup(model):
+        run.warmup_delivery(model)
+        warmed.append(model)
+
+    reloader = ModelReloader([ModelSlot(run.DELIVERY_ARTIFACT, DeliveryPipeline(), warmup)], model_dir=tmp_path)
+    monkeypatch.setattr(run, 'models', reloader)
+    monkeypatch.setattr(run, 'warmed_up', threading.Event())
+    monkeypatch.setitem(run.SERVING_CONFIG, 'reload_enabled', False)
+    monkeypatch.setattr(thread_budget, '_state', dict(thread_budget._state))
+    monkeypatch.setenv('OMP_NUM_THREADS', '1')
+
+    assert probe('/live').status_code == 200
+    assert probe('/ready').status_code == 503
+
+    # No artifact yet: warmed up but nothing to serve
+    run.start_serving()
+    response = probe('/ready')
+    assert response.status_code == 503
+    assert response.json()['missing'] == [run.DELIVERY_ARTIFACT]
+
+    ModelRegistry.save_model(pipeline, run.DELIVERY_ARTIFACT, tmp_path)
+    reloader.check()
+    assert probe('/ready').json() == {'status': 'ready'}
+    assert warmed == [reloader[run.DELIVERY_ARTIFACT]]
+
+def test_live_answers_while_startup_warm_up_is_blocked(monkeypatch):
+    release = threading.Event()
+    def slow_start_serving():
+        release.wait(10)
+        run.warmed_up.set()
+
+    monkeypatch.setattr(run, 'start_serving', slow_start_serving)
+    monkeypatch.setattr(run, 'models', ModelReloader([]))
+    monkeypatch.setattr(run, 'warmed_up', threading.Event())
+
+    # A real uvicorn server, so the lifespan runs in its actual startup order
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    server = uvicorn.Server(uvicorn.Config(run.app, log_level='warning'))
+    thread = threading.Thread(target=server.run, kwargs={'sockets': [sock]})
+    thread.start()
+    try:
+        deadline = time.monotonic() + 10
+        while not server.started and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert server.started
+
+        with httpx.Client(base_url=url) as client:
+            assert client.get('/live').status_code == 200
+            response = client.get('/ready')
+            assert response.status_code == 503
+            assert response.json()['status'] == 'warming up'
+
+            release.set()
+            while client.get('/ready').status_code != 200 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert client.get('/ready').json() == {'status': 'ready'}
+    finally:
+        release.set()
+        server.should_exit = True
+        thread.join(10)
+        sock.close()
+
+def test_failed_warm_up_keeps_worker_unready(monkeypatch):
+    def broken_start_serving():
+        raise RuntimeError("artifact unreadable")
+
+    monkeypatch.setattr(run, 'start_serving', broken_start_serving)
+    monkeypatch.setattr(run, 'models', ModelReloader([]))
+    monkeypatch.setattr(run, 'warmed_up', threading.Event())
+    monkeypatch.setattr(run, 'warmup_error', None)
+    run.warm_up()
+
+    response = probe('/ready')
+    assert response.status_code == 503
+    assert response.json()['error'] == "artifact unreadable"
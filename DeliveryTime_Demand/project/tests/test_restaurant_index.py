@@ -0,0 +1,100 @@
+"""Tests for the restaurant spatial index."""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_processor import DataProcessor
+from src.models.restaurant_index import RESTAURANT_FEATURE_COLUMNS, RestaurantIndex
+from src.utils.time_parsers import parse_minutes
+
+def orders(lats, lngs, ordered, picked, dates=None):
+    return pd.DataFrame({
+        'Restaurant_latitude': lats,
+        'Restaurant_longitude': lngs,
+        'Time_Orderd': ordered,
+        'Time_Order_picked': picked,
+        'Order_Date': dates or ['01-03-2022'] * len(lats)
+    })
+
+def test_parse_minutes_reads_day_fractions_and_clock_times():
+    minutes = parse_minutes(pd.Series(['0.5', '18:30', '07:05:30', None, 'bad']))
+    np.testing.assert_allclose(minutes, [720, 1110, 425.5, np.nan, np.nan])
+
+def test_build_clusters_noisy_coordinates_and_aggregates():
+    index = RestaurantIndex()
+    data = orders(
+        # One restaurant with jitter and a sign flip, one elsewhere, one placeholder
+        [12.93011, 12.93014, -12.93012, 12.95, 0.0],
+        [77.51021, 77.51024, 77.51023, 77.55, 0.0],
+        ['18:30', '18:40', '19:05', '10:00', '10:00'],
+        ['18:40', '18:55', '19:25', '10:05', '10:10'],
+        ['01-03-2022', '01-03-2022', '02-03-2022', '02-03-2022', '02-03-2022']
+    )
+    assert index.build(data) == 2
+
+    cluster = index.cluster_id(12.9301, 77.5102)
+    assert cluster is not None and cluster == index.cluster_id(-12.93013, -77.51022)
+    features = index.feature_row(12.9301, 77.5102, 18)
+    assert features['restaurant_prep_minutes'] == 15
+    # Two 18:xx orders over two days of history
+    assert features['restaurant_hourly_orders'] == 1
+
+    # The single-order cluster is too sparse for its own prep time
+    assert index.feature_row(12.95, 77.55, 10)['restaurant_prep_minutes'] == index.default_prep_minutes
+    assert index.cluster_id(13.5, 78.0) is None
+    assert index.cluster_id(0.0, 0.0) is None
+
+    # Cluster ids are grid cells, so a rebuild on more history keeps them
+    index.build(pd.concat([data, orders([12.99], [77.6], ['12:00'], ['12:10'])]))
+    assert index.cluster_id(12.9301, 77.5102) == cluster
+
+def test_lookup_reaches_clusters_in_neighbouring_cells():
+    index = RestaurantIndex()
+    index.build(orders([12.9305, 12.9335], [77.5105, 77.5105], ['12:00'] * 2, ['12:10'] * 2))
+    # Just across the cell edge from the first cluster, two cells from the second
+    rows = index.rows(np.array([12.9311, 12.9346, 12.9371]), np.full(3, 77.5105))
+    np.testing.assert_array_equal(rows, [0, 1, -1])
+
+def test_processor_adds_the_same_features_on_every_path(delivery_data):
+    processor = DataProcessor()
+    processed = processor.preprocess(delivery_data)
+    assert len(processor.restaurant_index) > 0
+    assert processed[RESTAURANT_FEATURE_COLUMNS].notna().all().all()
+
+    first = delivery_data.iloc[0]
+    order = {'restaurant_lat': first['Restaurant_latitude'], 'restaurant_lng': first['Restaurant_longitude'],
+             'delivery_lat': 12.99, 'delivery_lng': 77.61, 'weather': 'Fog', 'traffic': 'Jam',
+             'vehicle_type': 'scooter', 'order_time': first['Time_Orderd']}
+    single = processor.process_single_order(order)
+    batch = processor.process_orders(pd.DataFrame([order]))
+    transformed = processor.transform(delivery_data.iloc[:1].copy())
+    for column in RESTAURANT_FEATURE_COLUMNS:
+        assert single[column] == pytest.approx(transformed[column].iloc[0])
+        assert batch[column].iloc[0] == pytest.approx(single[column])
+
+def test_training_rows_do_not_see_their_own_order():
+    index = RestaurantIndex()
+    data = orders(
+        # Four orders at one restaurant, three at another
+        [12.93] * 4 + [12.95] * 3,
+        [77.51] * 4 + [77.55] * 3,
+        ['18:00', '18:10', '18:20', '19:00', '10:00', '10:10', '10:20'],
+        ['18:10', '18:30', '18:50', '19:40', '10:05', '10:15', '10:25']
+    )
+    index.build(data)
+    hour = np.array([18, 18, 18, 19, 10, 10, 10])
+    features = index.leave_one_out_features(data, hour)
+
+    # Serving orders get every order, training rows all but their own
+    assert index.feature_row(12.93, 77.51, 18)['restaurant_prep_minutes'] == 25
+    np.testing.assert_allclose(features['restaurant_prep_minutes'][:4], [30, 30, 20, 20])
+    np.testing.assert_allclose(features['restaurant_hourly_orders'], [2, 2, 2, 0, 2, 2, 2])
+    # Two other orders are too few for a prep time of their own
+    np.testing.assert_allclose(features['restaurant_prep_minutes'][4:], index.default_prep_minutes)
+
+def test_preprocess_features_leave_out_each_row(delivery_data):
+    processor = DataProcessor()
+    processed = processor.preprocess(delivery_data)
+    served = processor.transform(delivery_data.copy())
+    # The hourly volume always counts the served row's own order
+    assert (processed['restaurant_hourly_orders'] < served['restaurant_hourly_orders']).any()
+    assert (processed['restaurant_hourly_orders'] <= served['restaurant_hourly_orders'] + 1e-9).all()
@@ -0,0 +1,30 @@
+"""Tests for incremental rolling statistics."""
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.rolling_state import RollingFeatureState, RollingStateStore
+from src.utils.time_series import create_lag_features, create_rolling_features
+
+@pytest.fixture
+def hourly_counts():
+    rng = np.random.default_rng(1)
+    values = rng.poisson(20, 200).astype(float)
+    values[50] = np.nan
+    return pd.DataFrame({'order_count': values})
+
+def test_incremental_features_match_batch(hourly_counts):
+    batch = create_rolling_features(create_lag_features(hourly_counts, 'order_count'), 'order_count')
+    state = RollingFeatureState()
+    for i, value in enumerate(hourly_counts['order_count']):
+        state.update(value)
+        expected = batch.iloc[i].drop('order_count')
+        actual = pd.Series(state.features())[expected.index]
+        pd.testing.assert_series_equal(actual, expected, check_names=False, rtol=1e-9)
+
+def test_checkpoint_round_trip(hourly_counts, tmp_path):
+    values = hourly_counts['order_count'].to_numpy()
+    store = RollingStateStore.from_history({'Urban': values[:150]})
+    store.save(tmp_path / 'rolling.pkl')
+    restored = RollingStateStore.load(tmp_path / 'rolling.pkl')
+    for value in values[150:]:
+        assert store.update('Urban', value) == pytest.approx(restored.update('Urban', value), nan_ok=True)
@@ -0,0 +1,39 @@
+"""Tests for stratified subsampling."""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_processor import DataProcessor
+from src.utils.matrix_cache import build_training_matrices
+from src.utils.sampling import (
+    compare_metrics, sample_training_rows, strata, stratified_sample, stratified_sample_indices
+)
+
+def test_every_stratum_keeps_its_share():
+    keys = np.repeat([0, 1, 2], [1000, 100, 3])
+    rows = stratified_sample_indices(keys, 0.1, seed=1)
+    assert np.bincount(keys[rows]).tolist() == [100, 10, 1]
+    assert np.all(np.diff(rows) > 0)
+
+def test_same_seed_draws_the_same_rows(delivery_data):
+    first = stratified_sample(delivery_data, 0.2, seed=3)
+    assert first.index.equals(stratified_sample(delivery_data, 0.2, seed=3).index)
+    assert not first.index.equals(stratified_sample(delivery_data, 0.2, seed=4).index)
+
+def test_strata_combine_columns_and_target_quantiles(delivery_data):
+    keys = strata(delivery_data)
+    columns = ['City', 'Weatherconditions', 'Road_traffic_density']
+    groups = delivery_data.groupby(keys)
+    # Each stratum holds one combination of values and one band of delivery times
+    assert (groups[columns].nunique() == 1).all().all()
+    assert groups[columns].first().groupby(columns).size().max() <= 4
+
+def test_sampled_training_rows_and_report(delivery_data):
+    processed = DataProcessor().preprocess(delivery_data)
+    matrices = build_training_matrices(processed)
+    rows = sample_training_rows(matrices, processed, 0.25)
+    X_train, X_test, y_train, y_test = matrices.split(rows)
+    assert len(X_train) == len(rows) < matrices.n_train
+    assert len(X_test) == len(matrices.X) - matrices.n_train
+
+    report = compare_metrics({'A': {'mae': 2.0, 'r2': 0.8}}, {'A': {'mae': 2.5, 'r2': 0.7}})
+    assert report['difference'].tolist() == pytest.approx([0.5, -0.1])
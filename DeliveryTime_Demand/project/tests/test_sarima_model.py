@@ -0,0 +1,63 @@
+"""Tests for the multi-series SARIMA forecaster."""
+import numpy as np
+import pytest
+from src.models.models import MultiSeriesSARIMAModel
+from src.models.peak_demand_model import PeakDemandModel
+
+@pytest.fixture
+def hourly_series(delivery_data):
+    return PeakDemandModel().get_hourly_series(delivery_data)
+
+def test_fits_every_series_in_parallel(hourly_series):
+    model = MultiSeriesSARIMAModel(order=(1, 0, 0), seasonal_order=(0, 0, 0, 0), n_jobs=2)
+    metrics = model.train(hourly_series)
+    assert set(metrics) == set(hourly_series) == {'overall', 'Urban', 'Metropolitian', 'Semi-Urban'}
+    # Zero-count hours are excluded from MAPE instead of dividing by zero
+    assert all(np.isfinite(series_metrics['mape']) for series_metrics in metrics.values())
+    forecasts = model.predict({'steps': 12})
+    assert all(len(forecast) == 12 for forecast in forecasts.values())
+
+def test_forecasts_are_cached_until_refit(hourly_series):
+    model = MultiSeriesSARIMAModel(order=(1, 0, 0), seasonal_order=(0, 0, 0, 0), n_jobs=1)
+    model.train(hourly_series)
+    first = model.forecast('Urban', 24)
+    assert model.forecast('Urban', 24) is first
+    model.train(hourly_series)
+    assert model.forecast('Urban', 24) is not first
+
+def test_refit_warm_starts_from_previous_params(hourly_series, monkeypatch):
+    from src.models.models import sarima_model
+    model = MultiSeriesSARIMAModel(order=(1, 0, 0), seasonal_order=(0, 0, 0, 0), n_jobs=1)
+    model.train(hourly_series)
+    previous = dict(model.params)
+
+    seen = []
+    original = sarima_model._fit_series
+    def recording_fit(series, order, seasonal_order, start_params, maxiter):
+        seen.append(start_params)
+        return original(series, order, seasonal_order, start_params, maxiter)
+    monkeypatch.setattr(sarima_model, '_fit_series', recording_fit)
+
+    model.train(hourly_series)
+    assert len(seen) == len(previous)
+    for start_params, params in zip(seen, previous.values()):
+        np.testing.assert_array_equal(start_params, params)
+
+def test_peak_demand_model_serves_sarima_forecasts(delivery_data, tmp_path):
+    from src.models.demand_refresh import refresh_peak_demand
+    from src.models.model_registry import ModelRegistry
+    forecaster = MultiSeriesSARIMAModel(order=(1, 0, 0), seasonal_order=(0, 0, 0, 0), n_jobs=1)
+    model = PeakDemandModel(forecaster=forecaster)
+    refresh_peak_demand(delivery_data, tmp_path, model)
+
+    served = ModelRegistry.load_model('peak_demand_model', tmp_path)
+    prediction = served.predict_next_day()
+    forecast = served.forecaster.forecast('Urban', 24)
+    urban = prediction['city_predictions']['Urban']['hourly_predictions']
+    for timestamp, value in forecast.items():
+        assert urban[timestamp.hour] == round(max(value, 0))
+    assert served.predict({'hour': 5, 'city': 'Urban'})['predicted_orders'] == urban[5]
+
+    # The next refresh warm starts from the served forecaster's parameters
+    result = refresh_peak_demand(delivery_data, tmp_path)
+    assert set(result['fit_seconds']) == set(served.forecaster.params)
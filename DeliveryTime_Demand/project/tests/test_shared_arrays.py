@@ -0,0 +1,83 @@
+"""Tests for sharing model arrays with forked workers."""
+import os
+import numpy as np
+import pytest
+from src.models.peak_demand_model import PeakDemandModel
+from src.models.zone_demand_model import ZoneDemandModel
+from src.prediction.delivery_pipeline import DeliveryPipeline
+from src.utils.shared_arrays import (
+    freeze_arrays, process_memory, release_shared_arrays, share_arrays, touch_arrays
+)
+
+@pytest.fixture
+def zone_model(delivery_data):
+    model = ZoneDemandModel(level=2)
+    model.train(delivery_data)
+    return model
+
+def test_share_arrays_moves_large_arrays(zone_model):
+    expected = zone_model.hourly_mean.copy()
+    zones = zone_model.zones
+    try:
+        moved = share_arrays({'zone': zone_model}, min_bytes=zone_model.hourly_mean.nbytes)
+        assert moved == zone_model.hourly_mean.nbytes + zone_model.hourly_std.nbytes
+        np.testing.assert_array_equal(zone_model.hourly_mean, expected)
+        assert not zone_model.hourly_mean.flags.writeable
+        # Smaller arrays stay where they were
+        assert zone_model.zones is zones
+        assert zone_model.predict_next_day(int(zones[0]))['hourly_predictions']
+    finally:
+        release_shared_arrays()
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork')
+def test_frozen_arrays_are_read_only_in_forked_workers(zone_model):
+    freeze_arrays(zone_model)
+    with pytest.raises(ValueError):
+        zone_model.hourly_mean[0, 0] = 1.0
+
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        os.write(write, str(float(zone_model.hourly_mean.sum())).encode())
+        os._exit(0)
+    os.close(write)
+    os.waitpid(pid, 0)
+    assert float(os.read(read, 64)) == float(zone_model.hourly_mean.sum())
+    os.close(read)
+
+def test_process_memory_reports_unique_bytes():
+    report = process_memory()
+    if report['rss'] is None:
+        pytest.skip('smaps_rollup not available')
+    assert 0 < report['unique'] <= report['rss']
+
+def test_touch_arrays_covers_shared_blocks(zone_model):
+    try:
+        share_arrays({'zone': zone_model})
+        assert touch_arrays({'zone': zone_model}) == freeze_arrays(zone_model)
+    finally:
+        release_shared_arrays()
+
+def test_served_artifacts_keep_predicting_from_shared_arrays(delivery_data):
+    pipeline = DeliveryPipeline()
+    pipeline.model.model.set_params(n_estimators=20)
+    pipeline.train(delivery_data)
+    peak = PeakDemandModel()
+    peak.train(delivery_data)
+    order = {'restaurant_lat': 12.95, 'restaurant_lng': 77.55, 'delivery_lat': 12.99, 'delivery_lng': 77.61,
+             'weather': 'Fog', 'traffic': 'Jam', 'vehicle_type': 'scooter', 'order_time': '18:30'}
+    expected_eta, expected_demand = pipeline.predict(order), peak.predict_next_day()
+
+    served = {'delivery_pipeline': pipeline, 'peak_demand_model': peak}
+    try:
+        moved = share_arrays(served)
+        covered = freeze_arrays(served)
+        assert moved == covered
+        assert not peak.city_mean.flags.writeable and not peak.hourly_mean.flags.writeable
+        assert not pipeline.processor.restaurant_index.hourly_orders.flags.writeable
+        assert not pipeline.processor.driver_profiles.latest.flags.writeable
+        assert pipeline.predict(order) == pytest.approx(expected_eta)
+        assert peak.predict_next_day() == expected_demand
+    finally:
+        release_shared_arrays()
@@ -0,0 +1,37 @@
+"""Tests for the CPU thread budget."""
+import pytest
+from src.models.model_factory import ModelFactory
+from src.utils import thread_budget
+from src.utils.thread_budget import context_threads, thread_budget as budget, threads, current_context
+
+@pytest.fixture
+def eight_cores(monkeypatch):
+    monkeypatch.setitem(thread_budget.THREAD_BUDGET_CONFIG, 'total', 8)
+    monkeypatch.setitem(thread_budget.THREAD_BUDGET_CONFIG, 'contexts',
+                        {'training': None, 'serving': 1, 'worker': 1, 'greedy': 32})
+
+def test_contexts_share_one_total(eight_cores):
+    assert context_threads('training') == 8
+    assert context_threads('serving') == 1
+    # No context may exceed the total
+    assert context_threads('greedy') == 8
+    with pytest.raises(ValueError):
+        context_threads('missing')
+
+def test_budget_block_restores_previous_context(eight_cores):
+    before = (current_context(), threads())
+    with budget('serving') as n_threads:
+        assert n_threads == threads() == 1
+        with budget('training'):
+            assert threads() == 8
+        assert current_context() == 'serving'
+    assert (current_context(), threads()) == before
+
+def test_model_wrappers_follow_the_budget(eight_cores):
+    with budget('training'):
+        model = ModelFactory.get_model('randomforest')
+        assert model.model.n_jobs == 8
+    with budget('serving'):
+        thread_budget.apply_threads(model.model)
+        assert model.model.n_jobs == 1
+        assert ModelFactory.get_model('lightgbm').model.n_jobs == 1
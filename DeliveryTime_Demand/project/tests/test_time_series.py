@@ -0,0 +1,35 @@
+"""Tests for the sliding-window lag builders."""
+import numpy as np
+import pandas as pd
+from src.utils.time_series import build_lag_matrix, create_lag_features, prepare_time_series_data, to_hourly_calendar
+
+def test_lag_matrix_is_a_read_only_view_matching_shift():
+    values = np.arange(40, dtype=float).reshape(2, 20)
+    X, Y, valid = build_lag_matrix(values, n_lags=3, horizon=2)
+    assert np.shares_memory(X, values) and np.shares_memory(Y, values)
+    assert not X.flags.writeable
+    assert X.shape == (2, 16, 3) and Y.shape == (2, 16, 2)
+    # Sample j predicts t = 3 + j from lag_1 = t-1 .. lag_3 = t-3
+    np.testing.assert_array_equal(X[1, 0], [22, 21, 20])
+    np.testing.assert_array_equal(Y[1, 0], [23, 24])
+    assert valid.all()
+
+def test_gaps_are_reindexed_and_masked():
+    index = pd.date_range('2022-03-01', periods=10, freq='H').delete([4])
+    series = pd.Series(np.arange(9, dtype=float), index=index)
+    values, mask, calendar = to_hourly_calendar(series)
+    assert len(calendar) == 10 and not mask[0, 4]
+    _, _, valid = build_lag_matrix(values, n_lags=2, mask=mask)
+    # Samples whose lags or target touch hour 4 are invalid
+    np.testing.assert_array_equal(valid[0], [True, True, False, False, False, True, True, True])
+
+def test_frame_helpers_match_previous_behaviour():
+    df = pd.DataFrame({'y': np.arange(30, dtype=float)})
+    expected = df.copy()
+    for lag in [1, 2, 3, 6, 12, 24]:
+        expected[f'lag_{lag}h'] = expected['y'].shift(lag)
+    pd.testing.assert_frame_equal(create_lag_features(df, 'y'), expected)
+
+    X, y = prepare_time_series_data(df, 'y', sequence_length=5)
+    assert X.shape == y.shape == (25, 5)
+    np.testing.assert_array_equal(y[3], X[3] + 1)
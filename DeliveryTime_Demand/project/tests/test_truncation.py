@@ -0,0 +1,88 @@
+"""Tests for truncated boosting."""
+import numpy as np
+from src.config.model_config import TRUNCATION_CONFIG
+from src.data_processor import DataProcessor
+from src.models.delivery_time_model import DeliveryTimeModel
+from src.models.truncation import (
+    checkpoint_iterations, iteration_curve, iterations_for_budget, iterations_for_accuracy
+)
+from src.utils.thread_budget import context_threads
+
+CURVE = [
+    {'num_iteration': 100, 'mae': 5.0, 'rmse': 6.0, 'latency_us': 100.0},
+    {'num_iteration': 500, 'mae': 3.05, 'rmse': 4.0, 'latency_us': 300.0},
+    {'num_iteration': 1000, 'mae': 3.0, 'rmse': 3.9, 'latency_us': 600.0}
+]
+
+def test_checkpoints_end_at_all_trees():
+    assert checkpoint_iterations(1000, 4) == [250, 500, 750, 1000]
+    assert checkpoint_iterations(3, 10) == [1, 2, 3]
+
+def test_tree_count_for_budget_and_accuracy():
+    assert iterations_for_budget(CURVE, 400) == 500
+    assert iterations_for_budget(CURVE, 1000) == 1000
+    # Nothing fits: the cheapest recorded count
+    assert iterations_for_budget(CURVE, 10) == 100
+    assert iterations_for_accuracy(CURVE, 0.02) == 500
+    assert iterations_for_accuracy(CURVE, 0.0) == 1000
+    assert iterations_for_budget([], 400) is None
+
+def test_delivery_model_records_curve_and_predicts_truncated(delivery_data):
+    processed = DataProcessor().preprocess(delivery_data)
+    model = DeliveryTimeModel()
+    model.train(processed)
+
+    curve = model.iteration_curve
+    assert [point['num_iteration'] for point in curve] == checkpoint_iterations(model.n_iterations)
+    # At learning rate 0.01 the first tenth of the trees is far from converged
+    assert curve[0]['mae'] > curve[-1]['mae']
+
+    X = model._prepare_features(processed.head(50))
+    np.testing.assert_allclose(model.predict_batch(X, num_iteration=model.n_iterations), model.predict_batch(X))
+    assert not np.allclose(model.predict_batch(X, num_iteration=10), model.predict_batch(X))
+
+def test_served_model_is_refit_on_all_orders(delivery_data, monkeypatch):
+    processed = DataProcessor().preprocess(delivery_data)
+    model = DeliveryTimeModel()
+    model.model.set_params(n_estimators=50)
+    model.train(processed)
+
+    monkeypatch.setitem(TRUNCATION_CONFIG, 'holdout_share', 0)
+    all_orders = DeliveryTimeModel()
+    all_orders.model.set_params(n_estimators=50)
+    all_orders.train(processed)
+
+    X = model._prepare_features(processed)
+    np.testing.assert_allclose(model.predict_batch(X), all_orders.predict_batch(X))
+    # The curve still comes from orders held out of the first fit
+    assert model.iteration_curve != all_orders.iteration_curve
+
+def test_curve_latency_is_timed_with_serving_threads():
+    class Recorder:
+        def __init__(self):
+            self.threads = set()
+        def predict(self, X, num_iteration=None, num_threads=None):
+            if len(X) == 1:
+                self.threads.add(num_threads)
+            return np.zeros(len(X))
+
+    estimator = Recorder()
+    iteration_curve(estimator, np.zeros((5, 2)), np.arange(5.0), 10, checkpoints=2, latency_rows=3)
+    assert estimator.threads == {context_threads('serving')}
+
+def test_server_picks_trees_from_budget_or_load(monkeypatch):
+    import run
+
+    class Model:
+        iteration_curve = CURVE
+
+    assert run.serving_iterations(Model(), '0.4') == 500
+    assert run.serving_iterations(Model(), None) is None
+    # All trees fit the budget: no truncation
+    assert run.serving_iterations(Model(), '5') is None
+
+    monkeypatch.setitem(run.SERVING_CONFIG, 'truncate_in_flight', 4)
+    monkeypatch.setattr(run, 'in_flight', 4)
+    assert run.serving_iterations(Model(), None) == 500
+    monkeypatch.setattr(run, 'in_flight', 3)
+    assert run.serving_iterations(Model(), None) is None
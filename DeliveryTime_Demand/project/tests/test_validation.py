@@ -0,0 +1,42 @@
+"""Tests for batch order validation."""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_processor import DataProcessor
+from src.utils.validation import validate_order_batch
+
+def make_orders():
+    return pd.DataFrame({
+        'restaurant_lat': [12.97, 95.0, 0.0, 12.97, 12.97],
+        'restaurant_lng': [77.59, 77.59, 0.0, 77.59, 'abc'],
+        'delivery_lat': [12.99, 12.99, 12.99, 12.99, 12.99],
+        'delivery_lng': [77.61, 77.61, 77.61, 77.61, 77.61],
+        'weather': ['Sunny', 'Sunny', 'Sunny', 'Hail', None],
+        'traffic': ['Jam', 'Low', 'Low', 'Low', 'Low'],
+        'vehicle_type': ['scooter'] * 5,
+        'order_time': ['19:00', '0.5', '11:30', 'noon', '09:15']
+    })
+
+def test_batch_validator_reports_every_failed_check():
+    valid, errors = validate_order_batch(make_orders(), {'weather': ['Sunny', 'Fog']})
+    assert valid.index.tolist() == [0]
+    assert [tuple(e) for e in errors] == [
+        (1, 'restaurant_lat', 'invalid_latitude'),
+        (2, 'restaurant_lat', 'zero_coordinates'),
+        (3, 'order_time', 'unparseable_time'),
+        (3, 'weather', 'unknown_category'),
+        (4, 'restaurant_lng', 'invalid_type'),
+        (4, 'weather', 'missing'),
+    ]
+
+def test_batch_validator_uses_fitted_categories(delivery_data):
+    processor = DataProcessor()
+    processor.preprocess(delivery_data)
+    known = processor.known_categories()
+    assert set(known) == {'weather', 'traffic', 'vehicle_type'}
+    valid, errors = validate_order_batch(make_orders().iloc[[0]], known)
+    assert len(valid) == 1 and len(errors) == 0
+
+def test_batch_validator_requires_all_fields():
+    with pytest.raises(ValueError, match='order_time'):
+        validate_order_batch(make_orders().drop(columns='order_time'))
@@ -0,0 +1,35 @@
+"""Tests for zone-level demand profiles."""
+import numpy as np
+from src.models.peak_demand_model import PeakDemandModel
+from src.models.zone_demand_model import ZoneDemandModel
+from src.utils.spatial import INVALID_ZONE, parent_zone, zone_hierarchy
+
+def test_zone_hierarchy_nests():
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(8, 30, 10000).round(4)
+    lng = rng.uniform(70, 90, 10000).round(4)
+    zones = zone_hierarchy(lat, lng, [0.1, 0.02, 0.005])
+    np.testing.assert_array_equal(parent_zone(zones[0.005], 0.005, 0.1), zones[0.1])
+    np.testing.assert_array_equal(parent_zone(zones[0.02], 0.02, 0.1), zones[0.1])
+    assert zone_hierarchy([0.0, -12.97], [0.0, -77.59], [0.1])[0.1][0] == INVALID_ZONE
+
+def test_zone_profiles_store_only_active_zones(delivery_data):
+    model = ZoneDemandModel(level=0)
+    model.train(delivery_data)
+    zones = model.assign_zones(delivery_data)
+    assert model.active_zones == len(np.unique(zones))
+    assert model.hourly_mean.shape == (model.active_zones, 24)
+
+    row = delivery_data.iloc[0]
+    prediction = model.predict({'lat': row['Delivery_location_latitude'], 'lng': row['Delivery_location_longitude']})
+    assert len(prediction['hourly_predictions']) == 24
+    assert model.predict({'zone': -42, 'hour': 12})['predicted_orders'] == 0
+
+def test_single_zone_matches_overall_city_profile(delivery_data):
+    # One coarse zone covering every order reproduces the overall pattern
+    model = ZoneDemandModel(level=0)
+    data = delivery_data.assign(Delivery_location_latitude=12.95, Delivery_location_longitude=77.55)
+    model.train(data)
+    peak = PeakDemandModel()
+    peak.train(data)
+    assert model.predict_next_day(model.zones[0])['hourly_predictions'] == peak.predict_next_day()['hourly_predictions']